@@ -0,0 +1,324 @@
+"""
+Headless benchmark for every preset in utils/queries.QUERIES.
+
+Builds (or reuses) synthetic databases at each scale, runs each query in
+a fresh child process and records median / p95 latency and the peak RSS
+growth while it ran (Linux: kernel high-water mark reset per query;
+elsewhere ru_maxrss). Writes a JSON report and, given a baseline report,
+flags queries whose median got slower.
+
+    python bench_queries.py --scales 1e3,1e4,1e5 --out bench_report.json
+    python bench_queries.py --baseline bench_baseline.json
+    python bench_queries.py --scales 1e3 --save-baseline bench_baseline.json
+
+Exits with status 1 when a regression against the baseline was found.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sqlite3
+import statistics
+import sys
+import time
+from typing import List, Optional
+
+from utils.datagen import GENERATOR_VERSION, DatasetConfig, build_database
+from utils.db_connection import PRAGMAS
+from utils.queries import QUERIES
+
+try:
+    import resource
+except ImportError:          # Windows: no peak-RSS numbers
+    resource = None
+
+DEFAULT_SCALES = "1e3,1e4,1e5,1e6,1e7"
+
+# A median this much slower than the baseline (and by at least MIN_DELTA_MS) is a regression
+DEFAULT_TOLERANCE = 0.25
+MIN_DELTA_MS = 2.0
+
+
+# -------------------------------
+# Measurement (child process)
+# -------------------------------
+
+def _status_kb(field: str) -> Optional[int]:
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    """
+    Reset the kernel's RSS high-water mark (Linux only).
+    """
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="ascii") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_kb() -> Optional[int]:
+    peak = _status_kb("VmHWM")
+    if peak is not None or resource is None:
+        return peak
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss // 1024 if sys.platform == "darwin" else rss   # macOS reports bytes
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile.
+    """
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+def _measure(db_path: str, sql: str, repeat: int, warmup: int,
+             budget_s: float, timeout_s: float, conn_out) -> None:
+    """
+    Child-process body: run `sql` warmup + repeat times and send back timings.
+    """
+    result = {"status": "ok"}
+    try:
+        conn = sqlite3.connect(db_path)
+        for pragma in PRAGMAS:
+            conn.execute(pragma)
+
+        deadline = [0.0]
+        conn.set_progress_handler(lambda: int(time.perf_counter() > deadline[0]), 10_000)
+
+        # Baseline: current RSS if the peak can be reset, else the peak so far
+        rss_before = _status_kb("VmRSS") if _reset_peak_rss() else _peak_rss_kb()
+        samples: List[float] = []
+        rows = 0
+        started = time.perf_counter()
+
+        for i in range(warmup + repeat):
+            deadline[0] = time.perf_counter() + timeout_s
+            t0 = time.perf_counter()
+            rows = len(conn.execute(sql).fetchall())
+            elapsed = (time.perf_counter() - t0) * 1000
+            if i >= warmup:
+                samples.append(elapsed)
+                # Slow queries at large scales: stop once the budget is spent
+                if len(samples) >= 3 and time.perf_counter() - started > budget_s:
+                    break
+
+        rss_after = _peak_rss_kb()
+        result.update({
+            "runs": len(samples),
+            "rows": rows,
+            "median_ms": round(statistics.median(samples), 3),
+            "p95_ms": round(percentile(samples, 95), 3),
+            "min_ms": round(min(samples), 3),
+            "peak_rss_kb": rss_after,
+            "peak_rss_delta_kb": None if rss_before is None else rss_after - rss_before,
+        })
+        conn.close()
+    except sqlite3.OperationalError as exc:
+        result = {"status": "timeout" if "interrupted" in str(exc) else "error",
+                  "error": str(exc)}
+    except Exception as exc:
+        result = {"status": "error", "error": repr(exc)}
+    conn_out.send(result)
+    conn_out.close()
+
+
+def run_query(db_path: str, sql: str, repeat: int, warmup: int,
+              budget_s: float, timeout_s: float) -> dict:
+    """
+    Measure one query in a fresh process, so peak RSS belongs to it alone.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(
+        target=_measure,
+        args=(db_path, sql, repeat, warmup, budget_s, timeout_s, child),
+    )
+    proc.start()
+    child.close()
+
+    limit = budget_s + timeout_s * (warmup + 3) + 30
+    result = parent.recv() if parent.poll(limit) else {"status": "timeout", "error": "no result"}
+    proc.join(5)
+    if proc.is_alive():
+        proc.kill()
+    return result
+
+
+# -------------------------------
+# Datasets
+# -------------------------------
+
+def dataset_path(data_dir: str, batting_rows: int, seed: int) -> str:
+    return os.path.join(
+        data_dir, f"bench_{batting_rows}_s{seed}_v{GENERATOR_VERSION}.db"
+    )
+
+
+def ensure_dataset(data_dir: str, batting_rows: int, seed: int, rebuild: bool) -> dict:
+    path = dataset_path(data_dir, batting_rows, seed)
+    if rebuild:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+    info = {"path": path, "build_s": None}
+    if not os.path.exists(path):
+        os.makedirs(data_dir, exist_ok=True)
+        t0 = time.perf_counter()
+        build_database(path + ".tmp", DatasetConfig.for_batting_rows(batting_rows, seed))
+        for suffix in ("-wal", "-shm"):
+            if os.path.exists(path + ".tmp" + suffix):
+                os.remove(path + ".tmp" + suffix)
+        os.replace(path + ".tmp", path)
+        info["build_s"] = round(time.perf_counter() - t0, 2)
+
+    conn = sqlite3.connect(path)
+    info["tables"] = {
+        t: conn.execute(f"SELECT COUNT(*) FROM {t};").fetchone()[0]
+        for t in ("players", "matches", "batting_stats", "bowling_stats")
+    }
+    conn.close()
+    info["size_mb"] = round(os.path.getsize(path) / 1024 / 1024, 2)
+    return info
+
+
+# -------------------------------
+# Baseline comparison
+# -------------------------------
+
+def compare(report: dict, baseline: dict, tolerance: float) -> dict:
+    """
+    Median-latency ratios per (scale, query) present in both reports.
+    """
+    regressions, improvements, compared = [], [], 0
+
+    for scale, current in report["results"].items():
+        base_scale = baseline.get("results", {}).get(scale)
+        if not base_scale:
+            continue
+        for qid, cur in current["queries"].items():
+            base = base_scale["queries"].get(qid)
+            if not base or base.get("status") != "ok" or cur.get("status") != "ok":
+                continue
+            compared += 1
+            before, after = base["median_ms"], cur["median_ms"]
+            entry = {
+                "scale": scale,
+                "query": qid,
+                "baseline_ms": before,
+                "current_ms": after,
+                "ratio": round(after / before, 3) if before else None,
+            }
+            if after - before >= MIN_DELTA_MS and after > before * (1 + tolerance):
+                regressions.append(entry)
+            elif before - after >= MIN_DELTA_MS and after < before / (1 + tolerance):
+                improvements.append(entry)
+
+    return {
+        "tolerance": tolerance,
+        "compared": compared,
+        "regressions": regressions,
+        "improvements": improvements,
+    }
+
+
+# -------------------------------
+# CLI
+# -------------------------------
+
+def _parse_scales(text: str) -> List[int]:
+    return [int(float(s)) for s in text.split(",") if s.strip()]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--scales", default=DEFAULT_SCALES,
+                        help=f"batting_stats row counts (default {DEFAULT_SCALES})")
+    parser.add_argument("--queries", default="", help="comma-separated ids, e.g. Q13,Q24")
+    parser.add_argument("--repeat", type=int, default=15, help="timed runs per query")
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--budget", type=float, default=20.0,
+                        help="seconds per query before repeats are cut short (min 3 runs)")
+    parser.add_argument("--timeout", type=float, default=120.0,
+                        help="seconds before a single run is interrupted")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", default="bench_data")
+    parser.add_argument("--rebuild", action="store_true", help="regenerate cached datasets")
+    parser.add_argument("--out", default="bench_report.json")
+    parser.add_argument("--baseline", help="report to compare against")
+    parser.add_argument("--save-baseline", help="also write this run as a baseline file")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    wanted = [q.strip() for q in args.queries.split(",") if q.strip()] or list(QUERIES)
+    unknown = [q for q in wanted if q not in QUERIES]
+    if unknown:
+        parser.error(f"unknown query ids: {', '.join(unknown)}")
+
+    report = {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "platform": platform.platform(),
+        "generator_version": GENERATOR_VERSION,
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "warmup": args.warmup,
+        "results": {},
+    }
+
+    for scale in _parse_scales(args.scales):
+        print(f"== {scale:,} batting rows", flush=True)
+        dataset = ensure_dataset(args.data_dir, scale, args.seed, args.rebuild)
+        if dataset["build_s"] is not None:
+            print(f"   built {dataset['path']} in {dataset['build_s']}s", flush=True)
+
+        queries = {}
+        for qid in wanted:
+            res = run_query(dataset["path"], QUERIES[qid]["query"], args.repeat,
+                            args.warmup, args.budget, args.timeout)
+            queries[qid] = res
+            if res["status"] == "ok":
+                print(f"   {qid:>4}  median {res['median_ms']:>10.2f} ms  "
+                      f"p95 {res['p95_ms']:>10.2f} ms  rss +{res['peak_rss_delta_kb']} KiB  "
+                      f"rows {res['rows']}", flush=True)
+            else:
+                print(f"   {qid:>4}  {res['status']}: {res.get('error')}", flush=True)
+
+        report["results"][str(scale)] = {"dataset": dataset, "queries": queries}
+
+    exit_code = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            report["comparison"] = compare(report, json.load(f), args.tolerance)
+        cmp = report["comparison"]
+        print(f"== compared {cmp['compared']} against {args.baseline}: "
+              f"{len(cmp['regressions'])} regressions, {len(cmp['improvements'])} improvements")
+        for r in cmp["regressions"]:
+            print(f"   REGRESSION {r['query']} @ {r['scale']}: "
+                  f"{r['baseline_ms']} -> {r['current_ms']} ms (x{r['ratio']})")
+        exit_code = 1 if cmp["regressions"] else 0
+
+    for path in filter(None, (args.out, args.save_baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"== wrote {path}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
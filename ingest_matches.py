@@ -0,0 +1,69 @@
+"""
+Load Cricbuzz live/recent matches into the analytics DB (utils/ingest.py).
+
+    python ingest_matches.py                          # one run: feeds + up to 20 scorecards
+    python ingest_matches.py --feeds recent --max-scorecards 50
+    python ingest_matches.py --every 300              # keep running, one pass every 5 minutes
+
+Each run writes only new or changed matches, so it is safe to schedule
+(cron, systemd timer) as often as the API quota allows:
+
+    */10 * * * * cd /path/to/app && python ingest_matches.py >> ingest.log 2>&1
+"""
+import argparse
+import os
+import sys
+import time
+from dataclasses import asdict
+
+from utils.ingest import DEFAULT_MAX_SCORECARDS, FEEDS, ingest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Ingest Cricbuzz match feeds into the local DB.")
+    parser.add_argument("--db", default=os.environ.get("CRICKET_DB_PATH", "cricket2.db"))
+    parser.add_argument("--feeds", default=",".join(FEEDS),
+                        help=f"comma-separated, from: {', '.join(FEEDS)}")
+    parser.add_argument("--max-scorecards", type=int, default=DEFAULT_MAX_SCORECARDS,
+                        help="scorecard calls per run (0 = matches only)")
+    parser.add_argument("--every", type=float, default=0,
+                        help="repeat every N seconds instead of running once")
+    args = parser.parse_args()
+
+    feeds = [f.strip() for f in args.feeds.split(",") if f.strip()]
+    unknown = [f for f in feeds if f not in FEEDS]
+    if unknown:
+        parser.error(f"unknown feed(s): {', '.join(unknown)}")
+
+    # The DB path must be set before the API/DB modules read it
+    os.environ["CRICKET_DB_PATH"] = args.db
+    from utils.api_handler import safe_get
+    from utils.db_connection import get_connection
+
+    conn = get_connection()               # also applies pending migrations
+
+    def fetch(path):
+        return safe_get(path, raw=True)
+
+    failed = False
+    while True:
+        report = ingest(conn, fetch, feeds, scorecards=args.max_scorecards > 0,
+                        max_scorecards=args.max_scorecards)
+        fields = asdict(report)
+        errors = fields.pop("errors")
+        print(time.strftime("%Y-%m-%d %H:%M:%S"),
+              " ".join(f"{k}={v}" for k, v in fields.items()), flush=True)
+        for error in errors:
+            print(f"   ! {error}", file=sys.stderr, flush=True)
+        failed = bool(errors) and not report.seen
+
+        if not args.every:
+            break
+        time.sleep(args.every)
+
+    conn.close()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
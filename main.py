@@ -29,5 +29,6 @@ with st.sidebar:
     st.page_link("pages/3_🔍_SQL_Analytics.py", label="SQL Analytics", icon="🧮")
     st.page_link("pages/4_🛠_CRUD_Operations.py", label="CRUD Operations", icon="🧰")
     st.page_link("pages/5_🧪_API_Tester.py", label="API Tester", icon="🔧")
+    st.page_link("pages/6_📈_Diagnostics.py", label="Diagnostics", icon="📈")
 
 st.info("Use the sidebar links to open the feature pages.", icon="➡️")
@@ -0,0 +1,100 @@
+"""
+Local Cricbuzz stand-in that replays recorded fixtures.
+
+Record real responses first (any page or script that calls safe_get):
+    CRICBUZZ_RECORD_DIR=fixtures streamlit run main.py
+
+Then replay them without network or quota:
+    python mock_server.py --fixtures fixtures --port 8765 --latency-ms 80 --error-rate 0.05
+    CRICBUZZ_BASE_URL=http://127.0.0.1:8765 RAPIDAPI_KEY=local streamlit run main.py
+"""
+import argparse
+import hashlib
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+from utils.disk_cache import key_for
+from utils.fixtures import load_fixtures, scale_payload
+
+
+def make_handler(fixtures, latency_ms, jitter_ms, error_rate, error_status, scale):
+    # Pre-encode once so replay cost is just latency + socket write
+    bodies = {}
+    for key, fx in fixtures.items():
+        body = json.dumps(scale_payload(fx["body"], scale)).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+        bodies[key] = (fx.get("status", 200), body, etag)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"      # keep-alive, like the real host
+
+        def _send(self, status, body=b"", headers=None):
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            if body:
+                self.wfile.write(body)
+
+        def do_GET(self):
+            delay = latency_ms + random.uniform(0, jitter_ms)
+            if delay > 0:
+                time.sleep(delay / 1000)
+
+            if random.random() < error_rate:
+                self._send(error_status, b'{"message": "injected error"}', {"Retry-After": "1"})
+                return
+
+            url = urlsplit(self.path)
+            key = key_for(url.path, dict(parse_qsl(url.query)))
+            if key not in bodies:
+                self._send(404, json.dumps({"message": f"no fixture for {key}"}).encode("utf-8"))
+                return
+
+            status, body, etag = bodies[key]
+            if self.headers.get("If-None-Match") == etag:
+                self._send(304, headers={"ETag": etag})
+                return
+            self._send(status, body, {"ETag": etag})
+
+        def log_message(self, fmt, *args):
+            pass
+
+    return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded Cricbuzz fixtures locally.")
+    parser.add_argument("--fixtures", default="fixtures", help="Directory written by CRICBUZZ_RECORD_DIR")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Base delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Extra uniform random delay")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="Status used for injected errors")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply match/ranking lists N times")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+    handler = make_handler(
+        fixtures, args.latency_ms, args.jitter_ms,
+        args.error_rate, args.error_status, args.scale
+    )
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+
+    print(f"✅ Serving {len(fixtures)} fixtures from {args.fixtures} at http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
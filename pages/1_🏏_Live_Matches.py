@@ -1,50 +1,128 @@
+import time
+
 import streamlit as st
-from utils.api_handler import get_live_matches
+from utils.api_handler import get_live_snapshot, wait_live_snapshot
+from utils.live_diff import Changeset, diff_matches, extract_matches
 
 st.title("🟢 Live Matches")
 
-data = get_live_matches()
+# The run stays alive between snapshots; it wakes this often to refresh the
+# header (which also lets Streamlit stop the run on navigation)
+TICK_S = 1.0
+
+
+def _innings_md(team: str, team_score: dict) -> str:
+    lines = [f"### {team}"]
+    if team_score:
+        inn = team_score.get("inngs1", {})
+        lines.append(f"Runs: **{inn.get('runs','-')} / {inn.get('wickets','-')}**")
+        lines.append(f"Overs: {inn.get('overs','-')}")
+    return "  \n".join(lines)
+
+
+def _build_block(record: dict) -> tuple:
+    """
+    Pre-rendered markdown for one match: (team1 column, team2 column, status).
+    """
+    score = record["score"]
+    return (
+        _innings_md(record["team1"], score.get("team1Score")),
+        _innings_md(record["team2"], score.get("team2Score")),
+        f"**Match Status:** {record['status']}",
+    )
+
+
+def _apply(view: dict, snapshot) -> Changeset:
+    """
+    Diff `snapshot` against the session's view and rebuild only the
+    blocks of matches in the changeset.
+    """
+    records = extract_matches(snapshot.data)
+    changes = diff_matches(view["records"], records)
+
+    for match_id in changes.removed:
+        view["blocks"].pop(match_id, None)
+    for match_id in changes.touched:
+        view["blocks"][match_id] = _build_block(records[match_id])
+
+    view.update(version=snapshot.version, records=records, changes=changes)
+    return changes
+
+
+def _draw_match(slot, block: tuple, updated: bool) -> None:
+    team1_md, team2_md, status_md = block
+    with slot.container():
+        col1, col2 = st.columns(2)
+        col1.markdown(team1_md)
+        col2.markdown(team2_md)
+        st.markdown(f"🔄 {status_md}" if updated else status_md)
+        st.markdown("---")
 
-if not data.get("ok"):
-    st.error(f"API error (status {data.get('status')}): {data.get('error')}")
+
+def _draw_header(slot, snapshot, changes) -> None:
+    updated = time.strftime("%H:%M:%S", time.localtime(snapshot.updated_at))
+    checked = max(0, int(time.time() - snapshot.checked_at))
+    with slot.container():
+        st.caption(f"Last updated {updated} · checked {checked}s ago · snapshot v{snapshot.version}")
+        if snapshot.error:
+            st.warning(f"Showing last good data; latest refresh failed: {snapshot.error}")
+        if changes is not None and not changes.is_empty():
+            st.caption(
+                f"Since your last view: {len(changes.added)} new · "
+                f"{len(changes.changed)} updated · {len(changes.removed)} finished"
+            )
+
+
+snapshot = get_live_snapshot()
+
+if snapshot is None:
+    st.warning("Live feed is still loading, please refresh in a moment.")
+elif snapshot.data is None:
+    st.error(f"API error: {snapshot.error}")
 else:
-    payload = data.get("data", {})
-    matches = payload.get("typeMatches", [])
+    # Per-session view state: only matches in the changeset are rebuilt
+    view = st.session_state.setdefault(
+        "live_view", {"version": 0, "records": {}, "blocks": {}, "changes": None}
+    )
+    if view["version"] != snapshot.version:
+        _apply(view, snapshot)
+
+    header = st.empty()
+    _draw_header(header, snapshot, view["changes"])
 
-    if not matches:
+    records = view["records"]
+    changes = view["changes"]
+    flagged = set(changes.changed) if changes else set()
+
+    # One placeholder per match, drawn once per page run
+    slots = {}
+    if not records:
         st.info("There are no live matches at the moment.", icon="ℹ️")
-    else:
-        for group in matches:
-            st.header(group.get("matchType", "Unknown Format").upper())
-
-            for match in group.get("seriesMatches", []):
-                series = match.get("seriesAdWrapper", {})
-                series_name = series.get("seriesName", "Unknown Series")
-                st.subheader(f"🏆 {series_name}")
-
-                for m in series.get("matches", []):
-                    info = m.get("matchInfo", {})
-                    score = m.get("matchScore", {})
-
-                    team1 = info.get("team1", {}).get("teamSName", "Team 1")
-                    team2 = info.get("team2", {}).get("teamSName", "Team 2")
-                    status = info.get("status", "Status Unknown")
-
-                    col1, col2 = st.columns(2)
-
-                    with col1:
-                        st.markdown(f"### {team1}")
-                        if "team1Score" in score:
-                            t1 = score["team1Score"]["inngs1"]
-                            st.write(f"Runs: **{t1.get('runs','-')} / {t1.get('wickets','-')}**")
-                            st.write(f"Overs: {t1.get('overs','-')}")
-
-                    with col2:
-                        st.markdown(f"### {team2}")
-                        if "team2Score" in score:
-                            t2 = score["team2Score"]["inngs1"]
-                            st.write(f"Runs: **{t2.get('runs','-')} / {t2.get('wickets','-')}**")
-                            st.write(f"Overs: {t2.get('overs','-')}")
-
-                    st.markdown(f"**Match Status:** {status}")
-                    st.markdown("---")
+
+    current_type = current_series = None
+    for match_id, record in records.items():
+        if record["match_type"] != current_type:
+            current_type = record["match_type"]
+            current_series = None
+            st.header(current_type.upper())
+
+        if record["series_name"] != current_series:
+            current_series = record["series_name"]
+            st.subheader(f"🏆 {current_series}")
+
+        slots[match_id] = st.empty()
+        _draw_match(slots[match_id], view["blocks"][match_id], match_id in flagged)
+
+    # Later snapshots rewrite only the slots of changed matches (and clear
+    # the 🔄 from the previous batch); added or finished matches change
+    # the layout, so those rerun the page
+    while True:
+        snapshot = wait_live_snapshot(view["version"], TICK_S)
+        if snapshot.version != view["version"] and snapshot.data is not None:
+            changes = _apply(view, snapshot)
+            if changes.added or changes.removed:
+                st.rerun()
+            for match_id in flagged | set(changes.changed):
+                _draw_match(slots[match_id], view["blocks"][match_id], match_id in changes.changed)
+            flagged = set(changes.changed)
+        _draw_header(header, snapshot, view["changes"])
@@ -1,7 +1,11 @@
 import streamlit as st
 import pandas as pd
 
-from utils.api_handler import get_top_batters, get_top_bowlers, get_top_stats
+from utils.api_handler import (
+    PROFILES, fetch_many, get_player_profile, get_top_batters, get_top_bowlers, get_top_stats
+)
+from utils.local_search import SOURCE_CRICBUZZ, search_local, search_players
+from utils.player_profiles import cricbuzz_id_for
 
 st.set_page_config(page_title="Top Player Stats", layout="wide")
 
@@ -17,48 +21,14 @@ fmt = st.selectbox(
 )
 
 # ---------------------------
-# Top Batters
+# Layout (sections are filled once all calls land)
 # ---------------------------
 st.subheader("🏏 Top Batters (ICC Rankings)")
+batters_box = st.container()
 
-batters_res = get_top_batters(fmt)
-
-if not batters_res["ok"]:
-    st.error(f"Batters API Error: {batters_res['error']}")
-else:
-    data = batters_res["data"].get("rank", [])
-
-    if not data:
-        st.warning("No batting data available.")
-    else:
-        df = pd.DataFrame(data)
-        cols = ["rank", "name", "country", "rating"]
-        df = df[[c for c in cols if c in df.columns]]
-        st.dataframe(df, use_container_width=True)
-
-# ---------------------------
-# Top Bowlers
-# ---------------------------
 st.subheader("🎯 Top Bowlers (ICC Rankings)")
+bowlers_box = st.container()
 
-bowlers_res = get_top_bowlers(fmt)
-
-if not bowlers_res["ok"]:
-    st.error(f"Bowlers API Error: {bowlers_res['error']}")
-else:
-    data = bowlers_res["data"].get("rank", [])
-
-    if not data:
-        st.warning("No bowling data available.")
-    else:
-        df = pd.DataFrame(data)
-        cols = ["rank", "name", "country", "rating"]
-        df = df[[c for c in cols if c in df.columns]]
-        st.dataframe(df, use_container_width=True)
-
-# ==================================================
-# SECTION 3: HISTORICAL TOP STATS (CRICBUZZ)
-# ==================================================
 st.subheader("📈 Historical Top Stats (Cricbuzz)")
 
 fmt_map = {
@@ -89,28 +59,149 @@ with col2:
         key="topstats_type"
     )
 
-stats_res = get_top_stats(
-    stats_type=record_type[1],
-    format_id=fmt_map[record_format]
-)
+stats_box = st.container()
 
-if not stats_res["ok"]:
-    st.error(f"Top Stats API Error: {stats_res['error']}")
-else:
-    headers = stats_res["data"].get("headers", [])
-    values = stats_res["data"].get("values", [])
+# ---------------------------
+# Fetch all three concurrently
+# ---------------------------
+with st.spinner("Fetching stats..."):
+    results = fetch_many({
+        "batters": (get_top_batters, fmt),
+        "bowlers": (get_top_bowlers, fmt),
+        "stats": (get_top_stats, record_type[1], fmt_map[record_format]),
+    })
+
+batters_res = results["batters"]
+bowlers_res = results["bowlers"]
+stats_res = results["stats"]
+
+# Store ranked players' profiles locally in the background (already stored ones are skipped)
+ranked = {}
+for res in (batters_res, bowlers_res):
+    if res["ok"]:
+        for r in res["data"].get("rank", []):
+            if str(r.get("id", "")).isdigit():
+                ranked[int(r["id"])] = r.get("name", "")
+if ranked:
+    PROFILES.prefetch_async(ranked)
+
+# ---------------------------
+# Top Batters
+# ---------------------------
+with batters_box:
+    if not batters_res["ok"]:
+        st.error(f"Batters API Error: {batters_res['error']}")
+    else:
+        data = batters_res["data"].get("rank", [])
+
+        if not data:
+            st.warning("No batting data available.")
+        else:
+            df = pd.DataFrame(data)
+            cols = ["rank", "name", "country", "rating"]
+            df = df[[c for c in cols if c in df.columns]]
+            st.dataframe(df, use_container_width=True)
+
+# ---------------------------
+# Top Bowlers
+# ---------------------------
+with bowlers_box:
+    if not bowlers_res["ok"]:
+        st.error(f"Bowlers API Error: {bowlers_res['error']}")
+    else:
+        data = bowlers_res["data"].get("rank", [])
+
+        if not data:
+            st.warning("No bowling data available.")
+        else:
+            df = pd.DataFrame(data)
+            cols = ["rank", "name", "country", "rating"]
+            df = df[[c for c in cols if c in df.columns]]
+            st.dataframe(df, use_container_width=True)
+
+# ==================================================
+# SECTION 3: HISTORICAL TOP STATS (CRICBUZZ)
+# ==================================================
+with stats_box:
+    if not stats_res["ok"]:
+        st.error(f"Top Stats API Error: {stats_res['error']}")
+    else:
+        headers = stats_res["data"].get("headers", [])
+        values = stats_res["data"].get("values", [])
+
+        if not headers or not values:
+            st.warning("No data available.")
+        else:
+            # --- FIX: Cricbuzz returns an extra leading value ---
+            clean_rows = []
+            for v in values:
+                row = v.get("values", [])
+                if len(row) > len(headers):
+                    row = row[-len(headers):]  # drop extra index
+                clean_rows.append(row)
+
+            df = pd.DataFrame(clean_rows, columns=headers)
+
+            st.dataframe(df, use_container_width=True)
 
-    if not headers or not values:
-        st.warning("No data available.")
+# ==================================================
+# SECTION 4: PLAYER / VENUE / SERIES LOOKUP
+# ==================================================
+st.subheader("🔎 Lookup")
+st.caption("Searches the local database (substring, then fuzzy); players not found locally are looked up on Cricbuzz.")
+
+col_kind, col_text = st.columns([1, 3])
+with col_kind:
+    kind = st.selectbox("Search", ["player", "venue", "series"], format_func=str.title)
+with col_text:
+    text = st.text_input("Name", placeholder="e.g. kohli, eden gardens, ashes")
+
+if text.strip():
+    result = search_players(text) if kind == "player" else search_local(kind, text)
+    if result.error:
+        st.error(f"Search API Error: {result.error}")
+    elif not result.hits:
+        st.info("No matches.")
     else:
-        # --- FIX: Cricbuzz returns an extra leading value ---
-        clean_rows = []
-        for v in values:
-            row = v.get("values", [])
-            if len(row) > len(headers):
-                row = row[-len(headers):]  # drop extra index
-            clean_rows.append(row)
+        st.dataframe(
+            pd.DataFrame([{"name": h.name, "details": h.detail, "id": h.id, "score": h.score}
+                          for h in result.hits]),
+            use_container_width=True,
+        )
+    where = "Cricbuzz (no local match)" if result.source == SOURCE_CRICBUZZ else "local DB"
+    st.caption(f"{where}{' · fuzzy' if result.fuzzy else ''} · {result.elapsed_ms:.1f} ms")
 
-        df = pd.DataFrame(clean_rows, columns=headers)
 
-        st.dataframe(df, use_container_width=True)
+# ==================================================
+# SECTION 5: PLAYER PROFILE (LOCAL STORE)
+# ==================================================
+st.subheader("🪪 Player Profile")
+st.caption("Profiles are read from the local store; only missing or week-old ones are fetched from Cricbuzz.")
+
+choices = {f"{name} (ranked)": cid for cid, name in ranked.items()}
+if text.strip() and kind == "player":
+    for h in result.hits:
+        cid = int(h.id) if h.source == SOURCE_CRICBUZZ and h.id.isdigit() else cricbuzz_id_for(h.id)
+        if cid is not None:
+            choices.setdefault(f"{h.name} ({h.detail or h.source})", cid)
+
+if not choices:
+    st.info("No ranked or looked-up player with a Cricbuzz id.")
+else:
+    label = st.selectbox("Player", list(choices), key="profile_player")
+    profile = get_player_profile(choices[label])
+    if not profile:
+        st.error("Profile unavailable (not stored locally and the API call failed).")
+    else:
+        fields = {
+            "Name": profile.get("name"),
+            "Team": profile.get("intlTeam"),
+            "Role": profile.get("role"),
+            "Batting": profile.get("bat"),
+            "Bowling": profile.get("bowl"),
+            "Born": profile.get("DoBFormat") or profile.get("DoB"),
+            "Birth place": profile.get("birthPlace"),
+        }
+        st.table(pd.DataFrame(
+            [(k, v) for k, v in fields.items() if v], columns=["Field", "Value"]
+        ).set_index("Field"))
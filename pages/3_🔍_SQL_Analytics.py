@@ -1,12 +1,23 @@
-import streamlit as st
+import os
+
 import pandas as pd
-from utils.db_connection import get_connection
+import streamlit as st
+from utils.columnar import MIRROR
+from utils.db_connection import DB_PATH
+from utils.query_cache import cached_page, normalize_sql
+from utils.query_governor import QUERY_TIMEOUT_S, QueryCancelled, QueryRejected, governed
+from utils.query_profiler import profile_query
 from utils.queries import QUERIES
+from utils.sql_pager import (
+    LIMIT_BYTES, LIMIT_RESULT_BYTES, LIMIT_ROWS, MAX_PAGE_BYTES, MAX_RESULT_BYTES, MAX_RESULT_ROWS,
+    PAGE_SIZE,
+)
 
 st.title("🔍 SQL Analytics")
-st.caption("Runs against the local SQLite DB (cricket.db by default).")
-
-conn = get_connection()
+st.caption(
+    f"Runs read-only against the local SQLite DB ({os.path.basename(DB_PATH)}). "
+    f"Queries are cancelled after {QUERY_TIMEOUT_S:g} s."
+)
 
 # -------------------------------
 # Query selector
@@ -41,13 +52,122 @@ else:
 # -------------------------------
 # Run query
 # -------------------------------
-if st.button("Run Query", type="primary"):
+run_col, profile_col = st.columns([1, 6])
+run_clicked = run_col.button("Run Query", type="primary")
+profile_clicked = profile_col.button("Profile")
+
+def _reset_pages(sql: str) -> None:
+    st.session_state["sql_pages"] = {"sql": sql, "cursors": [(None, 0, 0)]}
+
+
+def _next_page(last_key, next_start, next_bytes) -> None:
+    st.session_state["sql_pages"]["cursors"].append((last_key, next_start, next_bytes))
+
+
+def _prev_page() -> None:
+    st.session_state["sql_pages"]["cursors"].pop()
+
+
+if run_clicked:
+    if not sql_query.strip():
+        st.warning("Please enter a SQL query.")
+        st.session_state.pop("sql_pages", None)
+    else:
+        st.session_state.pop("sql_page_keys", None)
+        _reset_pages(sql_query)
+
+pager = st.session_state.get("sql_pages")
+if pager is not None:
+    key_columns = tuple(st.session_state.get("sql_page_keys", ()))
+    after, start, start_bytes = pager["cursors"][-1]
+    try:
+        page, from_cache = cached_page(pager["sql"], PAGE_SIZE, key_columns, after, start, start_bytes)
+    except QueryCancelled as e:
+        st.error(f"⏱ {e} Narrow it down with filters or a LIMIT.")
+    except QueryRejected as e:
+        st.warning(str(e))
+    except Exception as e:
+        st.error(f"SQL Error: {e}")
+    else:
+        if page.columns:
+            st.dataframe(pd.DataFrame(page.rows, columns=page.columns), use_container_width=True)
+
+        shown_to = page.start + len(page.rows)
+        st.success(
+            f"Rows {page.start + 1 if page.rows else 0}–{shown_to}"
+            + (" (more available)" if page.has_more else "")
+            + f" · {page.elapsed_ms:.0f} ms · {page.engine}"
+        )
+        if page.limit_hit == LIMIT_ROWS:
+            st.warning(f"Stopped at the {MAX_RESULT_ROWS:,}-row ceiling. Add filters or a LIMIT.")
+        elif page.limit_hit == LIMIT_RESULT_BYTES:
+            st.warning(f"Stopped at the {MAX_RESULT_BYTES // (1024 * 1024)} MiB result-size ceiling. "
+                       "Add filters, select fewer columns, or a LIMIT.")
+        elif page.limit_hit == LIMIT_BYTES:
+            st.caption(f"Page cut short at the {MAX_PAGE_BYTES // (1024 * 1024)} MiB page-size ceiling.")
+        if from_cache:
+            st.caption("⚡ Served from the shared result cache (no DB changes since it was computed).")
+
+        timings = MIRROR.timings_for(normalize_sql(pager["sql"]))
+        if timings:
+            with st.expander("Engine comparison (SQLite vs DuckDB)"):
+                st.json(timings)
+
+        if page.pageable:
+            nav_prev, nav_next, nav_keys = st.columns([1, 1, 4])
+            nav_prev.button("◀ Prev", disabled=len(pager["cursors"]) == 1, on_click=_prev_page)
+            nav_next.button("Next ▶", disabled=not page.has_more,
+                            on_click=_next_page,
+                            args=(page.last_key, shown_to, page.start_bytes + page.nbytes))
+            nav_keys.multiselect(
+                "Page by key columns (keyset; leave empty for row order)",
+                page.columns,
+                key="sql_page_keys",
+                on_change=_reset_pages,
+                args=(pager["sql"],),
+                help="Pick a unique column (or combination) to order by and jump straight to the "
+                     "rows after the last one shown, instead of skipping earlier rows.",
+            )
+        else:
+            st.caption("Statement ran as-is; only plain SELECT/WITH queries can be paged.")
+
+# -------------------------------
+# Profile query
+# -------------------------------
+if profile_clicked:
     if not sql_query.strip():
         st.warning("Please enter a SQL query.")
     else:
         try:
-            df = pd.read_sql_query(sql_query, conn)
-            st.dataframe(df, use_container_width=True)
-            st.success(f"Returned {len(df)} rows.")
+            with governed(sql_query) as q:
+                prof = profile_query(q.conn, sql_query, deadline=q.deadline)
+        except QueryCancelled as e:
+            st.error(f"⏱ {e}")
+        except QueryRejected as e:
+            st.warning(str(e))
         except Exception as e:
             st.error(f"SQL Error: {e}")
+        else:
+            st.subheader("Query Profile")
+
+            c1, c2, c3, c4, c5 = st.columns(5)
+            c1.metric("Prepare", f"{prof['prepare_ms']:.2f} ms")
+            c2.metric("Execute", f"{prof['execute_ms']:.2f} ms")
+            c3.metric("Fetch", f"{prof['fetch_ms']:.2f} ms")
+            c4.metric("Rows", f"{prof['rows']:,}" + ("+" if prof["rows_truncated"] else ""))
+            c5.metric("VM steps", f"~{prof['vm_steps']:,}")
+            if prof["rows_truncated"]:
+                st.caption(f"Stopped counting at the {MAX_RESULT_ROWS:,}-row ceiling; timings cover those rows.")
+
+            st.markdown("**EXPLAIN QUERY PLAN**")
+            st.code(prof["plan_text"] or "(empty plan)", language="text")
+
+            if prof["full_scans"]:
+                st.warning(f"Full table scans: {', '.join(prof['full_scans'])}")
+                if prof["suggested_indexes"]:
+                    st.markdown("**Suggested indexes**")
+                    st.code("\n".join(prof["suggested_indexes"]), language="sql")
+                else:
+                    st.caption("No filter/join columns to index on; the scan covers the whole table by design.")
+            else:
+                st.success("No full table scans.")
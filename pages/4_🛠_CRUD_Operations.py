@@ -1,10 +1,89 @@
 import streamlit as st
 import pandas as pd
-from utils.db_connection import db_cursor, get_connection
+from utils.bulk_import import PLAYERS, TEAMS, ImportFileError, bulk_upsert, read_upload
+from utils.db_connection import db_cursor
+from utils.table_views import PLAYERS_VIEW, TEAMS_VIEW, count_rows, distinct_values, fetch_view_page
 
 st.title("🛠 CRUD Operations")
 st.caption("Manage sample Players & Teams tables in SQLite.")
 
+
+def _reset_view(table: str) -> None:
+    st.session_state[f"view_{table}"] = [(None, 0)]
+
+
+def _next_view_page(table: str, last_key, shown_to: int) -> None:
+    st.session_state[f"view_{table}"].append((last_key, shown_to))
+
+
+def _prev_view_page(table: str) -> None:
+    st.session_state[f"view_{table}"].pop()
+
+
+def table_view_section(view, choices: dict) -> None:
+    """
+    One keyset page of `view` with search and exact-match filters;
+    `choices` maps each filter column to its selectbox options.
+    """
+    table = view.table
+    if f"view_{table}" not in st.session_state:
+        _reset_view(table)
+
+    cols = st.columns(1 + len(view.filters))
+    search = cols[0].text_input("Search name", key=f"{table}_search",
+                                on_change=_reset_view, args=(table,))
+    filters = {}
+    for col, column in zip(cols[1:], view.filters):
+        label = column.replace("_", " ").title()
+        value = col.selectbox(label, ["All"] + list(choices[column]), key=f"{table}_{column}",
+                              on_change=_reset_view, args=(table,))
+        if value != "All":
+            filters[column] = value
+
+    after, start = st.session_state[f"view_{table}"][-1]
+    page = fetch_view_page(view, search, filters, after, start)
+    total = count_rows(view, search, filters)
+
+    st.dataframe(pd.DataFrame(page.rows, columns=page.columns), use_container_width=True)
+    shown_to = start + len(page.rows)
+    st.caption(f"Rows {start + 1 if page.rows else 0}–{shown_to} of {total:,}")
+
+    nav_prev, nav_next, _ = st.columns([1, 1, 6])
+    nav_prev.button("◀ Prev", key=f"{table}_prev", disabled=len(st.session_state[f"view_{table}"]) == 1,
+                    on_click=_prev_view_page, args=(table,))
+    nav_next.button("Next ▶", key=f"{table}_next", disabled=not page.has_more,
+                    on_click=_next_view_page, args=(table, page.last_key, shown_to))
+
+
+def bulk_import_section(spec) -> None:
+    st.subheader(f"Bulk Import {spec.table.title()}")
+    st.caption(
+        f"CSV with a header row, or JSON (a list of objects). Columns: {', '.join(spec.columns)}; "
+        f"required: {', '.join(spec.required)}. Existing {spec.key} values are updated."
+    )
+    upload = st.file_uploader("Upload file", type=["csv", "json"], key=f"import_{spec.table}")
+    if upload is None or not st.button("Import", key=f"import_btn_{spec.table}"):
+        return
+
+    try:
+        result = bulk_upsert(read_upload(upload.getvalue(), upload.name, spec.table), spec)
+    except ImportFileError as e:
+        st.error(str(e))
+        return
+    except Exception as e:
+        st.error(f"Import failed, nothing was saved: {e}")
+        return
+
+    st.success(
+        f"Imported {result.imported:,} of {result.received:,} rows "
+        f"({result.inserted:,} new, {result.updated:,} updated) in {result.seconds:.2f} s "
+        f"· {result.rows_per_sec:,.0f} rows/s"
+    )
+    if result.errors:
+        st.warning(f"{len(result.errors):,} problem(s); those rows were skipped.")
+        st.dataframe(pd.DataFrame(result.errors), use_container_width=True)
+
+
 tab1, tab2 = st.tabs(["Players", "Teams"])
 
 # -------- Players --------
@@ -37,10 +116,15 @@ with tab1:
             cur.execute("DELETE FROM players WHERE player_id=?", (del_id,))
         st.warning(f"Deleted player {del_id}.")
 
+    st.divider()
+    bulk_import_section(PLAYERS)
+
     st.divider()
     st.subheader("Players Table")
-    df = pd.read_sql_query("SELECT * FROM players ORDER BY full_name;", get_connection())
-    st.dataframe(df, use_container_width=True)
+    table_view_section(PLAYERS_VIEW, {
+        "country": distinct_values(PLAYERS_VIEW, "country"),
+        "playing_role": distinct_values(PLAYERS_VIEW, "playing_role"),
+    })
 
 # -------- Teams --------
 # -------- Teams --------
@@ -77,14 +161,13 @@ with tab2:
             )
         st.warning(f"Deleted team {del_team}.")
 
+    st.divider()
+    bulk_import_section(TEAMS)
+
     st.divider()
 
     st.subheader("Teams Table")
-    df2 = pd.read_sql_query(
-        "SELECT * FROM teams ORDER BY team_name;",
-        get_connection()
-    )
-    st.dataframe(df2, use_container_width=True)
+    table_view_section(TEAMS_VIEW, {"country": distinct_values(TEAMS_VIEW, "country")})
 
 # with tab2:
 #     st.subheader("Create / Update Team")
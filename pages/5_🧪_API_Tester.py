@@ -1,5 +1,6 @@
 import streamlit as st
 from utils.api_handler import safe_get
+from utils.quota import PRIORITY_ADHOC
 
 st.title("🧪 API Tester")
 st.caption("Enter any RapidAPI Cricbuzz path and optional params to try endpoints quickly.")
@@ -14,7 +15,7 @@ if run:
     except Exception as e:
         st.error(f"Invalid params JSON-like dict: {e}")
         st.stop()
-    res = safe_get(path, params=params)
+    res = safe_get(path, params=params, priority=PRIORITY_ADHOC, raw=True)
     if res["ok"]:
         st.success("OK 200")
         st.json(res["data"])
@@ -0,0 +1,93 @@
+import json
+
+import streamlit as st
+import pandas as pd
+
+from utils.api_handler import METRICS, PROFILES, RESPONSE_CACHE, metrics_json, quota_stats
+from utils import query_governor
+from utils.columnar import MIRROR
+from utils.db_connection import RO_POOL
+
+st.title("📈 API Diagnostics")
+st.caption("Per-endpoint latency, payload size, status codes, retries and cache hit rates for this server process.")
+
+snapshot = METRICS.snapshot()
+endpoints = snapshot["endpoints"]
+
+# -------------------------------
+# Endpoint table
+# -------------------------------
+st.subheader("Endpoints")
+
+if not endpoints:
+    st.info("No API calls recorded yet. Open the Live Matches or Top Player Stats page first.", icon="ℹ️")
+else:
+    rows = []
+    for bucket, s in endpoints.items():
+        rows.append({
+            "endpoint": bucket,
+            "calls": s["calls"],
+            "network": s["network_requests"],
+            "p50 ms": s["p50_ms"],
+            "p95 ms": s["p95_ms"],
+            "p99 ms": s["p99_ms"],
+            "avg KB": round(s["avg_bytes"] / 1024, 1),
+            "max KB": round(s["max_bytes"] / 1024, 1),
+            "retries": s["retries"],
+            "error rate": s["error_rate"],
+            "cache hit rate": s["cache_hit_rate"],
+            "statuses": json.dumps(s["statuses"]),
+        })
+
+    df = pd.DataFrame(rows).sort_values("p95 ms", ascending=False, na_position="last")
+    st.dataframe(df, use_container_width=True, hide_index=True)
+
+# -------------------------------
+# Caches & quota
+# -------------------------------
+col1, col2 = st.columns(2)
+
+with col1:
+    st.subheader("Response cache")
+    st.json(RESPONSE_CACHE.stats())
+
+with col2:
+    st.subheader("Quota")
+    st.json(quota_stats())
+
+# -------------------------------
+# SQL Analytics governor
+# -------------------------------
+st.subheader("SQL Analytics")
+col3, col4 = st.columns(2)
+
+with col3:
+    st.caption("Query governor (timeouts, heavy-query slots)")
+    st.json(query_governor.stats())
+
+with col4:
+    st.caption("Read-only connection pool")
+    st.json(RO_POOL.stats())
+
+st.caption("Columnar mirror (DuckDB)")
+st.json(MIRROR.stats())
+engine_timings = MIRROR.timings()
+if engine_timings:
+    st.dataframe(pd.DataFrame(engine_timings), use_container_width=True)
+
+st.caption("Player profile prefetch")
+st.json(PROFILES.stats())
+
+# -------------------------------
+# Export / reset
+# -------------------------------
+st.download_button(
+    "Download metrics JSON",
+    data=metrics_json(),
+    file_name="cricbuzz_metrics.json",
+    mime="application/json",
+)
+
+if st.button("Reset metrics"):
+    METRICS.reset()
+    st.rerun()
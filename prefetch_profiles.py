@@ -0,0 +1,58 @@
+"""
+Store Cricbuzz profiles locally for every ranked player and every player
+the DB already knows by Cricbuzz id (utils/player_profiles.py), mapping
+each id to a local player on the way.
+
+    python prefetch_profiles.py                       # ranked + known players, 4 workers
+    python prefetch_profiles.py --workers 8 --max-age-days 1
+    python prefetch_profiles.py --ids 1413,8733       # just these
+
+Profiles stored within --max-age-days are not fetched again, so reruns
+only spend API calls on new or stale players.
+"""
+import argparse
+import os
+import sys
+import time
+from dataclasses import asdict
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Prefetch Cricbuzz player profiles into the local DB.")
+    parser.add_argument("--db", default=os.environ.get("CRICKET_DB_PATH", "cricket2.db"))
+    parser.add_argument("--workers", type=int, default=4, help="concurrent profile requests")
+    parser.add_argument("--max-age-days", type=float, default=7,
+                        help="refetch profiles stored longer ago than this")
+    parser.add_argument("--ids", default="", help="comma-separated Cricbuzz ids instead of ranked/known players")
+    args = parser.parse_args()
+
+    # The DB path must be set before the API/DB modules read it
+    os.environ["CRICKET_DB_PATH"] = args.db
+    from utils.api_handler import player_summary, ranked_player_ids
+    from utils.db_connection import get_connection
+    from utils.player_profiles import ProfilePrefetcher, known_cricbuzz_ids
+
+    get_connection().close()              # applies pending migrations
+
+    if args.ids:
+        try:
+            ids = [int(i) for i in args.ids.split(",") if i.strip()]
+        except ValueError:
+            parser.error("--ids must be comma-separated integers")
+    else:
+        ids = sorted(set(ranked_player_ids()) | set(known_cricbuzz_ids()))
+
+    prefetcher = ProfilePrefetcher(player_summary, workers=args.workers)
+    report = prefetcher.prefetch(ids, max_age=args.max_age_days * 24 * 3600)
+
+    fields = asdict(report)
+    failed = fields.pop("failed")
+    print(time.strftime("%Y-%m-%d %H:%M:%S"),
+          " ".join(f"{k}={v}" for k, v in fields.items()), f"failed={len(failed)}", flush=True)
+    for cid, error in failed.items():
+        print(f"   ! {cid}: {error}", file=sys.stderr, flush=True)
+    return 1 if failed and not report.fetched and not report.fresh else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,9 +1,12 @@
+import os
 import requests
 
-url = "https://cricbuzz-cricket.p.rapidapi.com/matches/v1/live"
+# Point CRICBUZZ_BASE_URL at mock_server.py to test without spending quota
+base_url = os.environ.get("CRICBUZZ_BASE_URL", "https://cricbuzz-cricket.p.rapidapi.com")
+url = f"{base_url}/matches/v1/live"
 
 headers = {
-    "X-RapidAPI-Key": "YOUR_API_KEY",
+    "X-RapidAPI-Key": os.environ.get("RAPIDAPI_KEY", "YOUR_API_KEY"),
     "X-RapidAPI-Host": "cricbuzz-cricket.p.rapidapi.com",
     "User-Agent": "Mozilla/5.0",
     "Accept": "application/json",
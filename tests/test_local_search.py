@@ -0,0 +1,43 @@
+import os
+import tempfile
+
+# The DB path must be set before the DB modules read it
+os.environ["CRICKET_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "search.db")
+
+from utils.db_connection import get_connection  # noqa: E402
+from utils.local_search import search_local  # noqa: E402
+from utils.migrations import apply_migrations  # noqa: E402
+from utils.schema import reset_schema  # noqa: E402
+
+PLAYERS = [
+    ("p1", "Virat Kohli", "India", "Batsman"),
+    ("p2", "Pat Cummins", "Australia", "Bowler"),
+    ("p3", "Kane Williamson", "New Zealand", "Batsman"),
+]
+
+conn = get_connection()
+reset_schema(conn)
+conn.executemany(
+    "INSERT INTO players (player_id, full_name, country, playing_role) VALUES (?, ?, ?, ?);",
+    PLAYERS,
+)
+conn.commit()
+apply_migrations(conn)
+conn.close()
+
+
+def test_substring_match_is_not_fuzzy():
+    result = search_local("player", "kohli")
+    assert not result.fuzzy
+    assert [h.name for h in result.hits] == ["Virat Kohli"]
+
+
+def test_transposition_with_no_shared_trigram():
+    # "kholi" shares no trigram with "kohli"
+    result = search_local("player", "kholi")
+    assert result.fuzzy
+    assert [h.name for h in result.hits] == ["Virat Kohli"]
+
+
+def test_unrelated_text_finds_nothing():
+    assert search_local("player", "zzzz").hits == []
@@ -0,0 +1,235 @@
+"""
+Materialized summary tables behind the heavier preset queries.
+
+- agg_batting      per (player, format): Q9, Q20, Q21
+- agg_bowling      per (player, format): Q9, Q21
+- agg_toss         per toss decision:    Q17
+
+Triggers on the base tables keep them current on every INSERT, UPDATE and
+DELETE, whichever page or script makes the write. Grouping keys are stored
+with NULL folded to '' so upserts can match on them.
+"""
+import sqlite3
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS agg_batting (
+    player_id TEXT NOT NULL,
+    format TEXT NOT NULL,
+    innings INTEGER NOT NULL DEFAULT 0,
+    matches INTEGER NOT NULL DEFAULT 0,
+    runs_sum INTEGER NOT NULL DEFAULT 0,
+    runs_n INTEGER NOT NULL DEFAULT 0,
+    sr_sum REAL NOT NULL DEFAULT 0,
+    sr_n INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (player_id, format)
+);
+
+-- innings per (player, format, match), so matches = COUNT(DISTINCT match_id)
+CREATE TABLE IF NOT EXISTS agg_batting_match (
+    player_id TEXT NOT NULL,
+    format TEXT NOT NULL,
+    match_id INTEGER NOT NULL,
+    innings INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (player_id, format, match_id)
+);
+
+CREATE TABLE IF NOT EXISTS agg_bowling (
+    player_id TEXT NOT NULL,
+    format TEXT NOT NULL,
+    spells INTEGER NOT NULL DEFAULT 0,
+    wickets_sum INTEGER NOT NULL DEFAULT 0,
+    econ_sum REAL NOT NULL DEFAULT 0,
+    econ_n INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (player_id, format)
+);
+
+CREATE TABLE IF NOT EXISTS agg_toss (
+    toss_decision TEXT PRIMARY KEY,
+    total_matches INTEGER NOT NULL DEFAULT 0,
+    toss_and_match_wins INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+BACKFILL_SQL = """
+DELETE FROM agg_batting;
+DELETE FROM agg_batting_match;
+DELETE FROM agg_bowling;
+DELETE FROM agg_toss;
+
+INSERT INTO agg_batting_match (player_id, format, match_id, innings)
+SELECT COALESCE(player_id, ''), COALESCE(format, ''), COALESCE(match_id, 0), COUNT(*)
+FROM batting_stats
+GROUP BY 1, 2, 3;
+
+INSERT INTO agg_batting (player_id, format, innings, matches, runs_sum, runs_n, sr_sum, sr_n)
+SELECT
+    COALESCE(player_id, ''), COALESCE(format, ''),
+    COUNT(*),
+    COUNT(DISTINCT match_id),
+    COALESCE(SUM(runs), 0), COUNT(runs),
+    COALESCE(SUM(strike_rate), 0), COUNT(strike_rate)
+FROM batting_stats
+GROUP BY 1, 2;
+
+INSERT INTO agg_bowling (player_id, format, spells, wickets_sum, econ_sum, econ_n)
+SELECT
+    COALESCE(player_id, ''), COALESCE(format, ''),
+    COUNT(*),
+    COALESCE(SUM(wickets), 0),
+    COALESCE(SUM(economy_rate), 0), COUNT(economy_rate)
+FROM bowling_stats
+GROUP BY 1, 2;
+
+INSERT INTO agg_toss (toss_decision, total_matches, toss_and_match_wins)
+SELECT
+    COALESCE(md.toss_decision, ''),
+    COUNT(*),
+    SUM(CASE WHEN md.toss_winner = m.winning_team THEN 1 ELSE 0 END)
+FROM matches m
+JOIN match_details md ON m.match_id = md.match_id
+GROUP BY 1;
+"""
+
+# Row-level deltas. UPDATE = remove the OLD contribution, add the NEW one.
+_BATTING_ADD = """
+    INSERT INTO agg_batting_match (player_id, format, match_id, innings)
+    VALUES (COALESCE(NEW.player_id, ''), COALESCE(NEW.format, ''), COALESCE(NEW.match_id, 0), 1)
+    ON CONFLICT (player_id, format, match_id) DO UPDATE SET innings = innings + 1;
+
+    INSERT INTO agg_batting (player_id, format, innings, matches, runs_sum, runs_n, sr_sum, sr_n)
+    VALUES (
+        COALESCE(NEW.player_id, ''), COALESCE(NEW.format, ''), 1, 0,
+        COALESCE(NEW.runs, 0), NEW.runs IS NOT NULL,
+        COALESCE(NEW.strike_rate, 0), NEW.strike_rate IS NOT NULL
+    )
+    ON CONFLICT (player_id, format) DO UPDATE SET
+        innings = innings + 1,
+        runs_sum = runs_sum + excluded.runs_sum,
+        runs_n = runs_n + excluded.runs_n,
+        sr_sum = sr_sum + excluded.sr_sum,
+        sr_n = sr_n + excluded.sr_n;
+
+    UPDATE agg_batting SET matches = matches + 1
+    WHERE player_id = COALESCE(NEW.player_id, '') AND format = COALESCE(NEW.format, '')
+      AND (SELECT innings FROM agg_batting_match
+           WHERE player_id = COALESCE(NEW.player_id, '') AND format = COALESCE(NEW.format, '')
+             AND match_id = COALESCE(NEW.match_id, 0)) = 1;
+"""
+
+_BATTING_REMOVE = """
+    UPDATE agg_batting_match SET innings = innings - 1
+    WHERE player_id = COALESCE(OLD.player_id, '') AND format = COALESCE(OLD.format, '')
+      AND match_id = COALESCE(OLD.match_id, 0);
+
+    UPDATE agg_batting SET
+        innings = innings - 1,
+        matches = matches - (
+            SELECT COUNT(*) FROM agg_batting_match
+            WHERE player_id = COALESCE(OLD.player_id, '') AND format = COALESCE(OLD.format, '')
+              AND match_id = COALESCE(OLD.match_id, 0) AND innings = 0
+        ),
+        runs_sum = runs_sum - COALESCE(OLD.runs, 0),
+        runs_n = runs_n - (OLD.runs IS NOT NULL),
+        sr_sum = sr_sum - COALESCE(OLD.strike_rate, 0),
+        sr_n = sr_n - (OLD.strike_rate IS NOT NULL)
+    WHERE player_id = COALESCE(OLD.player_id, '') AND format = COALESCE(OLD.format, '');
+
+    DELETE FROM agg_batting_match
+    WHERE player_id = COALESCE(OLD.player_id, '') AND format = COALESCE(OLD.format, '')
+      AND match_id = COALESCE(OLD.match_id, 0) AND innings <= 0;
+
+    DELETE FROM agg_batting
+    WHERE player_id = COALESCE(OLD.player_id, '') AND format = COALESCE(OLD.format, '')
+      AND innings <= 0;
+"""
+
+_BOWLING_ADD = """
+    INSERT INTO agg_bowling (player_id, format, spells, wickets_sum, econ_sum, econ_n)
+    VALUES (
+        COALESCE(NEW.player_id, ''), COALESCE(NEW.format, ''), 1,
+        COALESCE(NEW.wickets, 0),
+        COALESCE(NEW.economy_rate, 0), NEW.economy_rate IS NOT NULL
+    )
+    ON CONFLICT (player_id, format) DO UPDATE SET
+        spells = spells + 1,
+        wickets_sum = wickets_sum + excluded.wickets_sum,
+        econ_sum = econ_sum + excluded.econ_sum,
+        econ_n = econ_n + excluded.econ_n;
+"""
+
+_BOWLING_REMOVE = """
+    UPDATE agg_bowling SET
+        spells = spells - 1,
+        wickets_sum = wickets_sum - COALESCE(OLD.wickets, 0),
+        econ_sum = econ_sum - COALESCE(OLD.economy_rate, 0),
+        econ_n = econ_n - (OLD.economy_rate IS NOT NULL)
+    WHERE player_id = COALESCE(OLD.player_id, '') AND format = COALESCE(OLD.format, '');
+
+    DELETE FROM agg_bowling
+    WHERE player_id = COALESCE(OLD.player_id, '') AND format = COALESCE(OLD.format, '')
+      AND spells <= 0;
+"""
+
+# Q17 joins matches and match_details, so a change to either side
+# re-counts that one match: subtract BEFORE the write, add back AFTER.
+_TOSS_ADD = """
+    INSERT INTO agg_toss (toss_decision, total_matches, toss_and_match_wins)
+    SELECT
+        COALESCE(md.toss_decision, ''), 1,
+        CASE WHEN md.toss_winner = m.winning_team THEN 1 ELSE 0 END
+    FROM matches m
+    JOIN match_details md ON m.match_id = md.match_id
+    WHERE m.match_id = NEW.match_id
+    ON CONFLICT (toss_decision) DO UPDATE SET
+        total_matches = total_matches + 1,
+        toss_and_match_wins = toss_and_match_wins + excluded.toss_and_match_wins;
+"""
+
+_TOSS_REMOVE = """
+    UPDATE agg_toss SET
+        total_matches = total_matches - 1,
+        toss_and_match_wins = toss_and_match_wins - (
+            SELECT CASE WHEN md.toss_winner = m.winning_team THEN 1 ELSE 0 END
+            FROM matches m
+            JOIN match_details md ON m.match_id = md.match_id
+            WHERE m.match_id = OLD.match_id
+        )
+    WHERE toss_decision = (
+        SELECT COALESCE(md.toss_decision, '')
+        FROM matches m
+        JOIN match_details md ON m.match_id = md.match_id
+        WHERE m.match_id = OLD.match_id
+    );
+"""
+
+
+def _trigger(name: str, timing: str, table: str, body: str) -> str:
+    return f"CREATE TRIGGER IF NOT EXISTS {name} {timing} ON {table} BEGIN {body} END;"
+
+
+TRIGGERS_SQL = "\n".join([
+    _trigger("trg_agg_batting_ins", "AFTER INSERT", "batting_stats", _BATTING_ADD),
+    _trigger("trg_agg_batting_del", "AFTER DELETE", "batting_stats", _BATTING_REMOVE),
+    _trigger("trg_agg_batting_upd", "AFTER UPDATE", "batting_stats", _BATTING_REMOVE + _BATTING_ADD),
+    _trigger("trg_agg_bowling_ins", "AFTER INSERT", "bowling_stats", _BOWLING_ADD),
+    _trigger("trg_agg_bowling_del", "AFTER DELETE", "bowling_stats", _BOWLING_REMOVE),
+    _trigger("trg_agg_bowling_upd", "AFTER UPDATE", "bowling_stats", _BOWLING_REMOVE + _BOWLING_ADD),
+    _trigger("trg_agg_toss_m_ins", "AFTER INSERT", "matches", _TOSS_ADD),
+    _trigger("trg_agg_toss_m_del", "BEFORE DELETE", "matches", _TOSS_REMOVE),
+    _trigger("trg_agg_toss_m_upd_old", "BEFORE UPDATE", "matches", _TOSS_REMOVE),
+    _trigger("trg_agg_toss_m_upd_new", "AFTER UPDATE", "matches", _TOSS_ADD),
+    _trigger("trg_agg_toss_md_ins", "AFTER INSERT", "match_details", _TOSS_ADD),
+    _trigger("trg_agg_toss_md_del", "BEFORE DELETE", "match_details", _TOSS_REMOVE),
+    _trigger("trg_agg_toss_md_upd_old", "BEFORE UPDATE", "match_details", _TOSS_REMOVE),
+    _trigger("trg_agg_toss_md_upd_new", "AFTER UPDATE", "match_details", _TOSS_ADD),
+])
+
+AGG_TABLES = ("agg_batting", "agg_batting_match", "agg_bowling", "agg_toss")
+
+
+def refresh_aggregates(conn: sqlite3.Connection) -> None:
+    """
+    Rebuild every summary table from the base tables in one transaction.
+    Use after bulk loads done with triggers dropped, or to repair drift.
+    """
+    conn.executescript("BEGIN;" + SCHEMA_SQL + BACKFILL_SQL + "COMMIT;")
@@ -1,7 +1,23 @@
 import os
+import time
 import requests
 import streamlit as st
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from utils.decoding import PROJECTIONS, loads, project
+from utils.disk_cache import DiskCache, key_for
+from utils.fixtures import record_fixture
+from utils.http_session import get_session, get_with_retry
+from utils.live_poller import LiveSnapshot, SnapshotStore, ensure_poller
+from utils.metrics import (
+    SOURCE_DISK, SOURCE_FALLBACK, SOURCE_MEMORY, SOURCE_NETWORK,
+    SOURCE_REVALIDATED, SOURCE_SHED, SOURCE_STALE, MetricsRegistry
+)
+from utils.player_profiles import PROFILE_MAX_AGE, ProfilePrefetcher, ids_from_rankings
+from utils.quota import PRIORITY_LIVE, PRIORITY_NAMES, PRIORITY_NORMAL, QuotaScheduler
+from utils.response_cache import FRESH, ResponseCache, make_key
 
 
 # -------------------------------
@@ -18,6 +34,7 @@ def _get_secret(key: str, default: Optional[str] = None) -> Optional[str]:
         return os.environ.get(key, default)
 
 
+@lru_cache(maxsize=1)
 def _rapid_headers() -> Dict[str, str]:
     api_key = _get_secret("RAPIDAPI_KEY")
     host = _get_secret("RAPIDAPI_HOST", "cricbuzz-cricket.p.rapidapi.com")
@@ -40,17 +57,163 @@ def _get_base_url() -> str:
     )
 
 
+def _get_int_secret(key: str, default: int) -> int:
+    try:
+        return int(_get_secret(key, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _by_prefix(table: Dict[str, Any], path: str, default: Any) -> Any:
+    """
+    Look up per-endpoint settings on the longest matching path prefix.
+    """
+    matches = [p for p in table if path.startswith(p)]
+    if not matches:
+        return default
+    return table[max(matches, key=len)]
+
+
+# -------------------------------
+# Per-endpoint timeouts
+# -------------------------------
+
+# (connect, read) seconds, matched on the longest path prefix
+ENDPOINT_TIMEOUTS: Dict[str, Tuple[float, float]] = {
+    "/matches/v1/live": (3.05, 8),
+    "/matches/v1/recent": (3.05, 10),
+    "/stats/v1/rankings": (3.05, 12),
+    "/stats/v1/topstats": (3.05, 12),
+    "/stats/v1/player": (3.05, 10),
+}
+
+DEFAULT_TIMEOUT: Tuple[float, float] = (3.05, 15)
+
+
+def _timeout_for(path: str) -> Tuple[float, float]:
+    return _by_prefix(ENDPOINT_TIMEOUTS, path, DEFAULT_TIMEOUT)
+
+
+# -------------------------------
+# Response cache
+# -------------------------------
+
+# Fresh lifetime in seconds; entries stay servable (stale) for as long again
+# while a background refresh runs. Paths without a rule are not cached.
+CACHE_TTLS: Dict[str, int] = {
+    "/matches/v1/live": 30,
+    "/matches/v1/recent": 60,
+    "/stats/v1/rankings": 6 * 3600,
+    "/stats/v1/topstats": 6 * 3600,
+    "/stats/v1/player/search": 3600,
+    "/stats/v1/player": 12 * 3600,
+}
+
+# Module-level, so one cache is shared by every Streamlit session
+RESPONSE_CACHE = ResponseCache(
+    max_bytes=_get_int_secret("RESPONSE_CACHE_MB", 32) * 1024 * 1024
+)
+
+# Published by the background live poller, read by every session
+LIVE_STORE = SnapshotStore()
+
+
+# -------------------------------
+# Persistent (on-disk) cache
+# -------------------------------
+
+# Slow-changing endpoints: served straight from disk while younger than
+# the max age, then revalidated with If-None-Match / If-Modified-Since.
+DISK_CACHE_MAX_AGE: Dict[str, int] = {
+    "/stats/v1/rankings": 24 * 3600,
+    "/stats/v1/topstats": 24 * 3600,
+    "/stats/v1/player/": 24 * 3600,
+    "/stats/v1/player/search": 0,        # ad-hoc lookups: memory cache only
+}
+
+DISK_CACHE = DiskCache(_get_secret("HTTP_CACHE_PATH", "http_cache.db"))
+
+
+# -------------------------------
+# Quota scheduling
+# -------------------------------
+
+ENDPOINT_PRIORITIES: Dict[str, int] = {
+    "/matches/v1/live": PRIORITY_LIVE,
+}
+
+# Token buckets sized to the RapidAPI plan, shared by the whole process
+QUOTA = QuotaScheduler(
+    per_minute=_get_int_secret("RAPIDAPI_PER_MINUTE", 30),
+    per_day=_get_int_secret("RAPIDAPI_PER_DAY", 1000)
+)
+
+
+def quota_stats() -> Dict[str, Any]:
+    return QUOTA.stats()
+
+
+# -------------------------------
+# Instrumentation
+# -------------------------------
+
+# Per-endpoint latency / size / status / retry / cache counters
+METRICS = MetricsRegistry()
+
+
+def metrics_json() -> str:
+    """
+    Everything the diagnostics page shows, as one JSON document.
+    """
+    return METRICS.to_json(
+        response_cache=RESPONSE_CACHE.stats(),
+        quota=QUOTA.stats()
+    )
+
+
 # -------------------------------
 # Core request wrapper
 # -------------------------------
 
+def _session() -> requests.Session:
+    return get_session(
+        pool_size=_get_int_secret("HTTP_POOL_SIZE", 10),
+        headers=_rapid_headers()
+    )
+
+
+# When set, every successful response is saved as a replayable fixture
+_RECORD_DIR = _get_secret("CRICBUZZ_RECORD_DIR")
+
+
+def _result(ok: bool, status: int, data: Any = None, error: Optional[str] = None) -> Dict[str, Any]:
+    return {"ok": ok, "status": status, "data": data, "error": error}
+
+
+def _from_disk(entry, spec) -> Dict[str, Any]:
+    try:
+        return _result(True, 200, project(entry.json(), spec))
+    except ValueError as json_err:
+        return _result(False, 200, error=f"JSON parse error: {json_err}")
+
+
 def safe_get(
     path: str,
     params: Optional[Dict[str, Any]] = None,
-    timeout: int = 15
+    timeout: Optional[float] = None,
+    priority: Optional[int] = None,
+    raw: bool = False
 ) -> Dict[str, Any]:
     """
-    HTTP GET wrapper.
+    HTTP GET wrapper over the shared keep-alive session.
+    Retries 429/5xx with jittered backoff; `timeout` defaults per endpoint.
+    Calls are admitted by the quota scheduler; shed calls are served from
+    the response cache when possible, otherwise fail with status 429.
+    Slow-changing endpoints are persisted on disk and revalidated
+    conditionally; the disk copy is also used when the API is unreachable.
+    Every call is recorded in METRICS under its endpoint bucket.
+    Bodies are decoded with the fast decoder and, unless `raw` is set,
+    projected down to the fields the pages use (see utils/decoding.py).
     Returns:
         {
             ok: bool,
@@ -59,47 +222,178 @@ def safe_get(
             error: str | None
         }
     """
+    trace: Dict[str, Any] = {"source": SOURCE_NETWORK, "status": None, "size": 0, "retries": 0}
+    started = time.perf_counter()
+    try:
+        return _get(path, params, timeout, priority, raw, trace)
+    finally:
+        METRICS.record(
+            path,
+            trace["source"],
+            (time.perf_counter() - started) * 1000,
+            status=trace["status"],
+            size=trace["size"],
+            retries=trace["retries"]
+        )
+
+
+def _get(
+    path: str,
+    params: Optional[Dict[str, Any]],
+    timeout: Optional[float],
+    priority: Optional[int],
+    raw: bool,
+    trace: Dict[str, Any]
+) -> Dict[str, Any]:
+    spec = None if raw else _by_prefix(PROJECTIONS, path, None)
+    disk_max_age = _by_prefix(DISK_CACHE_MAX_AGE, path, 0)
+    disk_key = key_for(path, params)
+    entry = DISK_CACHE.get(disk_key) if disk_max_age else None
+
+    if entry is not None and entry.age() < disk_max_age:
+        trace["source"] = SOURCE_DISK
+        return _from_disk(entry, spec)
+
+    if priority is None:
+        priority = _by_prefix(ENDPOINT_PRIORITIES, path, PRIORITY_NORMAL)
+
+    if not QUOTA.acquire(priority):
+        # The memory cache holds cached_get results, projected where the path
+        # has a projection; a raw caller (e.g. ingestion) can't use those
+        projected = _by_prefix(PROJECTIONS, path, None) is not None
+        cached = None if raw and projected else RESPONSE_CACHE.peek(make_key(path, params))
+        if cached is not None:
+            trace["source"] = SOURCE_FALLBACK
+            return cached
+        if entry is not None:
+            trace["source"] = SOURCE_FALLBACK
+            return _from_disk(entry, spec)
+        trace["source"] = SOURCE_SHED
+        return _result(
+            False, 429,
+            error=f"Local API quota exhausted; {PRIORITY_NAMES[priority]} request shed."
+        )
+
     url = f"{_get_base_url()}{path}"
 
     try:
-        response = requests.get(
+        response, retries = get_with_retry(
             url,
-            headers=_rapid_headers(),
             params=params,
-            timeout=timeout
+            timeout=timeout or _timeout_for(path),
+            max_retries=_get_int_secret("HTTP_MAX_RETRIES", 3),
+            headers=entry.conditional_headers() if entry else None,
+            session=_session()
         )
+        QUOTA.consume(retries)
+        trace.update(status=response.status_code, size=len(response.content), retries=retries)
+
+        if response.status_code == 304 and entry is not None:
+            trace["source"] = SOURCE_REVALIDATED
+            DISK_CACHE.touch(disk_key)
+            return _from_disk(entry, spec)
 
         if response.status_code == 200:
             try:
-                return {
-                    "ok": True,
-                    "status": 200,
-                    "data": response.json(),
-                    "error": None
-                }
+                data = project(loads(response.content), spec)
             except Exception as json_err:
-                return {
-                    "ok": False,
-                    "status": 200,
-                    "data": None,
-                    "error": f"JSON parse error: {json_err}"
-                }
-
-        # Akamai / API error
-        return {
-            "ok": False,
-            "status": response.status_code,
-            "data": None,
-            "error": response.text[:500]
-        }
+                return _result(False, 200, error=f"JSON parse error: {json_err}")
+
+            if _RECORD_DIR:
+                record_fixture(_RECORD_DIR, path, params, 200, response.content)
+            if disk_max_age:
+                DISK_CACHE.put(
+                    disk_key,
+                    response.content,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified")
+                )
+            return _result(True, 200, data)
+
+        # Akamai / API error: an older disk copy beats an error page
+        if entry is not None and response.status_code >= 500:
+            trace["source"] = SOURCE_FALLBACK
+            return _from_disk(entry, spec)
+        return _result(False, response.status_code, error=response.text[:500])
 
     except requests.exceptions.RequestException as req_err:
-        return {
-            "ok": False,
-            "status": 0,
-            "data": None,
-            "error": str(req_err)
-        }
+        trace["status"] = 0
+        if entry is not None:
+            trace["source"] = SOURCE_FALLBACK
+            return _from_disk(entry, spec)
+        return _result(False, 0, error=str(req_err))
+
+
+def cached_get(
+    path: str,
+    params: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    safe_get behind the shared TTL/LRU cache (stale-while-revalidate).
+    Falls through to safe_get for paths with no TTL rule.
+    """
+    ttl = _by_prefix(CACHE_TTLS, path, 0)
+    if not ttl:
+        return safe_get(path, params=params)
+
+    return RESPONSE_CACHE.get_or_fetch(
+        make_key(path, params),
+        lambda: safe_get(path, params=params),
+        ttl=ttl,
+        on_hit=lambda state: METRICS.record_cache(
+            path, SOURCE_MEMORY if state == FRESH else SOURCE_STALE
+        )
+    )
+
+
+# -------------------------------
+# Concurrent fan-out
+# -------------------------------
+
+# Bounded pool shared by all sessions; sized to the HTTP connection pool
+_FETCH_POOL = ThreadPoolExecutor(
+    max_workers=_get_int_secret("HTTP_POOL_SIZE", 10),
+    thread_name_prefix="cricbuzz-fetch"
+)
+
+# name -> (callable, *args)
+FetchCall = Tuple[Any, ...]
+
+
+def fetch_many(
+    calls: Dict[str, FetchCall],
+    timeout: Optional[float] = 30
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run several endpoint calls concurrently and wait for all of them.
+
+    Example:
+        fetch_many({
+            "batters": (get_top_batters, "odi"),
+            "bowlers": (get_top_bowlers, "odi"),
+        })
+
+    Returns a dict keyed like `calls`, each value in the usual
+    ok/status/data/error shape. Exceptions and calls still pending after
+    `timeout` seconds become ok=False results instead of raising.
+    """
+    futures = {
+        name: _FETCH_POOL.submit(call[0], *call[1:])
+        for name, call in calls.items()
+    }
+    wait(futures.values(), timeout=timeout)
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, future in futures.items():
+        if not future.done():
+            future.cancel()
+            results[name] = _result(False, 0, error=f"Timed out after {timeout}s")
+            continue
+        try:
+            results[name] = future.result()
+        except Exception as err:
+            results[name] = _result(False, 0, error=str(err))
+    return results
 
 
 # -------------------------------
@@ -107,22 +401,49 @@ def safe_get(
 # -------------------------------
 
 def get_live_matches():
-    return safe_get("/matches/v1/live")
+    return cached_get("/matches/v1/live")
+
+
+def _ensure_live_poller() -> None:
+    ensure_poller(
+        LIVE_STORE,
+        lambda: safe_get("/matches/v1/live"),
+        interval=_get_int_secret("LIVE_POLL_SECONDS", 30)
+    )
+
+
+def get_live_snapshot(wait: float = 20) -> Optional[LiveSnapshot]:
+    """
+    Latest live feed published by the shared background poller.
+    Starts the poller on first use and waits up to `wait` seconds for
+    its first poll; every session then reads the same in-memory snapshot.
+    """
+    _ensure_live_poller()
+    return LIVE_STORE.current() or LIVE_STORE.wait_for_first(wait)
+
+
+def wait_live_snapshot(version: int, timeout: float) -> Optional[LiveSnapshot]:
+    """
+    The next snapshot after `version`, or the current one after `timeout`
+    seconds; for pages that update in place instead of rerunning.
+    """
+    _ensure_live_poller()
+    return LIVE_STORE.wait_for_change(version, timeout)
 
 
 def get_recent_matches():
-    return safe_get("/matches/v1/recent")
+    return cached_get("/matches/v1/recent")
 
 
 def get_top_batters(format_type: str):
-    return safe_get(
+    return cached_get(
         "/stats/v1/rankings/batsmen",
         params={"formatType": format_type}
     )
 
 
 def get_top_bowlers(format_type: str):
-    return safe_get(
+    return cached_get(
         "/stats/v1/rankings/bowlers",
         params={"formatType": format_type}
     )
@@ -137,18 +458,56 @@ def get_top_stats(stats_type: str = "mostRuns", format_id: int = 0):
     stats_type:
         mostRuns, mostWickets, highestScore, bestAverage
     """
-    return safe_get(
+    return cached_get(
         f"/stats/v1/topstats/{format_id}",
         params={"statsType": stats_type}
     )
 
 
 def search_player(name: str):
-    return safe_get(
+    return cached_get(
         "/stats/v1/player/search",
         params={"plrN": name}
     )
 
 
 def player_summary(player_id: int):
-    return safe_get(f"/stats/v1/player/{player_id}")
+    return cached_get(f"/stats/v1/player/{player_id}")
+
+
+# -------------------------------
+# Player profiles (local store, bulk prefetch)
+# -------------------------------
+
+# Bounded pool for profile prefetches; concurrent requests for one id share a call
+PROFILES = ProfilePrefetcher(
+    player_summary,
+    workers=_get_int_secret("PROFILE_PREFETCH_WORKERS", 4)
+)
+
+RANKING_CATEGORIES = ("batsmen", "bowlers", "allrounders")
+RANKING_FORMATS = ("test", "odi", "t20")
+
+
+def ranked_player_ids() -> list:
+    """
+    Cricbuzz ids of every player in the ICC rankings (all categories and
+    formats); rankings that fail to load are skipped.
+    """
+    results = fetch_many({
+        f"{category}/{fmt}": (cached_get, f"/stats/v1/rankings/{category}", {"formatType": fmt})
+        for category in RANKING_CATEGORIES for fmt in RANKING_FORMATS
+    })
+    ids = set()
+    for res in results.values():
+        if res["ok"]:
+            ids.update(ids_from_rankings(res["data"]))
+    return sorted(ids)
+
+
+def get_player_profile(cricbuzz_id: int, max_age: float = PROFILE_MAX_AGE):
+    """
+    Profile from the local store; fetched (and stored) only when missing
+    or older than `max_age`.
+    """
+    return PROFILES.profile(int(cricbuzz_id), max_age)
@@ -0,0 +1,207 @@
+"""
+Bulk CSV/JSON import for the CRUD page (players, teams).
+
+An upload is parsed into a DataFrame and validated in one vectorized pass;
+rows that fail are reported with their row number and left out, the rest
+are upserted in a single transaction with chunked executemany and the same
+ON CONFLICT semantics as the single-row forms.
+"""
+import io
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from utils.db_connection import db_cursor, read_connection
+from utils.schema import PLAYING_ROLES
+
+CHUNK_ROWS = 5_000
+
+# Uploads larger than this are refused before parsing
+MAX_IMPORT_ROWS = 200_000
+
+
+@dataclass(frozen=True)
+class ImportSpec:
+    table: str
+    key: str
+    columns: Tuple[str, ...]
+    required: Tuple[str, ...]
+    # Accepted values per column, matched case-insensitively; values
+    # already in the table are accepted too (see allowed_choices)
+    choices: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+
+    def upsert_sql(self) -> str:
+        updates = ", ".join(f"{c}=excluded.{c}" for c in self.columns if c != self.key)
+        return (
+            f"INSERT INTO {self.table} ({', '.join(self.columns)}) "
+            f"VALUES ({', '.join('?' for _ in self.columns)}) "
+            f"ON CONFLICT({self.key}) DO UPDATE SET {updates};"
+        )
+
+
+PLAYERS = ImportSpec(
+    table="players",
+    key="player_id",
+    columns=("player_id", "full_name", "country", "playing_role", "batting_style", "bowling_style"),
+    required=("player_id", "full_name"),
+    choices={"playing_role": PLAYING_ROLES},
+)
+
+TEAMS = ImportSpec(
+    table="teams",
+    key="team_name",
+    columns=("team_name", "country"),
+    required=("team_name",),
+)
+
+SPECS = {spec.table: spec for spec in (PLAYERS, TEAMS)}
+
+
+class ImportFileError(ValueError):
+    """The upload as a whole can't be imported (format, missing columns, size)."""
+
+
+@dataclass
+class ImportResult:
+    table: str
+    received: int
+    imported: int = 0
+    inserted: int = 0
+    updated: int = 0
+    errors: List[dict] = field(default_factory=list)   # {"row", "column", "error"}
+    seconds: float = 0.0
+
+    @property
+    def rows_per_sec(self) -> float:
+        return self.imported / self.seconds if self.seconds else 0.0
+
+
+# -------------------------------
+# Parsing
+# -------------------------------
+def read_upload(data: bytes, filename: str, table: Optional[str] = None) -> pd.DataFrame:
+    """
+    CSV, or JSON as a list of objects (or {"players": [...]} keyed by
+    table). Every value is read as text; validation does the rest.
+    """
+    name = filename.lower()
+    try:
+        if name.endswith(".json"):
+            payload = json.loads(data)
+            if isinstance(payload, dict) and table in payload:
+                payload = payload[table]
+            if not isinstance(payload, list):
+                raise ImportFileError("JSON must be a list of objects.")
+            df = pd.DataFrame.from_records(payload).astype("object")
+        elif name.endswith(".csv"):
+            df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False)
+        else:
+            raise ImportFileError("Upload a .csv or .json file.")
+    except (ValueError, pd.errors.ParserError) as exc:
+        if isinstance(exc, ImportFileError):
+            raise
+        raise ImportFileError(f"Could not parse {filename}: {exc}") from exc
+
+    if len(df) > MAX_IMPORT_ROWS:
+        raise ImportFileError(f"{len(df):,} rows; imports are limited to {MAX_IMPORT_ROWS:,}.")
+    df.columns = [str(c).strip().lower().replace(" ", "_") for c in df.columns]
+    return df
+
+
+# -------------------------------
+# Validation
+# -------------------------------
+def allowed_choices(spec: ImportSpec) -> Dict[str, Tuple[str, ...]]:
+    """
+    spec.choices plus the distinct values already stored in each column
+    (e.g. roles written by ingestion or earlier imports).
+    """
+    out: Dict[str, Tuple[str, ...]] = {}
+    with read_connection() as conn:
+        for col, allowed in spec.choices.items():
+            stored = conn.execute(
+                f"SELECT DISTINCT {col} FROM {spec.table} WHERE {col} IS NOT NULL AND {col} != '';"
+            ).fetchall()
+            out[col] = tuple(allowed) + tuple(v for (v,) in stored if v not in allowed)
+    return out
+
+
+def validate(df: pd.DataFrame, spec: ImportSpec,
+             choices: Optional[Dict[str, Tuple[str, ...]]] = None) -> Tuple[pd.DataFrame, List[dict]]:
+    """
+    (clean rows in spec.columns order, per-row errors). Rows are numbered
+    from 1, not counting a CSV header. `choices` defaults to spec.choices.
+    """
+    missing = [c for c in spec.required if c not in df.columns]
+    if missing:
+        raise ImportFileError(f"Missing required column(s): {', '.join(missing)}.")
+
+    clean = pd.DataFrame(index=df.index)
+    for col in spec.columns:
+        if col in df.columns:
+            values = df[col].where(df[col].notna(), "").astype(str).str.strip()
+            clean[col] = values.where(values != "", None)
+        else:
+            clean[col] = None
+
+    numbers = pd.Series(df.index + 1, index=df.index)
+    problems: List[pd.DataFrame] = []
+
+    def flag(mask: pd.Series, column: str, message) -> None:
+        if mask.any():
+            bad = clean.loc[mask, column]
+            text = bad.map(message) if callable(message) else message
+            problems.append(pd.DataFrame({"row": numbers[mask], "column": column, "error": text}))
+
+    for col in spec.required:
+        flag(clean[col].isna(), col, "required")
+
+    for col, allowed in (spec.choices if choices is None else choices).items():
+        canonical: Dict[str, str] = {}
+        for a in allowed:
+            canonical.setdefault(a.lower(), a)       # the spec's spelling wins
+        lowered = clean[col].str.lower()
+        mapped = lowered.map(canonical)
+        flag(clean[col].notna() & mapped.isna(), col,
+             lambda v: f"{v!r} is not one of {', '.join(allowed)}")
+        clean[col] = mapped.where(mapped.notna(), clean[col])
+
+    # Same key twice in one file: the last row wins, earlier ones are reported
+    dupes = clean[spec.key].notna() & clean.duplicated(spec.key, keep="last")
+    flag(dupes, spec.key, "duplicate key in file; a later row replaces it")
+
+    errors = pd.concat(problems) if problems else pd.DataFrame(columns=["row", "column", "error"])
+    bad_index = errors.index.unique()
+    valid = clean.drop(index=bad_index)
+    errors = errors.sort_values(["row", "column"], kind="stable")
+    return valid, errors.to_dict("records")
+
+
+# -------------------------------
+# Load
+# -------------------------------
+def bulk_upsert(df: pd.DataFrame, spec: ImportSpec, chunk_rows: int = CHUNK_ROWS) -> ImportResult:
+    """
+    Validate `df` and upsert the valid rows in one transaction. Nothing is
+    written if the database rejects any chunk.
+    """
+    t0 = time.perf_counter()
+    result = ImportResult(table=spec.table, received=len(df))
+    valid, result.errors = validate(df, spec, allowed_choices(spec))
+
+    if len(valid):
+        records = list(valid.itertuples(index=False, name=None))
+        sql = spec.upsert_sql()
+        with db_cursor() as cur:
+            before = cur.execute(f"SELECT COUNT(*) FROM {spec.table};").fetchone()[0]
+            for i in range(0, len(records), chunk_rows):
+                cur.executemany(sql, records[i:i + chunk_rows])
+            after = cur.execute(f"SELECT COUNT(*) FROM {spec.table};").fetchone()[0]
+        result.imported = len(records)
+        result.inserted = after - before
+        result.updated = result.imported - result.inserted
+    result.seconds = time.perf_counter() - t0
+    return result
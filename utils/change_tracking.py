@@ -0,0 +1,51 @@
+"""
+Per-table change counters for the base tables, read by the columnar
+mirror (utils/columnar.py) to refresh incrementally.
+
+Inserts are found by rowid high-water mark, so only UPDATE and DELETE
+bump `table_versions`. The '*' row is an epoch that changes whenever the
+migrations are applied from scratch (setup_db.py reseeding), which
+invalidates every mirrored table at once.
+"""
+import sqlite3
+from typing import Dict
+
+TRACKED_TABLES = (
+    "players", "teams", "venues", "series", "matches", "match_details",
+    "player_format_stats", "batting_stats", "bowling_stats", "fielding_stats",
+    "partnerships",
+)
+
+EPOCH_KEY = "*"
+
+_BUMP = """
+    INSERT INTO table_versions (table_name, version) VALUES ('{table}', 1)
+    ON CONFLICT (table_name) DO UPDATE SET version = version + 1;
+"""
+
+
+def _trigger(table: str, event: str) -> str:
+    return (
+        f"CREATE TRIGGER IF NOT EXISTS trg_ver_{table}_{event[:3].lower()} "
+        f"AFTER {event} ON {table} BEGIN {_BUMP.format(table=table)} END;"
+    )
+
+
+CHANGE_TRACKING_SQL = """
+CREATE TABLE IF NOT EXISTS table_versions (
+    table_name TEXT PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0
+);
+INSERT OR REPLACE INTO table_versions (table_name, version) VALUES ('*', abs(random()));
+""" + "\n".join(_trigger(t, e) for t in TRACKED_TABLES for e in ("UPDATE", "DELETE"))
+
+
+def table_versions(conn: sqlite3.Connection) -> Dict[str, int]:
+    """
+    {table: version}, plus the epoch under EPOCH_KEY. Empty before the
+    migration has run.
+    """
+    try:
+        return dict(conn.execute("SELECT table_name, version FROM table_versions;").fetchall())
+    except sqlite3.OperationalError:
+        return {}
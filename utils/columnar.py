@@ -0,0 +1,575 @@
+"""
+Optional DuckDB mirror of the analytics tables for scan-and-aggregate SQL.
+
+The mirror is refreshed from SQLite in the background whenever the data
+version moves: new rows are appended by rowid high-water mark, and a table
+is reloaded when its change counter (utils/change_tracking.py) says rows
+were updated or deleted. Summary tables are small and always reloaded.
+
+A read-only query is routed to DuckDB only when every table it reads is
+mirrored and fresh, and only after one side-by-side run returned the same
+rows on both engines, faster on DuckDB; those runs are also the per-engine
+timings. Anything else (SQLite-only syntax, different semantics, tiny
+lookups, DuckDB not installed) stays on SQLite. SQL reaches DuckDB only
+after SQLite's read-only governor accepted it as one statement, and then
+over a read-only connection with file and network access switched off.
+"""
+import datetime
+import decimal
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import duckdb  # optional: pip install duckdb
+except ImportError:
+    duckdb = None
+
+from utils.change_tracking import EPOCH_KEY, TRACKED_TABLES, table_versions
+from utils.db_connection import DB_PATH, data_version, read_only_connection
+from utils.query_governor import QUERY_TIMEOUT_S, QueryCancelled, governed
+from utils.query_profiler import real_tables, table_aliases
+from utils.sql_pager import Page, fetch_page
+
+COLUMNAR_PATH = os.environ.get(
+    "COLUMNAR_DB_PATH", os.path.splitext(DB_PATH)[0] + ".duckdb"
+)
+COLUMNAR_ENABLED = os.environ.get("COLUMNAR_ENGINE", "auto").lower() != "off"
+
+# Derived summary tables: small, reloaded on every sync
+RELOADED_TABLES = ("agg_batting", "agg_bowling", "agg_toss")
+MIRRORED_TABLES = TRACKED_TABLES + RELOADED_TABLES
+
+ENGINE_SQLITE = "sqlite"
+ENGINE_DUCKDB = "duckdb"
+
+LOAD_CHUNK_ROWS = 200_000
+
+# Side-by-side checks give up (query stays on SQLite) past this many rows
+VERIFY_MAX_ROWS = 50_000
+
+# Queries with recorded engine timings kept for display
+MAX_TRACKED_QUERIES = 200
+
+# Queries only ever see the mirror read-only, with no file/network access
+# (COPY, read_csv, ATTACH, extensions) and settings nobody can change back.
+# NULLs sort as in SQLite (first ascending, last descending).
+NULL_ORDER = "nulls_first_on_asc_last_on_desc"
+READER_CONFIG = {"enable_external_access": False, "lock_configuration": True,
+                 "default_null_order": NULL_ORDER}
+WRITER_CONFIG = {"enable_external_access": False, "default_null_order": NULL_ORDER}
+
+STATE_SQL = (
+    "CREATE TABLE IF NOT EXISTS _mirror_state ("
+    " table_name VARCHAR PRIMARY KEY, epoch BIGINT, version BIGINT,"
+    " high_water BIGINT, row_count BIGINT)"
+)
+
+
+def _duck_type(column: str, declared: str) -> str:
+    declared = declared.upper()
+    if "INT" in declared:
+        return "BIGINT"
+    if any(t in declared for t in ("REAL", "FLOA", "DOUB")):
+        return "DOUBLE"
+    if column.endswith("_date"):
+        return "DATE"          # so strftime()/date math work as in SQLite
+    return "VARCHAR"
+
+
+# DATE('now', '-30 day') and friends
+_DATE_NOW = re.compile(
+    r"DATE\(\s*'now'\s*,\s*'([+-]?\d+)\s+(day|month|year)s?'\s*\)", re.IGNORECASE
+)
+_BARE_COLUMN = re.compile(r'column "(\w+)" must appear in the GROUP BY clause')
+MAX_REWRITES = 8
+
+
+def _date_now(match: "re.Match") -> str:
+    return f"CAST(CURRENT_DATE + INTERVAL ({int(match.group(1))}) {match.group(2).upper()} AS DATE)"
+
+
+def to_duckdb(duck, sql: str) -> str:
+    """
+    Adapt SQLite-isms DuckDB rejects: DATE('now', modifier), and bare
+    columns next to GROUP BY (SQLite picks a value from the group; DuckDB
+    wants ANY_VALUE). Bare columns are found from DuckDB's binder errors
+    and each occurrence is tried until the error goes away; whatever comes
+    out is still checked against SQLite's result before it is used.
+    """
+    sql = _DATE_NOW.sub(_date_now, sql)
+
+    for _ in range(MAX_REWRITES):
+        try:
+            duck.execute("EXPLAIN " + sql)
+            return sql
+        except duckdb.Error as exc:
+            error = str(exc)
+        bare = _BARE_COLUMN.search(error)
+        if not bare:
+            return sql
+
+        column = bare.group(1)
+        occurrence = re.compile(
+            rf"(?<![\w.(])((?:\w+\.)?{re.escape(column)})\b(?!\s*\()(\s+AS\b)?", re.IGNORECASE
+        )
+        for match in occurrence.finditer(sql):
+            alias = "" if match.group(2) else f" AS {column}"
+            candidate = (sql[:match.start()] + f"ANY_VALUE({match.group(1)}){alias}"
+                         + (match.group(2) or "") + sql[match.end():])
+            try:
+                duck.execute("EXPLAIN " + candidate)
+                return candidate
+            except duckdb.Error as exc:
+                if str(exc) != error and not str(exc).startswith("Parser Error"):
+                    sql = candidate          # progress: a different column is next
+                    break
+        else:
+            return sql
+    return sql
+
+
+def _single_select(duck, sql: str) -> bool:
+    try:
+        statements = duck.extract_statements(sql)
+    except duckdb.Error:
+        return False
+    return len(statements) == 1 and statements[0].type == duckdb.StatementType.SELECT
+
+
+def _column_key(name: str) -> str:
+    # SQLite echoes expressions as written, DuckDB lower-cases them
+    # (and names COUNT(*) count_star())
+    return re.sub(r"\s+", "", name.lower()).replace("count_star()", "count(*)")
+
+
+class _MirrorClosed(Exception):
+    """The read-only connection is down while a sync rewrites the file."""
+
+
+_ORDER_BY = re.compile(r"\bORDER\s+BY\b", re.IGNORECASE)
+_SKIPPED = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|--[^\n]*|/\*.*?\*/", re.DOTALL)
+
+
+def has_outer_order_by(sql: str) -> bool:
+    """
+    True when the statement itself (not a subquery or window) has ORDER BY.
+    """
+    text = _SKIPPED.sub(" ", sql)
+    depth, outer = 0, []
+    for ch in text:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth = max(0, depth - 1)
+        elif depth == 0:
+            outer.append(ch)
+    return bool(_ORDER_BY.search("".join(outer)))
+
+
+def _canonical(rows: Sequence[tuple], ordered: bool = False) -> List[tuple]:
+    """
+    Engine-neutral form of a result for comparison: numbers as rounded
+    floats, dates as ISO strings. Unless `ordered`, row order is ignored
+    (without ORDER BY either engine may return any order).
+    """
+    out = []
+    for row in rows:
+        values = []
+        for v in row:
+            if isinstance(v, (int, float, decimal.Decimal)) and not isinstance(v, bool):
+                v = round(float(v), 6)
+            elif isinstance(v, (datetime.date, datetime.datetime)):
+                v = v.isoformat()
+            values.append(v)
+        out.append(tuple(values))
+    return out if ordered else sorted(out, key=repr)
+
+
+class ColumnarMirror:
+    def __init__(self, path: str = COLUMNAR_PATH):
+        self.path = path
+        self._duck = None                      # read-only; None while a sync writes
+        self._initialized = False
+        self._error: Optional[str] = None
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._readers = threading.Condition()
+        self._active_reads = 0
+        self._sync_thread: Optional[threading.Thread] = None
+        self._synced_token = None
+        self._failed: Dict[str, str] = {}
+        self._last_sync: dict = {}
+        # (normalized SQL, data version synced) -> served from DuckDB?
+        self._verdicts: Dict[tuple, bool] = {}
+        self._dialect: Dict[str, str] = {}
+        self._columns: Dict[str, List[str]] = {}
+        self._timings: "OrderedDict[str, dict]" = OrderedDict()
+
+    # ---------- connection ----------
+
+    def _open_reader(self):
+        return duckdb.connect(self.path, read_only=True, config=READER_CONFIG)
+
+    def available(self) -> bool:
+        if duckdb is None or not COLUMNAR_ENABLED or self._error:
+            return False
+        if not self._initialized:
+            with self._lock:
+                if not self._initialized:
+                    try:
+                        writer = duckdb.connect(self.path, config=WRITER_CONFIG)
+                        try:
+                            writer.execute(STATE_SQL)
+                        finally:
+                            writer.close()
+                        with self._readers:
+                            self._duck = self._open_reader()
+                    except Exception as exc:       # locked by another process, bad file...
+                        self._error = f"{type(exc).__name__}: {exc}"
+                        return False
+                    self._initialized = True
+        return True
+
+    @contextmanager
+    def _reading(self):
+        """
+        A cursor on the read-only connection. Raises _MirrorClosed during a
+        sync, which waits for open cursors before it swaps connections.
+        """
+        with self._readers:
+            if self._duck is None:
+                raise _MirrorClosed()
+            self._active_reads += 1
+            cur = self._duck.cursor()
+        try:
+            yield cur
+        finally:
+            cur.close()
+            with self._readers:
+                self._active_reads -= 1
+                self._readers.notify_all()
+
+    # ---------- sync ----------
+
+    def _create(self, duck, sconn, table: str) -> None:
+        cols = sconn.execute(f"PRAGMA table_info('{table}');").fetchall()
+        ddl = ", ".join(f'"{c[1]}" {_duck_type(c[1], c[2] or "")}' for c in cols)
+        duck.execute(f'CREATE OR REPLACE TABLE "{table}" ({ddl})')
+
+    def _copy(self, duck, sconn, table: str, after_rowid: Optional[int] = None) -> int:
+        sql = f'SELECT * FROM "{table}"'
+        params: tuple = ()
+        if after_rowid is not None:
+            sql += " WHERE rowid > ?"
+            params = (after_rowid,)
+        cur = sconn.execute(sql, params)
+        columns = [d[0] for d in cur.description]
+        copied = 0
+        while True:
+            rows = cur.fetchmany(LOAD_CHUNK_ROWS)
+            if not rows:
+                break
+            duck.register("_chunk", pd.DataFrame.from_records(rows, columns=columns))
+            try:
+                duck.execute(f'INSERT INTO "{table}" SELECT * FROM _chunk')
+            finally:
+                duck.unregister("_chunk")
+            copied += len(rows)
+        return copied
+
+    def _sync_table(self, duck, sconn, table: str, versions: Dict[str, int]) -> str:
+        epoch = versions.get(EPOCH_KEY, 0)
+        version = versions.get(table, 0)
+        high_water = sconn.execute(f'SELECT MAX(rowid) FROM "{table}";').fetchone()[0] or 0
+        state = duck.execute(
+            "SELECT epoch, version, high_water, row_count FROM _mirror_state WHERE table_name = ?",
+            [table],
+        ).fetchone()
+
+        reload = (
+            table in RELOADED_TABLES
+            or state is None
+            or state[0] != epoch
+            or state[1] != version
+            or high_water < state[2]
+        )
+        action = "reload"
+        count = None
+
+        if not reload:
+            if high_water == state[2]:
+                return "unchanged"
+            appended = self._copy(duck, sconn, table, after_rowid=state[2])
+            count = sconn.execute(f'SELECT COUNT(*) FROM "{table}";').fetchone()[0]
+            # REPLACE-style writes delete without firing triggers: counts disagree
+            if count != state[3] + appended:
+                reload = True
+            else:
+                action = f"appended {appended}"
+
+        if reload:
+            self._create(duck, sconn, table)
+            count = self._copy(duck, sconn, table)
+
+        duck.execute(
+            "INSERT OR REPLACE INTO _mirror_state VALUES (?, ?, ?, ?, ?)",
+            [table, epoch, version, high_water, count],
+        )
+        return action
+
+    def sync(self) -> dict:
+        """
+        Bring every mirrored table up to date (blocking). Each table is
+        copied inside one DuckDB transaction from one SQLite snapshot.
+        """
+        if not self.available():
+            return {"error": self._error or "duckdb not installed/enabled"}
+
+        with self._sync_lock:
+            # DuckDB allows one configuration per file and process: the
+            # read-only connection is closed while the writer is open
+            with self._readers:
+                reader, self._duck = self._duck, None
+                while self._active_reads:
+                    self._readers.wait()
+            if reader is not None:
+                reader.close()
+            try:
+                writer = duckdb.connect(self.path, config=WRITER_CONFIG)
+                try:
+                    return self._sync_with(writer)
+                finally:
+                    writer.close()
+            finally:
+                try:
+                    with self._readers:
+                        self._duck = self._open_reader()
+                except Exception as exc:
+                    self._error = f"{type(exc).__name__}: {exc}"
+
+    def _sync_with(self, duck) -> dict:
+        t0 = time.perf_counter()
+        actions: Dict[str, str] = {}
+        duck.execute(STATE_SQL)
+
+        with read_only_connection() as sconn:
+            sconn.execute("BEGIN;")               # one snapshot for every table
+            try:
+                versions = table_versions(sconn)
+                # after opening: a first reader may touch the -wal file's mtime
+                token = data_version()
+                present = real_tables(sconn)
+                for table in MIRRORED_TABLES:
+                    if table not in present:
+                        continue
+                    duck.execute("BEGIN TRANSACTION")
+                    try:
+                        actions[table] = self._sync_table(duck, sconn, table, versions)
+                        duck.execute("COMMIT")
+                        self._failed.pop(table, None)
+                    except Exception as exc:      # e.g. text in an INTEGER column
+                        duck.execute("ROLLBACK")
+                        self._failed[table] = f"{type(exc).__name__}: {exc}"
+                        actions[table] = "failed"
+            finally:
+                sconn.rollback()
+
+        self._verdicts.clear()                # checked against the previous data
+        self._synced_token = token
+        self._last_sync = {
+            "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "seconds": round(time.perf_counter() - t0, 2),
+            "tables": actions,
+        }
+        return self._last_sync
+
+    def _sync_in_background(self) -> None:
+        try:
+            self.sync()
+        except Exception as exc:
+            self._last_sync = {"error": f"{type(exc).__name__}: {exc}"}
+
+    def is_fresh(self) -> bool:
+        """
+        True when the mirror matches the current data version; otherwise
+        starts a background sync (once) and returns False.
+        """
+        if not self.available():
+            return False
+        if self._synced_token == data_version():
+            return True
+        with self._lock:
+            if self._sync_thread is None or not self._sync_thread.is_alive():
+                self._sync_thread = threading.Thread(
+                    target=self._sync_in_background, name="columnar-sync", daemon=True
+                )
+                self._sync_thread.start()
+        return False
+
+    # ---------- routing ----------
+
+    def _tables_ok(self, normalized: str) -> bool:
+        with read_only_connection() as sconn:
+            tables = set(table_aliases(normalized, real_tables(sconn)).values())
+        return bool(tables) and all(
+            t in MIRRORED_TABLES and t not in self._failed for t in tables
+        )
+
+    def _record(self, normalized: str, **fields) -> None:
+        entry = self._timings.pop(normalized, {"sql": normalized[:200]})
+        entry.update(fields)
+        self._timings[normalized] = entry
+        while len(self._timings) > MAX_TRACKED_QUERIES:
+            self._timings.popitem(last=False)
+
+    def _run_duck(self, cur, sql: str, limit: int):
+        timer = threading.Timer(QUERY_TIMEOUT_S, cur.interrupt)
+        timer.start()
+        try:
+            t0 = time.perf_counter()
+            cur.execute(sql)
+            columns = [d[0] for d in cur.description or ()]
+            rows = cur.fetchmany(limit)
+            return columns, rows, (time.perf_counter() - t0) * 1000
+        finally:
+            timer.cancel()
+
+    def compare(self, normalized: str) -> Optional[bool]:
+        """
+        Run `normalized` on both engines, record both timings and whether
+        the results match. None when SQLite was cancelled before finishing;
+        raises _MirrorClosed when a sync holds the file.
+
+        SQLite goes first: its governed read-only connection refuses writes
+        and more than one statement, so nothing it rejects reaches DuckDB.
+        """
+        cap = VERIFY_MAX_ROWS + 1
+        try:
+            with governed(normalized) as q:
+                t0 = time.perf_counter()
+                cur = q.conn.execute(normalized)
+                s_cols = [d[0] for d in cur.description or ()]
+                s_rows = cur.fetchmany(cap)
+                sqlite_ms = (time.perf_counter() - t0) * 1000
+        except QueryCancelled:
+            self._record(normalized, sqlite_ms=None, match=None,
+                         note="SQLite cancelled; not cross-checked, kept on SQLite")
+            return None
+        except Exception as exc:
+            self._record(normalized, sqlite_error=str(exc)[:200], match=False)
+            return False
+
+        try:
+            with self._reading() as duck:
+                if not _single_select(duck, normalized):
+                    self._record(normalized, match=False, note="not a single SELECT; kept on SQLite")
+                    return False
+                duck_sql = to_duckdb(duck, normalized)
+                if not _single_select(duck, duck_sql):
+                    return False
+                self._dialect[normalized] = duck_sql
+                d_cols, d_rows, duck_ms = self._run_duck(duck, duck_sql, cap)
+        except _MirrorClosed:
+            raise
+        except Exception as exc:
+            self._record(normalized, duckdb_error=str(exc)[:200], match=False)
+            return False
+
+        if len(d_rows) >= cap or len(s_rows) >= cap:
+            match, note = False, f"more than {VERIFY_MAX_ROWS:,} rows; not cross-checked"
+        else:
+            ordered = has_outer_order_by(normalized)
+            match = ([_column_key(c) for c in d_cols] == [_column_key(c) for c in s_cols]
+                     and _canonical(d_rows, ordered) == _canonical(s_rows, ordered))
+            note = "" if match else "results differ; kept on SQLite"
+        self._columns[normalized] = s_cols
+
+        faster = duck_ms < sqlite_ms
+        if match and not faster:
+            note = "same rows, SQLite faster; kept on SQLite"
+        self._record(normalized, duckdb_ms=round(duck_ms, 2), sqlite_ms=round(sqlite_ms, 2),
+                     rows=len(s_rows), match=match, note=note,
+                     checked_at=time.strftime("%H:%M:%S"))
+        return match and faster
+
+    def try_page(self, normalized: str, page_size: int, key_columns: Sequence[str] = (),
+                 after: Optional[tuple] = None, start: int = 0,
+                 start_bytes: int = 0) -> Optional[Page]:
+        """
+        One page from DuckDB, or None if the query should run on SQLite.
+        Only queries cross-checked against SQLite are served.
+        """
+        if not self.is_fresh() or not self._tables_ok(normalized):
+            return None
+
+        # A result only matched on the data it was checked against
+        key = (normalized, self._synced_token)
+        verdict = self._verdicts.get(key)
+        if verdict is None:
+            try:
+                verdict = self.compare(normalized)
+            except _MirrorClosed:
+                return None                      # a sync is rewriting the file
+            # A cancelled check counts as a mismatch: nothing unchecked is served
+            verdict = self._verdicts[key] = bool(verdict)
+        if not verdict:
+            return None
+
+        try:
+            with self._reading() as cur:
+                timer = threading.Timer(QUERY_TIMEOUT_S, cur.interrupt)
+                timer.start()
+                try:
+                    page = fetch_page(cur, self._dialect.get(normalized, normalized), True,
+                                      page_size, key_columns, after, start,
+                                      start_bytes=start_bytes)
+                finally:
+                    timer.cancel()
+        except _MirrorClosed:
+            return None
+        except Exception as exc:
+            if isinstance(exc, duckdb.InterruptException):
+                raise QueryCancelled(QUERY_TIMEOUT_S, QUERY_TIMEOUT_S) from exc
+            self._verdicts[key] = False
+            return None
+
+        # Same headers as SQLite would show (DuckDB lower-cases expressions)
+        columns = self._columns.get(normalized)
+        if columns and len(columns) == len(page.columns):
+            page.columns = list(columns)
+        page.engine = ENGINE_DUCKDB
+        page.verified = True
+        self._record(normalized, last_duckdb_page_ms=page.elapsed_ms)
+        return page
+
+    # ---------- monitoring ----------
+
+    def timings_for(self, normalized: str) -> Optional[dict]:
+        return self._timings.get(normalized)
+
+    def stats(self) -> dict:
+        return {
+            "installed": duckdb is not None,
+            "enabled": COLUMNAR_ENABLED,
+            "path": self.path,
+            "error": self._error,
+            "fresh": self._synced_token is not None and self._synced_token == data_version(),
+            "syncing": bool(self._sync_thread and self._sync_thread.is_alive()),
+            "last_sync": self._last_sync,
+            "failed_tables": dict(self._failed),
+            "routed_queries": sum(1 for v in self._verdicts.values() if v),
+            "sqlite_only_queries": sum(1 for v in self._verdicts.values() if not v),
+        }
+
+    def timings(self) -> List[dict]:
+        return list(reversed(self._timings.values()))
+
+
+MIRROR = ColumnarMirror()
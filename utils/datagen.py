@@ -0,0 +1,401 @@
+"""
+Synthetic analytics databases of any size, for setup_db.py, benchmarks
+and load tests.
+
+Rows are drawn in NumPy batches (one block of matches at a time) and
+bulk-loaded with executemany inside a single transaction, with journaling
+and fsyncs relaxed for the load. Indexes, summary tables and triggers are
+created afterwards by apply_migrations(), so the load itself never pays
+for them. Output is deterministic for a given DatasetConfig.
+"""
+import math
+import sqlite3
+import time
+from dataclasses import dataclass, replace
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from utils.migrations import apply_migrations
+from utils.schema import PLAYING_ROLES, reset_schema
+
+# Bump when the generated data changes shape, so cached bench DBs are rebuilt
+GENERATOR_VERSION = 2
+
+FORMATS = ("test", "odi", "t20i")
+ROLES = PLAYING_ROLES
+ROLE_WEIGHTS = (0.4, 0.3, 0.2, 0.1)
+BATTING_STYLES = ("Right-hand bat", "Left-hand bat")
+BOWLING_STYLES = ("Right-arm fast", "Left-arm fast", "Right-arm medium",
+                  "Off-spin", "Leg-spin", "Left-arm spin", "None")
+TEAM_NAMES = (
+    "India", "England", "Australia", "South Africa", "New Zealand", "Pakistan",
+    "Sri Lanka", "West Indies", "Bangladesh", "Afghanistan", "Ireland", "Zimbabwe",
+)
+FIRST_NAMES = ("Aarav", "Ben", "Chris", "Dinesh", "Ethan", "Faf", "Glenn", "Hashim",
+               "Imran", "Jos", "Kane", "Liam", "Mitchell", "Nathan", "Ollie", "Quinton")
+LAST_NAMES = ("Sharma", "Smith", "Khan", "Taylor", "Williams", "Patel", "Brown",
+              "Perera", "Ali", "Rahman", "Singh", "Jones", "Das", "Latham", "Wood")
+
+FIELDERS_PER_INNINGS = 3
+
+# Rows per executemany call
+CHUNK_ROWS = 100_000
+
+# Upper bound on the random matrix used to draw line-ups (rows x squad size)
+_PICK_CELLS = 4_000_000
+
+# Applied for the load only; the file is rebuilt from scratch if it dies midway
+FAST_LOAD_PRAGMAS = (
+    "PRAGMA journal_mode=MEMORY;",
+    "PRAGMA synchronous=OFF;",
+    "PRAGMA cache_size=-262144;",        # 256 MiB
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA locking_mode=EXCLUSIVE;",
+)
+RESTORE_PRAGMAS = (
+    "PRAGMA locking_mode=NORMAL;",
+    "PRAGMA synchronous=NORMAL;",
+)
+
+
+@dataclass(frozen=True)
+class DatasetConfig:
+    players: int = 300
+    teams: int = 12
+    venues: int = 60
+    series: int = 60
+    matches: int = 2000
+    innings: int = 2                     # per match
+    formats: Tuple[str, ...] = FORMATS
+    years: Tuple[int, int] = (2020, 2026)
+    batters_per_innings: int = 11
+    bowlers_per_innings: int = 5
+    seed: int = 42
+
+    @property
+    def squad(self) -> int:
+        return self.players // self.teams
+
+    @property
+    def batting_rows(self) -> int:
+        return self.matches * self.innings * self.batters_per_innings
+
+    def validate(self) -> None:
+        if self.teams < 2:
+            raise ValueError("need at least 2 teams")
+        if self.squad < max(self.batters_per_innings, self.bowlers_per_innings,
+                            FIELDERS_PER_INNINGS):
+            raise ValueError(
+                f"{self.players} players over {self.teams} teams leaves squads of "
+                f"{self.squad}; need at least {self.batters_per_innings}"
+            )
+        if min(self.venues, self.series, self.matches, self.innings) < 1:
+            raise ValueError("venues, series, matches and innings must be positive")
+        unknown = set(self.formats) - set(FORMATS)
+        if not self.formats or unknown:
+            raise ValueError(f"formats must be a non-empty subset of {FORMATS}")
+        if self.years[0] > self.years[1]:
+            raise ValueError("years must be (first, last)")
+
+    @classmethod
+    def for_batting_rows(cls, batting_rows: int, seed: int = 42, **overrides) -> "DatasetConfig":
+        """
+        Size every table from a target batting_stats row count.
+        """
+        base = cls(seed=seed, **overrides)
+        per_match = base.innings * base.batters_per_innings
+        matches = max(1, math.ceil(batting_rows / per_match))
+        squad = min(200, 15 + batting_rows // 20_000)
+        return replace(
+            base,
+            matches=matches,
+            players=overrides.get("players", squad * base.teams),
+            series=overrides.get("series", max(3, matches // 5)),
+        )
+
+
+# -------------------------------
+# Helpers
+# -------------------------------
+
+def _team_names(n: int) -> List[str]:
+    return [TEAM_NAMES[i] if i < len(TEAM_NAMES) else f"Team {i + 1}" for i in range(n)]
+
+
+def _rows(*columns: np.ndarray) -> List[tuple]:
+    return list(zip(*(np.asarray(c).ravel().tolist() for c in columns)))
+
+
+def _insert(conn: sqlite3.Connection, sql: str, rows: Sequence[tuple]) -> int:
+    for start in range(0, len(rows), CHUNK_ROWS):
+        conn.executemany(sql, rows[start:start + CHUNK_ROWS])
+    return len(rows)
+
+
+def _pick(rng: np.random.Generator, n: int, squad: int, k: int) -> np.ndarray:
+    """
+    k distinct squad positions for each of n rows, shape (n, k).
+    """
+    return rng.random((n, squad)).argpartition(k - 1, axis=1)[:, :k]
+
+
+def _dates(rng: np.random.Generator, years: Tuple[int, int], n: int) -> np.ndarray:
+    first = np.datetime64(f"{years[0]}-01-01")
+    span = (np.datetime64(f"{years[1] + 1}-01-01") - first).astype(int)
+    return first + rng.integers(0, span, n).astype("timedelta64[D]")
+
+
+def _last_day(years: Tuple[int, int]) -> np.datetime64:
+    return np.datetime64(f"{years[1]}-12-31")
+
+
+# -------------------------------
+# Tables
+# -------------------------------
+
+def _master_data(conn: sqlite3.Connection, cfg: DatasetConfig,
+                 rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    teams = np.array(_team_names(cfg.teams), dtype=object)
+    codes = np.array(
+        [t.replace(" ", "")[:3].lower() if i < len(TEAM_NAMES) else f"t{i + 1}"
+         for i, t in enumerate(teams)],
+        dtype=object,
+    )
+
+    # Player i < squad * teams plays for team i // squad; the remainder of
+    # players / teams are reserves spread over the teams, who never play
+    n = cfg.players
+    extra = np.arange(n - cfg.squad * cfg.teams)
+    team_of = np.concatenate([np.repeat(np.arange(cfg.teams), cfg.squad), extra % cfg.teams])
+    slot = np.concatenate([np.tile(np.arange(cfg.squad), cfg.teams), cfg.squad + extra // cfg.teams])
+    player_ids = np.array(
+        [f"{codes[t]}_{s:04d}" for t, s in zip(team_of.tolist(), slot.tolist())], dtype=object
+    )
+    first = np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), n)]
+    last = np.array(LAST_NAMES, dtype=object)[rng.integers(0, len(LAST_NAMES), n)]
+    names = first + " " + last + " " + np.char.upper(codes[team_of].astype(str)).astype(object) \
+        + slot.astype(str).astype(object)
+    roles = np.array(ROLES, dtype=object)[rng.choice(len(ROLES), n, p=ROLE_WEIGHTS)]
+    bat = np.array(BATTING_STYLES, dtype=object)[rng.integers(0, len(BATTING_STYLES), n)]
+    bowl = np.array(BOWLING_STYLES, dtype=object)[rng.integers(0, len(BOWLING_STYLES), n)]
+
+    _insert(conn, "INSERT INTO players VALUES (?,?,?,?,?,?)",
+            _rows(player_ids, names, teams[team_of], roles, bat, bowl))
+    _insert(conn, "INSERT INTO teams VALUES (?,?)", _rows(teams, teams))
+
+    venue_country = rng.integers(0, cfg.teams, cfg.venues)
+    venue_no = np.arange(1, cfg.venues + 1).astype(str).astype(object)
+    _insert(
+        conn,
+        "INSERT INTO venues (venue_name,city,country,capacity) VALUES (?,?,?,?)",
+        _rows(teams[venue_country] + " Ground " + venue_no,
+              teams[venue_country] + " City " + venue_no,
+              teams[venue_country],
+              rng.integers(10, 101, cfg.venues) * 1000),
+    )
+
+    # player_format_stats: career lines for ~70% of (player, format) pairs
+    fmts = np.array(cfg.formats, dtype=object)
+    pf_player = np.repeat(np.arange(n), len(fmts))
+    pf_format = np.tile(np.arange(len(fmts)), n)
+    keep = rng.random(pf_player.size) < 0.7
+    k = int(keep.sum())
+    _insert(
+        conn,
+        "INSERT INTO player_format_stats VALUES (?,?,?,?,?,?,?)",
+        _rows(player_ids[pf_player[keep]], fmts[pf_format[keep]],
+              rng.integers(0, 15001, k), rng.integers(0, 51, k), rng.integers(0, 301, k),
+              np.round(rng.uniform(10, 60, k), 1), np.round(rng.uniform(40, 150, k), 1)),
+    )
+
+    return {"teams": teams, "player_ids": player_ids, "formats": fmts}
+
+
+def _series(conn: sqlite3.Connection, cfg: DatasetConfig, rng: np.random.Generator,
+            teams: np.ndarray, series_of_match: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    fmt = rng.integers(0, len(cfg.formats), cfg.series)
+    start = _dates(rng, cfg.years, cfg.series)
+    host = teams[rng.integers(0, cfg.teams, cfg.series)]
+    fmts = np.array(cfg.formats, dtype=object)
+    _insert(
+        conn,
+        "INSERT INTO series (series_name,host_country,match_type,start_date,total_matches) "
+        "VALUES (?,?,?,?,?)",
+        _rows(host + " " + np.char.upper(fmts[fmt].astype(str)).astype(object)
+              + " Series " + np.arange(1, cfg.series + 1).astype(str).astype(object),
+              host, fmts[fmt], start.astype(str),
+              np.bincount(series_of_match, minlength=cfg.series)),
+    )
+    return fmt, start
+
+
+def _match_block(conn: sqlite3.Connection, cfg: DatasetConfig, rng: np.random.Generator,
+                 first_id: int, series_of_match: np.ndarray, series_fmt: np.ndarray,
+                 series_start: np.ndarray, master: Dict[str, np.ndarray]) -> Dict[str, int]:
+    """
+    Generate and insert one block of matches with all their per-innings rows.
+    """
+    teams, player_ids, fmts = master["teams"], master["player_ids"], master["formats"]
+    n = series_of_match.size
+    ids = np.arange(first_id, first_id + n)
+    squad = cfg.squad
+    counts = {}
+
+    team1 = rng.integers(0, cfg.teams, n)
+    team2 = (team1 + rng.integers(1, cfg.teams, n)) % cfg.teams
+    winner = np.where(rng.random(n) < 0.5, team1, team2)
+    toss = np.where(rng.random(n) < 0.5, team1, team2)
+    bat_first = rng.random(n) < 0.5
+    first = np.where(bat_first, toss, np.where(toss == team1, team2, team1))
+    second = np.where(first == team1, team2, team1)
+    fmt = series_fmt[series_of_match]
+    # Up to 90 days into the series, but never past the configured years
+    match_date = np.minimum(
+        series_start[series_of_match] + rng.integers(0, 90, n).astype("timedelta64[D]"),
+        _last_day(cfg.years),
+    )
+    by_runs = rng.random(n) < 0.5
+    margin = np.where(by_runs, rng.integers(1, 251, n), rng.integers(1, 11, n))
+
+    counts["matches"] = _insert(
+        conn,
+        "INSERT INTO matches (match_id,match_description,team1,team2,winning_team,venue_id,"
+        "match_date,match_status,victory_margin,victory_type,series_id) "
+        "VALUES (?,?,?,?,?,?,?,?,?,?,?)",
+        _rows(ids, teams[team1] + " vs " + teams[team2] + " Match " + ids.astype(str).astype(object),
+              teams[team1], teams[team2], teams[winner],
+              rng.integers(1, cfg.venues + 1, n), match_date.astype(str),
+              np.full(n, "Completed", dtype=object), margin,
+              np.where(by_runs, "Runs", "Wickets").astype(object), series_of_match + 1),
+    )
+    _insert(
+        conn,
+        "INSERT INTO match_details VALUES (?,?,?,?,?)",
+        _rows(ids, fmts[fmt], teams[toss],
+              np.where(bat_first, "bat", "bowl").astype(object), teams[first]),
+    )
+
+    B, W = cfg.batters_per_innings, cfg.bowlers_per_innings
+    position = np.arange(1, B + 1)
+    is_test = fmts[fmt] == "test"
+    batting = bowling = fielding = partnerships = 0
+
+    for inning in range(1, cfg.innings + 1):
+        bat_team = first if inning % 2 else second
+        bowl_team = second if inning % 2 else first
+
+        lineup = bat_team[:, None] * squad + _pick(rng, n, squad, B)
+        runs = rng.exponential(np.where(position <= 6, 35.0, 12.0), (n, B)).astype(np.int64)
+        balls = np.maximum(
+            1, (runs * rng.uniform(0.6, 1.6, (n, B))).astype(np.int64) + rng.integers(0, 11, (n, B))
+        )
+        batting += _insert(
+            conn,
+            "INSERT INTO batting_stats VALUES (?,?,?,?,?,?,?,?,?)",
+            _rows(player_ids[lineup], np.repeat(ids, B), np.repeat(fmts[fmt], B),
+                  np.full(n * B, inning), np.tile(position, n), runs, balls,
+                  np.round(runs / balls * 100, 1), np.repeat(teams[bat_team], B)),
+        )
+        partnerships += _insert(
+            conn,
+            "INSERT INTO partnerships VALUES (?,?,?,?,?,?)",
+            _rows(np.repeat(ids, B - 1), np.full(n * (B - 1), inning),
+                  player_ids[lineup[:, :-1]], player_ids[lineup[:, 1:]],
+                  np.tile(position[:-1], n), runs[:, :-1] + runs[:, 1:]),
+        )
+
+        bowlers = bowl_team[:, None] * squad + _pick(rng, n, squad, W)
+        overs = np.where(np.repeat(is_test, W).reshape(n, W),
+                         rng.uniform(10, 30, (n, W)), rng.uniform(2, 10, (n, W)))
+        bowling += _insert(
+            conn,
+            "INSERT INTO bowling_stats VALUES (?,?,?,?,?,?)",
+            _rows(player_ids[bowlers], np.repeat(ids, W), np.repeat(fmts[fmt], W),
+                  np.round(overs, 1), rng.integers(0, 6, (n, W)),
+                  np.round(rng.uniform(2.5, 10.0, (n, W)), 2)),
+        )
+
+        F = FIELDERS_PER_INNINGS
+        fielders = bowl_team[:, None] * squad + _pick(rng, n, squad, F)
+        fielding += _insert(
+            conn,
+            "INSERT INTO fielding_stats VALUES (?,?,?,?,?)",
+            _rows(player_ids[fielders], np.repeat(ids, F), rng.integers(0, 4, (n, F)),
+                  rng.integers(0, 2, (n, F)), rng.integers(0, 2, (n, F))),
+        )
+
+    counts.update({
+        "batting_stats": batting,
+        "bowling_stats": bowling,
+        "fielding_stats": fielding,
+        "partnerships": partnerships,
+    })
+    return counts
+
+
+# -------------------------------
+# Entry points
+# -------------------------------
+
+def generate(conn: sqlite3.Connection, cfg: DatasetConfig) -> Dict[str, int]:
+    """
+    Recreate the schema in `conn` (autocommit mode) and fill it per `cfg`.
+    Returns row counts per table plus load/migration timings.
+    """
+    cfg.validate()
+    rng = np.random.default_rng(cfg.seed)
+    counts: Dict[str, int] = {}
+
+    reset_schema(conn)
+    for pragma in FAST_LOAD_PRAGMAS:
+        conn.execute(pragma)
+
+    t0 = time.perf_counter()
+    conn.execute("BEGIN;")
+    try:
+        master = _master_data(conn, cfg, rng)
+        series_of_match = np.sort(rng.integers(0, cfg.series, cfg.matches))
+        series_fmt, series_start = _series(conn, cfg, rng, master["teams"], series_of_match)
+
+        block = max(1, _PICK_CELLS // (cfg.squad * cfg.innings))
+        for start in range(0, cfg.matches, block):
+            part = _match_block(conn, cfg, rng, start + 1, series_of_match[start:start + block],
+                                series_fmt, series_start, master)
+            for table, n in part.items():
+                counts[table] = counts.get(table, 0) + n
+        conn.execute("COMMIT;")
+    except BaseException:
+        conn.execute("ROLLBACK;")
+        raise
+    load_s = time.perf_counter() - t0
+
+    for pragma in RESTORE_PRAGMAS:
+        conn.execute(pragma)
+
+    # Indexes, ANALYZE, summary tables + triggers: all after the bulk load
+    t1 = time.perf_counter()
+    apply_migrations(conn)
+
+    counts.update({
+        "players": len(master["player_ids"]),
+        "teams": cfg.teams,
+        "venues": cfg.venues,
+        "series": cfg.series,
+        "load_s": round(load_s, 2),
+        "migrate_s": round(time.perf_counter() - t1, 2),
+    })
+    return counts
+
+
+def build_database(path: str, cfg: DatasetConfig) -> Dict[str, int]:
+    """
+    generate() into the file at `path`, leaving it in WAL mode like the app's DB.
+    """
+    conn = sqlite3.connect(path, isolation_level=None)
+    try:
+        counts = generate(conn, cfg)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        return counts
+    finally:
+        conn.close()
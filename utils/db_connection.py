@@ -1,17 +1,258 @@
 import os
+import pathlib
+import queue
 import sqlite3
+import threading
+import time
 from contextlib import contextmanager
 
+from utils.migrations import apply_migrations
+
 DB_PATH = os.environ.get("CRICKET_DB_PATH", "cricket2.db")
 
+# Reader connections kept open per process; the writer is always one
+READ_POOL_SIZE = int(os.environ.get("DB_READ_POOL_SIZE", "8"))
+
+# Idle connections are pinged with SELECT 1 before reuse after this long
+HEALTH_CHECK_AFTER = 30.0
+
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",          # readers don't block on the writer
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA busy_timeout=5000;",
+    "PRAGMA cache_size=-65536;",         # 64 MiB page cache per connection
+    "PRAGMA mmap_size=268435456;",       # 256 MiB memory-mapped I/O
+    "PRAGMA temp_store=MEMORY;",
+)
+
+
+_migrated = False
+_migrate_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    global _migrated
+
+    conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+
+    # Bring existing DB files up to the current index schema, once per process
+    if not _migrated:
+        with _migrate_lock:
+            if not _migrated:
+                apply_migrations(conn)
+                _migrated = True
+    return conn
+
+
+def _deny_attach(action, *_):
+    # Ad-hoc SQL must not open other files on the server
+    if action in (sqlite3.SQLITE_ATTACH, sqlite3.SQLITE_DETACH):
+        return sqlite3.SQLITE_DENY
+    return sqlite3.SQLITE_OK
+
+
+def _connect_read_only() -> sqlite3.Connection:
+    """
+    mode=ro connection for ad-hoc SQL: writes, DDL and ATTACH all fail.
+    """
+    if not _migrated:
+        _connect().close()          # migrations need a writable handle, once
+
+    uri = pathlib.Path(DB_PATH).resolve().as_uri() + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+    for pragma in PRAGMAS:
+        if "journal_mode" not in pragma:
+            conn.execute(pragma)
+    conn.execute("PRAGMA query_only=ON;")
+    conn.set_authorizer(_deny_attach)
+    return conn
+
+
+class PoolExhausted(sqlite3.OperationalError):
+    """No reader connection came free within the checkout timeout."""
+
+
+class ConnectionPool:
+    """
+    Bounded pool of reader connections plus one writer connection.
+
+    A thread that already holds a reader gets the same one back, so nested
+    helpers share a connection. The writer is serialized with a lock.
+    """
+
+    def __init__(self, size: int = READ_POOL_SIZE, connect=_connect, writable: bool = True):
+        self.size = size
+        self._connect = connect
+        self.writable = writable
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_used = {}
+        self._writer = None
+        self._writer_lock = threading.RLock()
+
+    # ---------- health ----------
+
+    def _healthy(self, conn: sqlite3.Connection) -> bool:
+        if time.time() - self._last_used.get(id(conn), 0) < HEALTH_CHECK_AFTER:
+            return True
+        try:
+            conn.execute("SELECT 1;").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        self._last_used.pop(id(conn), None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    # ---------- readers ----------
+
+    def _checkout(self, timeout: float) -> sqlite3.Connection:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    if self._created < self.size:
+                        self._created += 1
+                        try:
+                            return self._connect()
+                        except sqlite3.Error:
+                            self._created -= 1
+                            raise
+                try:
+                    conn = self._idle.get(timeout=timeout)
+                except queue.Empty:
+                    raise PoolExhausted(
+                        f"All {self.size} database reader connections stayed busy for "
+                        f"{timeout:g}s; try again, or raise DB_READ_POOL_SIZE."
+                    ) from None
+
+            if self._healthy(conn):
+                return conn
+            self._discard(conn)
+            with self._lock:
+                self._created -= 1
+
+    def _checkin(self, conn: sqlite3.Connection) -> None:
+        if conn.in_transaction:
+            conn.rollback()
+        self._last_used[id(conn)] = time.time()
+        self._idle.put(conn)
+
+    @contextmanager
+    def reader(self, timeout: float = 10.0):
+        held = getattr(self._local, "conn", None)
+        if held is not None:
+            yield held
+            return
+
+        conn = self._checkout(timeout)
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            self._checkin(conn)
+
+    # ---------- writer ----------
+
+    @contextmanager
+    def writer(self):
+        if not self.writable:
+            raise sqlite3.OperationalError("this connection pool is read-only; it has no writer")
+        with self._writer_lock:
+            if self._writer is None or not self._healthy(self._writer):
+                if self._writer is not None:
+                    self._discard(self._writer)
+                self._writer = self._connect()
+            try:
+                yield self._writer
+            finally:
+                self._last_used[id(self._writer)] = time.time()
+
+    # ---------- monitoring ----------
+
+    def stats(self) -> dict:
+        return {
+            "db_path": DB_PATH,
+            "readers_open": self._created,
+            "readers_idle": self._idle.qsize(),
+            "max_readers": self.size,
+            "writer_open": self._writer is not None,
+        }
+
+
+POOL = ConnectionPool()
+
+# Separate read-only readers for user-written SQL (SQL Analytics)
+RO_POOL = ConnectionPool(connect=_connect_read_only, writable=False)
+
+# Bumped after every committed db_cursor() block in this process
+_write_generation = 0
+
+
+def data_version() -> tuple:
+    """
+    Token that changes whenever the DB may have changed: this process's
+    write counter plus the size/mtime of the DB and WAL files, which also
+    catches writes from other processes (setup_db.py, import jobs).
+    """
+    stamp = [_write_generation]
+    for path in (DB_PATH, DB_PATH + "-wal"):
+        try:
+            st = os.stat(path)
+            stamp.extend((st.st_mtime_ns, st.st_size))
+        except OSError:
+            stamp.extend((0, 0))
+    return tuple(stamp)
+
+
+@contextmanager
+def read_connection():
+    """
+    Borrow a pooled reader connection for the duration of the block.
+    """
+    with POOL.reader() as conn:
+        yield conn
+
+
+@contextmanager
+def read_only_connection():
+    """
+    Borrow a pooled mode=ro connection (query_only, no ATTACH).
+    """
+    with RO_POOL.reader() as conn:
+        yield conn
+
+
 def get_connection():
-    return sqlite3.connect(DB_PATH, check_same_thread=False)
+    """
+    Standalone connection with the tuned pragmas, for scripts that manage
+    its lifetime themselves. Pages should use read_connection()/db_cursor().
+    """
+    return _connect()
+
 
 @contextmanager
 def db_cursor():
-    conn = get_connection()
-    try:
-        yield conn.cursor()
-        conn.commit()
-    finally:
-        conn.close()
+    global _write_generation
+
+    with POOL.writer() as conn:
+        cur = conn.cursor()
+        try:
+            yield cur
+            conn.commit()
+            _write_generation += 1
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
@@ -0,0 +1,93 @@
+import json
+from typing import Any, Dict, Optional, Union
+
+try:
+    import orjson  # optional: several times faster than json on large payloads
+except ImportError:
+    orjson = None
+
+
+# -------------------------------
+# Decoder
+# -------------------------------
+
+def loads(body: Union[bytes, str]) -> Any:
+    """
+    Decode JSON with orjson when installed, falling back to the stdlib.
+    Raises ValueError on malformed input either way.
+    """
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def decoder_name() -> str:
+    return "orjson" if orjson is not None else "json"
+
+
+# -------------------------------
+# Field projection
+# -------------------------------
+
+# A spec mirrors the payload: {key: True} keeps a value as-is, {key: {...}}
+# recurses, and lists are projected element by element.
+Spec = Dict[str, Any]
+
+_INNINGS = {"runs": True, "wickets": True, "overs": True}
+_TEAM_SCORE = {"inngs1": _INNINGS, "inngs2": _INNINGS}
+
+MATCH_LIST_SPEC: Spec = {
+    "typeMatches": {
+        "matchType": True,
+        "seriesMatches": {
+            "seriesAdWrapper": {
+                "seriesId": True,
+                "seriesName": True,
+                "matches": {
+                    "matchInfo": {
+                        "matchId": True,
+                        "status": True,
+                        "state": True,
+                        "team1": {"teamSName": True},
+                        "team2": {"teamSName": True},
+                    },
+                    "matchScore": {
+                        "team1Score": _TEAM_SCORE,
+                        "team2Score": _TEAM_SCORE,
+                    },
+                },
+            },
+        },
+    },
+}
+
+RANKINGS_SPEC: Spec = {
+    "rank": {"id": True, "rank": True, "name": True, "country": True, "rating": True},
+}
+
+# Only the fields the pages read; matched on the longest path prefix
+PROJECTIONS: Dict[str, Spec] = {
+    "/matches/v1/live": MATCH_LIST_SPEC,
+    "/matches/v1/recent": MATCH_LIST_SPEC,
+    "/stats/v1/rankings": RANKINGS_SPEC,
+}
+
+
+def project(node: Any, spec: Optional[Spec]) -> Any:
+    """
+    Keep only the fields named in `spec`; missing keys are skipped.
+    """
+    if spec is None or spec is True:
+        return node
+
+    if isinstance(node, list):
+        return [project(item, spec) for item in node]
+
+    if not isinstance(node, dict):
+        return node
+
+    out = {}
+    for key, sub in spec.items():
+        if key in node:
+            out[key] = node[key] if sub is True else project(node[key], sub)
+    return out
@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+from utils.decoding import loads
+
+
+def key_for(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Stable text key: path plus sorted, stringified query params.
+    """
+    items = sorted((str(k), str(v)) for k, v in (params or {}).items())
+    return f"{path}?{urlencode(items)}" if items else path
+
+
+class CachedResponse:
+    __slots__ = ("body", "etag", "last_modified", "stored_at")
+
+    def __init__(self, body: bytes, etag: Optional[str],
+                 last_modified: Optional[str], stored_at: float):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.stored_at = stored_at
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+    def json(self) -> Any:
+        return loads(self.body)
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class DiskCache:
+    """
+    SQLite-backed response store that survives restarts.
+
+    Bodies are kept as raw bytes with their validators, so stale entries
+    can be revalidated with a conditional GET and reused on 304 or when
+    the API is unreachable.
+    """
+
+    def __init__(self, path: str = "http_cache.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._conn.execute("PRAGMA synchronous=NORMAL;")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL
+            );
+            """
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM http_cache WHERE key = ?;",
+                (key,),
+            ).fetchone()
+        return CachedResponse(*row) if row else None
+
+    def put(self, key: str, body: bytes, etag: Optional[str] = None,
+            last_modified: Optional[str] = None) -> None:
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO http_cache (key, body, etag, last_modified, stored_at)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    body = excluded.body,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    stored_at = excluded.stored_at;
+                """,
+                (key, sqlite3.Binary(body), etag, last_modified, time.time()),
+            )
+            self._conn.commit()
+
+    def touch(self, key: str) -> None:
+        """
+        Mark an entry as freshly validated (after a 304).
+        """
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_cache SET stored_at = ? WHERE key = ?;",
+                (time.time(), key),
+            )
+            self._conn.commit()
+
+    def purge(self, older_than: float) -> int:
+        with self._lock:
+            cur = self._conn.execute(
+                "DELETE FROM http_cache WHERE stored_at < ?;",
+                (time.time() - older_than,),
+            )
+            self._conn.commit()
+            return cur.rowcount
@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Optional
+
+from utils.disk_cache import key_for
+
+
+# -------------------------------
+# Record / replay fixtures
+# -------------------------------
+
+def fixture_filename(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Readable, collision-safe file name for one (path, params) pair,
+    e.g. `stats_v1_rankings_batsmen-3f2a9c1b7d0e.json`.
+    """
+    key = key_for(path, params)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", path).strip("_") or "root"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+    return f"{slug}-{digest}.json"
+
+
+def record_fixture(
+    directory: str,
+    path: str,
+    params: Optional[Dict[str, Any]],
+    status: int,
+    body: bytes
+) -> str:
+    """
+    Save a captured response so the stand-in server can replay it.
+    """
+    os.makedirs(directory, exist_ok=True)
+    target = os.path.join(directory, fixture_filename(path, params))
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        payload = body.decode("utf-8", errors="replace")
+
+    with open(target, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "key": key_for(path, params),
+                "path": path,
+                "params": {str(k): str(v) for k, v in (params or {}).items()},
+                "status": status,
+                "body": payload,
+            },
+            f,
+            ensure_ascii=False,
+        )
+    return target
+
+
+def load_fixtures(directory: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Read every fixture in `directory` into {key: fixture}.
+    """
+    fixtures: Dict[str, Dict[str, Any]] = {}
+    if not os.path.isdir(directory):
+        return fixtures
+
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            fixture = json.load(f)
+        fixtures[fixture["key"]] = fixture
+    return fixtures
+
+
+# -------------------------------
+# Payload scaling
+# -------------------------------
+
+# Lists of row objects (one per match / player) that can be multiplied safely
+SCALABLE_LISTS = {"matches", "rank", "values"}
+
+_ID_OFFSET = 1_000_000
+
+
+def _offset_ids(node: Any, offset: int) -> Any:
+    if isinstance(node, dict):
+        return {
+            k: (v + offset if k == "matchId" and isinstance(v, int) else _offset_ids(v, offset))
+            for k, v in node.items()
+        }
+    if isinstance(node, list):
+        return [_offset_ids(v, offset) for v in node]
+    return node
+
+
+def scale_payload(node: Any, factor: int) -> Any:
+    """
+    Repeat per-match / per-player lists `factor` times. Copies get their
+    matchIds shifted so diffing and keys stay unique.
+    """
+    if factor <= 1:
+        return node
+
+    if isinstance(node, dict):
+        scaled = {}
+        for k, v in node.items():
+            if k in SCALABLE_LISTS and isinstance(v, list) and all(isinstance(i, dict) for i in v):
+                v = [scale_payload(item, factor) for item in v]
+                scaled[k] = [
+                    _offset_ids(item, copy * _ID_OFFSET) if copy else item
+                    for copy in range(factor)
+                    for item in v
+                ]
+            else:
+                scaled[k] = scale_payload(v, factor)
+        return scaled
+
+    if isinstance(node, list):
+        return [scale_payload(v, factor) for v in node]
+    return node
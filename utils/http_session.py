@@ -0,0 +1,145 @@
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Statuses worth another attempt: rate limiting and transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+Timeout = Union[float, Tuple[float, float]]
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+# -------------------------------
+# Shared session
+# -------------------------------
+
+def get_session(
+    pool_size: int = 10,
+    headers: Optional[Dict[str, str]] = None
+) -> requests.Session:
+    """
+    Return the process-wide pooled session, creating it on first use.
+
+    Connections to the API host are kept alive and reused across calls
+    and Streamlit sessions, so only the first request pays for TCP+TLS.
+    """
+    global _session
+
+    if _session is not None:
+        return _session
+
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=pool_size,
+                pool_maxsize=pool_size,
+                pool_block=False,
+                max_retries=0            # retries are handled below
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            session.headers.update({"Connection": "keep-alive"})
+            if headers:
+                session.headers.update(headers)
+            _session = session
+
+    return _session
+
+
+def reset_session() -> None:
+    """
+    Close the shared session (e.g. after secrets change).
+    """
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+
+
+# -------------------------------
+# Retry / backoff
+# -------------------------------
+
+def _retry_after_seconds(response: requests.Response) -> Optional[float]:
+    """
+    Parse a Retry-After header given either as seconds or an HTTP date.
+    """
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 0.5, cap: float = 8.0) -> float:
+    """
+    Full-jitter exponential backoff: uniform(0, min(cap, base * 2**attempt)).
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def get_with_retry(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: Timeout = 15,
+    max_retries: int = 3,
+    backoff_base: float = 0.5,
+    backoff_cap: float = 8.0,
+    headers: Optional[Dict[str, str]] = None,
+    session: Optional[requests.Session] = None
+) -> Tuple[requests.Response, int]:
+    """
+    GET through the shared session, retrying on 429/5xx and connection errors.
+
+    Returns (response, retries_used). The last response is returned as-is
+    once retries are exhausted; the last connection error is re-raised.
+    """
+    session = session or get_session()
+    attempt = 0
+
+    while True:
+        try:
+            response = session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=timeout
+            )
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.Timeout):
+            if attempt >= max_retries:
+                raise
+            time.sleep(backoff_delay(attempt, backoff_base, backoff_cap))
+            attempt += 1
+            continue
+
+        if response.status_code not in RETRY_STATUSES or attempt >= max_retries:
+            return response, attempt
+
+        delay = backoff_delay(attempt, backoff_base, backoff_cap)
+        retry_after = _retry_after_seconds(response)
+        if retry_after is not None:
+            # Honor the server's hint, but never stall a page indefinitely
+            delay = max(delay, min(retry_after, backoff_cap * 4))
+
+        response.close()
+        time.sleep(delay)
+        attempt += 1
@@ -0,0 +1,487 @@
+"""
+Incremental load of Cricbuzz match feeds (live/recent) into the local
+schema: series, venues, teams, matches, match_details, and, from match
+scorecards, players, batting_stats and bowling_stats.
+
+Match, series and venue ids are mapped to local ids in `ingest_state`
+(players in `player_map`, utils/player_map.py), which also holds
+each match's fingerprint and each series' high-water mark (latest match
+start seen), so a rerun only writes matches that are new or changed. A
+completed match is final once its scorecard has been loaded and is
+skipped from then on. All writes of one run are batched upserts in a
+single transaction, so runs are idempotent and can be scheduled freely.
+
+Network access is injected (`fetch(path) -> {"ok", "status", "data",
+"error"}`, e.g. api_handler.safe_get with raw=True); nothing here
+imports Streamlit.
+"""
+import datetime
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.player_map import map_scorecard_players
+
+FEEDS = {
+    "recent": "/matches/v1/recent",
+    "live": "/matches/v1/live",       # after recent: the fresher state wins
+}
+SCORECARD_PATH = "/mcenter/v1/{match_id}/hscard"
+
+# Scorecard calls cost quota; completed matches come first
+DEFAULT_MAX_SCORECARDS = 20
+
+CHUNK_ROWS = 500
+
+KIND_MATCH = "match"
+KIND_SERIES = "series"
+KIND_VENUE = "venue"
+
+# Cricbuzz matchFormat -> match_details.format (others stored without one)
+FORMATS = {"TEST": "test", "ODI": "odi", "T20": "t20i", "T20I": "t20i"}
+
+# Cricbuzz state -> matches.match_status as the seed data writes it
+STATUSES = {"Complete": "Completed"}
+
+INGEST_SQL = """
+CREATE TABLE IF NOT EXISTS ingest_state (
+    kind TEXT NOT NULL,
+    source_id INTEGER NOT NULL,
+    local_id INTEGER NOT NULL,
+    fingerprint TEXT,
+    high_water INTEGER,
+    final INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT,
+    PRIMARY KEY (kind, source_id)
+);
+"""
+
+Fetch = Callable[[str], Dict[str, Any]]
+
+_RESULT = re.compile(
+    r"^(?P<winner>.+?) won by (?P<innings>an innings and )?(?P<margin>\d+) (?P<unit>run|wkt|wicket)",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class MatchRecord:
+    source_id: int
+    series_id: Optional[int]
+    series_name: Optional[str]
+    venue_id: Optional[int]
+    venue_name: Optional[str]
+    city: Optional[str]
+    description: Optional[str]
+    team1: Optional[str]
+    team2: Optional[str]
+    format: Optional[str]
+    start_ms: Optional[int]
+    state: Optional[str]
+    status: Optional[str]
+    scores: Any = None
+
+    @property
+    def match_date(self) -> Optional[str]:
+        if not self.start_ms:
+            return None
+        start = datetime.datetime.fromtimestamp(self.start_ms / 1000, datetime.timezone.utc)
+        return start.strftime("%Y-%m-%d")
+
+    @property
+    def complete(self) -> bool:
+        return self.state == "Complete"
+
+    def fingerprint(self) -> str:
+        blob = json.dumps([self.state, self.status, self.scores, self.description,
+                           self.venue_id, self.start_ms], sort_keys=True, default=str)
+        return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+@dataclass
+class Scorecard:
+    toss_winner: Optional[str] = None
+    toss_decision: Optional[str] = None
+    batting_first_team: Optional[str] = None
+    # Players by Cricbuzz id; resolved to local ids through player_map on write
+    players: List[tuple] = field(default_factory=list)     # (cricbuzz_id, full_name, country)
+    batting: List[tuple] = field(default_factory=list)     # innings, position, player, runs, balls, sr, team
+    bowling: List[tuple] = field(default_factory=list)     # player, overs, wickets, economy
+
+
+@dataclass
+class IngestReport:
+    seen: int = 0
+    written: int = 0
+    unchanged: int = 0
+    already_final: int = 0       # skipped: completed and scorecard loaded earlier
+    finalized: int = 0           # became final in this run
+    scorecards: int = 0
+    batting_rows: int = 0
+    bowling_rows: int = 0
+    errors: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+# -------------------------------
+# Payload normalization
+# -------------------------------
+def _int(value: Any) -> Optional[int]:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _float(value: Any) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def iter_matches(payload: Dict[str, Any]) -> Iterator[MatchRecord]:
+    """
+    MatchRecords from a /matches/v1/{live,recent} payload (unprojected).
+    """
+    for type_block in (payload or {}).get("typeMatches") or []:
+        for series_block in type_block.get("seriesMatches") or []:
+            wrapper = series_block.get("seriesAdWrapper")
+            if not wrapper:
+                continue                     # ad slots
+            for match in wrapper.get("matches") or []:
+                info = match.get("matchInfo") or {}
+                source_id = _int(info.get("matchId"))
+                if source_id is None:
+                    continue
+                venue = info.get("venueInfo") or {}
+                yield MatchRecord(
+                    source_id=source_id,
+                    series_id=_int(info.get("seriesId", wrapper.get("seriesId"))),
+                    series_name=info.get("seriesName", wrapper.get("seriesName")),
+                    venue_id=_int(venue.get("id")),
+                    venue_name=venue.get("ground"),
+                    city=venue.get("city"),
+                    description=info.get("matchDesc"),
+                    team1=(info.get("team1") or {}).get("teamName"),
+                    team2=(info.get("team2") or {}).get("teamName"),
+                    format=FORMATS.get(str(info.get("matchFormat", "")).upper()),
+                    start_ms=_int(info.get("startDate")),
+                    state=info.get("state"),
+                    status=info.get("status"),
+                    scores=match.get("matchScore"),
+                )
+
+
+def parse_result(status: Optional[str]) -> Tuple[Optional[str], Optional[int], Optional[str]]:
+    """
+    (winner, margin, 'Runs' | 'Wickets') from e.g. "India won by 7 wkts".
+    """
+    found = _RESULT.match(status or "")
+    if not found:
+        return None, None, None
+    unit = "Runs" if found.group("unit").lower() == "run" else "Wickets"
+    return found.group("winner").strip(), int(found.group("margin")), unit
+
+
+def parse_scorecard(payload: Dict[str, Any]) -> Scorecard:
+    """
+    Toss, batting and bowling figures from a /mcenter/v1/{id}/hscard payload.
+    """
+    card = Scorecard()
+    header = (payload or {}).get("matchHeader") or {}
+    toss = header.get("tossResults") or {}
+    card.toss_winner = toss.get("tossWinnerName")
+    decision = str(toss.get("decision", "")).lower()
+    card.toss_decision = "bat" if decision.startswith("bat") else "bowl" if decision.startswith("bowl") else None
+
+    players: Dict[int, tuple] = {}
+    for innings in (payload or {}).get("scoreCard") or []:
+        number = _int(innings.get("inningsId")) or 1
+        bat_team = innings.get("batTeamDetails") or {}
+        bowl_team = innings.get("bowlTeamDetails") or {}
+        team = bat_team.get("batTeamName")
+        if number == 1:
+            card.batting_first_team = team
+
+        batsmen = bat_team.get("batsmenData") or {}
+        ordered = sorted(batsmen.items(), key=lambda kv: _int(kv[0].rsplit("_", 1)[-1]) or 0)
+        for position, (_, bat) in enumerate(ordered, start=1):
+            pid = _int(bat.get("batId"))
+            if pid is None or (not bat.get("balls") and not bat.get("outDesc")):
+                continue                         # did not bat
+            players[pid] = (pid, bat.get("batName"), team)
+            card.batting.append((number, position, pid, _int(bat.get("runs")),
+                                 _int(bat.get("balls")), _float(bat.get("strikeRate")), team))
+
+        for bowl in (bowl_team.get("bowlersData") or {}).values():
+            pid = _int(bowl.get("bowlerId"))
+            if pid is None:
+                continue
+            players.setdefault(pid, (pid, bowl.get("bowlName"), bowl_team.get("bowlTeamName")))
+            card.bowling.append((pid, _float(bowl.get("overs")), _int(bowl.get("wickets")),
+                                 _float(bowl.get("economy"))))
+
+    card.players = list(players.values())
+    return card
+
+
+# -------------------------------
+# State
+# -------------------------------
+def _state(conn: sqlite3.Connection, kind: str, source_ids: Iterable[int]) -> Dict[int, tuple]:
+    """
+    {source_id: (local_id, fingerprint, high_water, final)}
+    """
+    ids = list(set(source_ids))
+    out: Dict[int, tuple] = {}
+    for i in range(0, len(ids), CHUNK_ROWS):
+        chunk = ids[i:i + CHUNK_ROWS]
+        rows = conn.execute(
+            f"SELECT source_id, local_id, fingerprint, high_water, final FROM ingest_state "
+            f"WHERE kind = ? AND source_id IN ({', '.join('?' for _ in chunk)});",
+            [kind] + chunk,
+        )
+        out.update({r[0]: r[1:] for r in rows})
+    return out
+
+
+def _allocate(conn: sqlite3.Connection, table: str, key: str, count: int) -> List[int]:
+    """
+    `count` fresh local ids for `table`, past every id in use.
+    """
+    if count == 0:
+        return []
+    top = conn.execute(f"SELECT COALESCE(MAX({key}), 0) FROM {table};").fetchone()[0]
+    return list(range(top + 1, top + 1 + count))
+
+
+def _map_ids(conn: sqlite3.Connection, kind: str, table: str, key: str,
+             source_ids: Iterable[int]) -> Tuple[Dict[int, int], Dict[int, tuple]]:
+    """
+    ({source_id: local_id}, existing state) with new ids allocated.
+    """
+    source_ids = sorted({s for s in source_ids if s is not None})
+    state = _state(conn, kind, source_ids)
+    new = [s for s in source_ids if s not in state]
+    mapping = {s: row[0] for s, row in state.items()}
+    mapping.update(zip(new, _allocate(conn, table, key, len(new))))
+    return mapping, state
+
+
+def _executemany(conn: sqlite3.Connection, sql: str, rows: List[tuple]) -> None:
+    for i in range(0, len(rows), CHUNK_ROWS):
+        conn.executemany(sql, rows[i:i + CHUNK_ROWS])
+
+
+# -------------------------------
+# Pipeline
+# -------------------------------
+def collect(fetch: Fetch, feeds: Iterable[str] = tuple(FEEDS),
+            report: Optional[IngestReport] = None) -> Dict[int, MatchRecord]:
+    """
+    Latest record per Cricbuzz match across `feeds`.
+    """
+    records: Dict[int, MatchRecord] = {}
+    for name in feeds:
+        res = fetch(FEEDS[name])
+        if not res.get("ok"):
+            if report is not None:
+                report.errors.append(f"{name}: {res.get('error') or res.get('status')}")
+            continue
+        for record in iter_matches(res.get("data") or {}):
+            records[record.source_id] = record
+    return records
+
+
+def ingest(conn: sqlite3.Connection, fetch: Fetch, feeds: Iterable[str] = tuple(FEEDS),
+           scorecards: bool = True, max_scorecards: int = DEFAULT_MAX_SCORECARDS) -> IngestReport:
+    """
+    One incremental run. Network calls happen before the write
+    transaction opens, so readers are never blocked on the API.
+    """
+    t0 = time.perf_counter()
+    report = IngestReport()
+    records = collect(fetch, feeds, report)
+    report.seen = len(records)
+
+    known = _state(conn, KIND_MATCH, records)
+    changed: List[MatchRecord] = []
+    card_only = set()          # unchanged, but completed and still without a scorecard
+    for record in records.values():
+        state = known.get(record.source_id)
+        if state and state[3]:
+            report.already_final += 1
+        elif state and state[1] == record.fingerprint():
+            if scorecards and record.complete:
+                changed.append(record)
+                card_only.add(record.source_id)
+            else:
+                report.unchanged += 1
+        else:
+            changed.append(record)
+
+    # Scorecards: completed matches first (they become final), then live ones
+    cards: Dict[int, Scorecard] = {}
+    if scorecards:
+        wanted = sorted(changed, key=lambda r: (not r.complete, -(r.start_ms or 0)))
+        for record in wanted[:max_scorecards]:
+            res = fetch(SCORECARD_PATH.format(match_id=record.source_id))
+            if res.get("ok"):
+                cards[record.source_id] = parse_scorecard(res.get("data") or {})
+            else:
+                report.errors.append(f"scorecard {record.source_id}: {res.get('error') or res.get('status')}")
+
+    # Nothing new for these until their scorecard comes through (next run)
+    skipped = card_only - set(cards)
+    report.unchanged += len(skipped)
+    changed = [r for r in changed if r.source_id not in skipped]
+
+    if changed:
+        conn.execute("BEGIN IMMEDIATE;")
+        try:
+            _write(conn, changed, cards, report)
+            conn.execute("COMMIT;")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK;")
+            raise
+
+    report.seconds = round(time.perf_counter() - t0, 3)
+    return report
+
+
+def _write(conn: sqlite3.Connection, records: List[MatchRecord], cards: Dict[int, Scorecard],
+           report: IngestReport) -> None:
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    # ---- series: new ones, or a newer match start than the high-water mark ----
+    series_ids, series_state = _map_ids(conn, KIND_SERIES, "series", "series_id",
+                                        (r.series_id for r in records))
+    first: Dict[int, Optional[str]] = {}
+    latest: Dict[int, int] = {}
+    by_series: Dict[int, MatchRecord] = {}
+    for r in records:
+        if r.series_id is None:
+            continue
+        by_series.setdefault(r.series_id, r)
+        latest[r.series_id] = max(latest.get(r.series_id, 0), r.start_ms or 0)
+        if r.match_date and (first.get(r.series_id) is None or r.match_date < first[r.series_id]):
+            first[r.series_id] = r.match_date
+    series_rows, series_marks = [], []
+    for source_id, r in by_series.items():
+        mark = (series_state.get(source_id) or (None, None, None))[2]
+        if mark is not None and latest[source_id] <= mark:
+            continue
+        series_rows.append((series_ids[source_id], r.series_name, r.format, first.get(source_id)))
+        series_marks.append((KIND_SERIES, source_id, series_ids[source_id], None,
+                             latest[source_id], 0, now))
+    _executemany(conn, """
+        INSERT INTO series (series_id, series_name, match_type, start_date) VALUES (?, ?, ?, ?)
+        ON CONFLICT(series_id) DO UPDATE SET series_name = COALESCE(excluded.series_name, series.series_name),
+            match_type = COALESCE(series.match_type, excluded.match_type),
+            start_date = MIN(COALESCE(series.start_date, excluded.start_date),
+                             COALESCE(excluded.start_date, series.start_date));
+    """, series_rows)
+
+    # ---- venues, teams ----
+    venue_ids, venue_state = _map_ids(conn, KIND_VENUE, "venues", "venue_id",
+                                      (r.venue_id for r in records))
+    venue_rows = {venue_ids[r.venue_id]: (venue_ids[r.venue_id], r.venue_name, r.city)
+                  for r in records if r.venue_id is not None and r.venue_id not in venue_state}
+    _executemany(conn, """
+        INSERT INTO venues (venue_id, venue_name, city) VALUES (?, ?, ?)
+        ON CONFLICT(venue_id) DO NOTHING;
+    """, list(venue_rows.values()))
+    teams = {(t,) for r in records for t in (r.team1, r.team2) if t}
+    _executemany(conn, "INSERT INTO teams (team_name) VALUES (?) ON CONFLICT(team_name) DO NOTHING;",
+                 sorted(teams))
+
+    # ---- matches, match_details ----
+    match_ids, _ = _map_ids(conn, KIND_MATCH, "matches", "match_id", (r.source_id for r in records))
+    match_rows, detail_rows, marks = [], [], []
+    for r in records:
+        winner, margin, victory_type = parse_result(r.status)
+        local = match_ids[r.source_id]
+        card = cards.get(r.source_id)
+        match_rows.append((
+            local, r.description, r.team1, r.team2, winner, venue_ids.get(r.venue_id),
+            r.match_date, STATUSES.get(r.state, r.state), margin, victory_type,
+            series_ids.get(r.series_id),
+        ))
+        detail_rows.append((
+            local, r.format,
+            card.toss_winner if card else None,
+            card.toss_decision if card else None,
+            card.batting_first_team if card else None,
+        ))
+        final = int(r.complete and card is not None)
+        marks.append((KIND_MATCH, r.source_id, local, r.fingerprint(), r.start_ms, final, now))
+        report.finalized += final
+
+    _executemany(conn, """
+        INSERT INTO matches (match_id, match_description, team1, team2, winning_team, venue_id,
+                             match_date, match_status, victory_margin, victory_type, series_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(match_id) DO UPDATE SET
+            match_description = excluded.match_description, team1 = excluded.team1,
+            team2 = excluded.team2, winning_team = excluded.winning_team,
+            venue_id = excluded.venue_id, match_date = excluded.match_date,
+            match_status = excluded.match_status, victory_margin = excluded.victory_margin,
+            victory_type = excluded.victory_type, series_id = excluded.series_id;
+    """, match_rows)
+    _executemany(conn, """
+        INSERT INTO match_details (match_id, format, toss_winner, toss_decision, batting_first_team)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(match_id) DO UPDATE SET format = excluded.format,
+            toss_winner = COALESCE(excluded.toss_winner, match_details.toss_winner),
+            toss_decision = COALESCE(excluded.toss_decision, match_details.toss_decision),
+            batting_first_team = COALESCE(excluded.batting_first_team, match_details.batting_first_team);
+    """, detail_rows)
+
+    # ---- scorecards: players, then the match's figures replaced as a whole ----
+    formats = {match_ids[r.source_id]: r.format for r in records}
+    seen_players: Dict[int, tuple] = {}
+    for card in cards.values():
+        seen_players.update({p[0]: p for p in card.players})
+    pid = map_scorecard_players(conn, list(seen_players.values()))
+
+    batting, bowling, replaced = [], [], []
+    for source_id, card in cards.items():
+        local = match_ids[source_id]
+        replaced.append((local,))
+        batting.extend((pid[p], local, formats[local], inn, pos, runs, balls, sr, team)
+                       for inn, pos, p, runs, balls, sr, team in card.batting)
+        bowling.extend((pid[p], local, formats[local], overs, wickets, econ)
+                       for p, overs, wickets, econ in card.bowling)
+
+    _executemany(conn, "DELETE FROM batting_stats WHERE match_id = ?;", replaced)
+    _executemany(conn, "DELETE FROM bowling_stats WHERE match_id = ?;", replaced)
+    _executemany(conn, """
+        INSERT INTO batting_stats (player_id, match_id, format, innings, batting_position,
+                                   runs, balls, strike_rate, team)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?);
+    """, batting)
+    _executemany(conn, """
+        INSERT INTO bowling_stats (player_id, match_id, format, overs, wickets, economy_rate)
+        VALUES (?, ?, ?, ?, ?, ?);
+    """, bowling)
+
+    # ---- state ----
+    venue_marks = [(KIND_VENUE, s, venue_ids[s], None, None, 0, now)
+                   for s in {r.venue_id for r in records if r.venue_id is not None} - set(venue_state)]
+    _executemany(conn, """
+        INSERT INTO ingest_state (kind, source_id, local_id, fingerprint, high_water, final, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(kind, source_id) DO UPDATE SET local_id = excluded.local_id,
+            fingerprint = excluded.fingerprint, high_water = excluded.high_water,
+            final = excluded.final, updated_at = excluded.updated_at;
+    """, series_marks + venue_marks + marks)
+
+    report.written = len(match_rows)
+    report.scorecards = len(cards)
+    report.batting_rows = len(batting)
+    report.bowling_rows = len(bowling)
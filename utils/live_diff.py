@@ -0,0 +1,83 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+# -------------------------------
+# Flattening
+# -------------------------------
+
+def extract_matches(payload: Optional[Dict[str, Any]]) -> Dict[Any, Dict[str, Any]]:
+    """
+    Flatten typeMatches -> seriesMatches -> seriesAdWrapper -> matches
+    into {matchId: record}, keeping payload order.
+    """
+    records: Dict[Any, Dict[str, Any]] = {}
+
+    for group in (payload or {}).get("typeMatches", []):
+        match_type = group.get("matchType", "Unknown Format")
+
+        for entry in group.get("seriesMatches", []):
+            series = entry.get("seriesAdWrapper", {})
+            series_name = series.get("seriesName", "Unknown Series")
+
+            for m in series.get("matches", []):
+                info = m.get("matchInfo", {})
+                match_id = info.get("matchId")
+                if match_id is None:
+                    continue
+
+                records[match_id] = {
+                    "match_id": match_id,
+                    "match_type": match_type,
+                    "series_name": series_name,
+                    "team1": info.get("team1", {}).get("teamSName", "Team 1"),
+                    "team2": info.get("team2", {}).get("teamSName", "Team 2"),
+                    "status": info.get("status", "Status Unknown"),
+                    "score": m.get("matchScore", {}),
+                }
+
+    return records
+
+
+# -------------------------------
+# Diffing
+# -------------------------------
+
+@dataclass
+class Changeset:
+    added: List[Any] = field(default_factory=list)
+    removed: List[Any] = field(default_factory=list)
+    changed: List[Any] = field(default_factory=list)   # score or status moved
+    unchanged: int = 0
+
+    @property
+    def touched(self) -> List[Any]:
+        """
+        Match ids whose rendering must be (re)built.
+        """
+        return self.added + self.changed
+
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+def diff_matches(
+    prev: Dict[Any, Dict[str, Any]],
+    curr: Dict[Any, Dict[str, Any]]
+) -> Changeset:
+    """
+    Compare two extract_matches() results by matchId.
+    """
+    changes = Changeset()
+
+    for match_id, record in curr.items():
+        old = prev.get(match_id)
+        if old is None:
+            changes.added.append(match_id)
+        elif old["score"] != record["score"] or old["status"] != record["status"]:
+            changes.changed.append(match_id)
+        else:
+            changes.unchanged += 1
+
+    changes.removed = [match_id for match_id in prev if match_id not in curr]
+    return changes
@@ -0,0 +1,146 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional
+
+
+# -------------------------------
+# Snapshot store
+# -------------------------------
+
+@dataclass(frozen=True)
+class LiveSnapshot:
+    """
+    One published view of the live feed. Shared by every session, so
+    readers must treat `data` as read-only.
+    """
+    version: int
+    data: Optional[Dict[str, Any]]
+    updated_at: float                 # when `data` last changed
+    checked_at: float                 # when the feed was last polled
+    error: Optional[str] = None       # last poll error, if the poll failed
+
+
+class SnapshotStore:
+    """
+    Holds the latest LiveSnapshot; publishing swaps in a new immutable object.
+    """
+
+    def __init__(self):
+        self._snapshot: Optional[LiveSnapshot] = None
+        self._cond = threading.Condition()
+        self.last_read = time.time()
+
+    def current(self) -> Optional[LiveSnapshot]:
+        self.last_read = time.time()
+        return self._snapshot
+
+    def wait_for_first(self, timeout: float) -> Optional[LiveSnapshot]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._snapshot is not None, timeout)
+        return self.current()
+
+    def wait_for_change(self, version: int, timeout: float) -> Optional[LiveSnapshot]:
+        """
+        Block until a snapshot other than `version` is published, or for
+        `timeout` seconds; returns the current snapshot either way.
+        """
+        with self._cond:
+            self._cond.wait_for(
+                lambda: self._snapshot is not None and self._snapshot.version != version, timeout
+            )
+        return self.current()
+
+    def publish(self, result: Dict[str, Any]) -> LiveSnapshot:
+        """
+        Publish a safe_get result. The version only moves when the payload
+        changes; failed polls keep the previous data and record the error.
+        """
+        now = time.time()
+        with self._cond:
+            prev = self._snapshot
+
+            if not result.get("ok"):
+                snap = LiveSnapshot(
+                    version=prev.version if prev else 0,
+                    data=prev.data if prev else None,
+                    updated_at=prev.updated_at if prev else now,
+                    checked_at=now,
+                    error=result.get("error") or f"status {result.get('status')}",
+                )
+            elif prev is not None and prev.data == result.get("data"):
+                snap = LiveSnapshot(prev.version, prev.data, prev.updated_at, now)
+            else:
+                snap = LiveSnapshot(
+                    version=(prev.version if prev else 0) + 1,
+                    data=result.get("data"),
+                    updated_at=now,
+                    checked_at=now,
+                )
+
+            self._snapshot = snap
+            self._cond.notify_all()
+            return snap
+
+
+# -------------------------------
+# Poller thread
+# -------------------------------
+
+class LivePoller(threading.Thread):
+    """
+    Polls `fetch` every `interval` seconds and publishes into `store`.
+    Exits on its own once nobody has read the store for `idle_timeout`
+    seconds, so an unwatched dashboard stops spending quota.
+    """
+
+    def __init__(
+        self,
+        store: SnapshotStore,
+        fetch: Callable[[], Dict[str, Any]],
+        interval: float = 30,
+        idle_timeout: float = 600
+    ):
+        super().__init__(name="live-poller", daemon=True)
+        self.store = store
+        self.fetch = fetch
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self.store.publish(self.fetch())
+            except Exception as err:
+                self.store.publish({"ok": False, "status": 0, "error": str(err)})
+
+            if time.time() - self.store.last_read > self.idle_timeout:
+                break
+            self._stop_event.wait(self.interval)
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+
+_poller: Optional[LivePoller] = None
+_poller_lock = threading.Lock()
+
+
+def ensure_poller(
+    store: SnapshotStore,
+    fetch: Callable[[], Dict[str, Any]],
+    interval: float = 30,
+    idle_timeout: float = 600
+) -> LivePoller:
+    """
+    Start the single process-wide poller if it is not already running.
+    """
+    global _poller
+
+    with _poller_lock:
+        if _poller is None or not _poller.is_alive():
+            store.last_read = time.time()
+            _poller = LivePoller(store, fetch, interval, idle_timeout)
+            _poller.start()
+        return _poller
@@ -0,0 +1,207 @@
+"""
+Local full-text search over players, venues and series.
+
+Lookups run against the trigram FTS5 indexes in utils/search_index.py.
+The typed text is first matched as a substring (prefix matches ranked
+first); if nothing matches, a fuzzy pass collects candidates sharing
+trigrams with the query and keeps the ones close enough by edit
+similarity; short queries with no such candidate score names sharing a
+word initial instead. Player lookups go to the Cricbuzz search only on a
+local miss.
+"""
+import difflib
+import time
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from utils.db_connection import read_connection
+from utils.search_index import INDEXES, SearchIndex
+
+DEFAULT_LIMIT = 10
+
+# Fuzzy pass: trigram candidates considered, and the similarity to keep one
+FUZZY_CANDIDATES = 200
+FUZZY_MIN_SCORE = 0.6
+
+# Typos sharing no trigram with the name ("kholi" for "Kohli") fall back to
+# scoring names with a word that starts like a query word, for queries of
+# up to FUZZY_SCAN_MAX_WORDS words and at most FUZZY_SCAN_ROWS names
+FUZZY_SCAN_MAX_WORDS = 3
+FUZZY_SCAN_ROWS = 5000
+
+SOURCE_LOCAL = "local"
+SOURCE_CRICBUZZ = "cricbuzz"
+
+
+@dataclass
+class SearchHit:
+    kind: str
+    id: str
+    name: str
+    detail: str = ""
+    score: float = 1.0          # 1.0 for substring matches, similarity for fuzzy ones
+    source: str = SOURCE_LOCAL
+
+
+@dataclass
+class SearchResult:
+    hits: List[SearchHit] = field(default_factory=list)
+    source: str = SOURCE_LOCAL
+    fuzzy: bool = False
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+
+# -------------------------------
+# Local lookups
+# -------------------------------
+def _phrase(text: str) -> str:
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _select(index: SearchIndex) -> str:
+    fields = ", ".join(f"b.{c}" for c in (index.key,) + index.columns + index.detail)
+    return f"SELECT {fields} FROM {index.fts} f JOIN {index.table} b ON b.rowid = f.rowid"
+
+
+def _hit(index: SearchIndex, row: tuple, score: float = 1.0) -> SearchHit:
+    name = row[1] or ""
+    detail = row[1 + len(index.columns):]
+    return SearchHit(
+        kind=index.kind, id=str(row[0]), name=name,
+        detail=" · ".join(str(v) for v in detail if v not in (None, "")), score=score,
+    )
+
+
+def _substring(conn, index: SearchIndex, text: str, limit: int) -> List[SearchHit]:
+    name = index.columns[0]
+    terms = text.split()
+    long_terms = [t for t in terms if len(t) >= 3]
+    short_terms = [t for t in terms if len(t) < 3]
+
+    if not long_terms:
+        # Nothing a trigram index can match: plain prefix match on the name
+        fields = ", ".join((index.key,) + index.columns + index.detail)
+        sql = f"SELECT {fields} FROM {index.table} WHERE {name} LIKE ? ESCAPE '\\' ORDER BY {name} LIMIT ?;"
+        return [_hit(index, row) for row in conn.execute(sql, (_like(text) + "%", limit)).fetchall()]
+
+    # Trigram phrases match anywhere in the indexed columns; short words
+    # ("ali 2", "ground 1") narrow those hits with LIKE
+    text_cols = " || ' ' || ".join(f"coalesce(b.{c}, '')" for c in index.columns)
+    where = f"{index.fts} MATCH ?" + "".join(
+        f" AND {text_cols} LIKE ? ESCAPE '\\'" for _ in short_terms
+    )
+    sql = (
+        f"{_select(index)} WHERE {where} "
+        f"ORDER BY instr(lower(b.{name}), lower(?)) != 1, f.rank LIMIT ?;"
+    )
+    params = [" AND ".join(_phrase(t) for t in long_terms)]
+    params += ["%" + _like(t) + "%" for t in short_terms]
+    params += [text, limit]
+    return [_hit(index, row) for row in conn.execute(sql, params).fetchall()]
+
+
+def _like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _similarity(query_words: List[str], value: str) -> float:
+    """
+    Mean over the query's words of the closest word in `value`, so
+    "aarv aly" scores "Aarav Ali ..." above "Aarav Das ...".
+    """
+    words = value.lower().split()
+    if not words:
+        return 0.0
+    return sum(
+        max(difflib.SequenceMatcher(None, q, w).ratio() for w in words) for q in query_words
+    ) / len(query_words)
+
+
+def _score(index: SearchIndex, rows: List[tuple], query_words: List[str],
+           limit: int) -> List[SearchHit]:
+    scored = []
+    for row in rows:
+        best = max((_similarity(query_words, v) for v in row[1:1 + len(index.columns)] if v),
+                   default=0.0)
+        if best >= FUZZY_MIN_SCORE:
+            scored.append(_hit(index, row, round(best, 3)))
+    scored.sort(key=lambda h: -h.score)
+    return scored[:limit]
+
+
+def _fuzzy(conn, index: SearchIndex, text: str, limit: int) -> List[SearchHit]:
+    query_words = text.lower().split()
+    grams = {w[i:i + 3] for w in query_words for i in range(len(w) - 2)}
+
+    hits: List[SearchHit] = []
+    if grams:
+        rows = conn.execute(
+            f"{_select(index)} WHERE {index.fts} MATCH ? ORDER BY f.rank LIMIT ?;",
+            (" OR ".join(_phrase(g) for g in sorted(grams)), FUZZY_CANDIDATES),
+        ).fetchall()
+        hits = _score(index, rows, query_words, limit)
+    if hits or not query_words or len(query_words) > FUZZY_SCAN_MAX_WORDS:
+        return hits
+
+    # Transpositions and the like can share no trigram with the name
+    name = index.columns[0]
+    initials = sorted({w[0] for w in query_words})
+    where = " OR ".join(f"{name} LIKE ? ESCAPE '\\' OR {name} LIKE ? ESCAPE '\\'" for _ in initials)
+    params: list = []
+    for c in initials:
+        params += [_like(c) + "%", "% " + _like(c) + "%"]
+    fields = ", ".join((index.key,) + index.columns + index.detail)
+    rows = conn.execute(
+        f"SELECT {fields} FROM {index.table} WHERE {where} LIMIT ?;", params + [FUZZY_SCAN_ROWS]
+    ).fetchall()
+    return _score(index, rows, query_words, limit)
+
+
+def search_local(kind: str, text: str, limit: int = DEFAULT_LIMIT) -> SearchResult:
+    """
+    Substring/prefix matches for `text` among `kind` ("player", "venue",
+    "series"), or fuzzy matches when there are none.
+    """
+    index = INDEXES[kind]
+    text = text.strip()
+    t0 = time.perf_counter()
+    result = SearchResult()
+    if text:
+        with read_connection() as conn:
+            result.hits = _substring(conn, index, text, limit)
+            if not result.hits:
+                result.hits = _fuzzy(conn, index, text, limit)
+                result.fuzzy = bool(result.hits)
+    result.elapsed_ms = round((time.perf_counter() - t0) * 1000, 2)
+    return result
+
+
+# -------------------------------
+# Players, with the Cricbuzz fallback
+# -------------------------------
+def search_players(text: str, limit: int = DEFAULT_LIMIT, remote: bool = True) -> SearchResult:
+    """
+    Local player search; on a local miss (and when `remote`), the Cricbuzz
+    player search instead.
+    """
+    result = search_local("player", text, limit)
+    if result.hits or not remote or not text.strip():
+        return result
+
+    from utils.api_handler import search_player   # network path only
+
+    t0 = time.perf_counter()
+    res = search_player(text.strip())
+    result.source = SOURCE_CRICBUZZ
+    result.elapsed_ms = round(result.elapsed_ms + (time.perf_counter() - t0) * 1000, 2)
+    if not res["ok"]:
+        result.error = res["error"]
+        return result
+
+    for p in ((res["data"] or {}).get("player") or [])[:limit]:
+        result.hits.append(SearchHit(
+            kind="player", id=str(p.get("id", "")), name=p.get("name", ""),
+            detail=p.get("teamName", ""), source=SOURCE_CRICBUZZ,
+        ))
+    return result
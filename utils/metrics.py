@@ -0,0 +1,136 @@
+import json
+import re
+import threading
+import time
+from collections import Counter, deque
+from typing import Any, Dict, Optional
+
+# Where a response came from, as recorded by safe_get / cached_get
+SOURCE_NETWORK = "network"
+SOURCE_MEMORY = "memory"          # fresh in-memory cache hit
+SOURCE_STALE = "stale"            # stale in-memory hit, refreshed in background
+SOURCE_DISK = "disk"              # fresh on-disk hit
+SOURCE_REVALIDATED = "revalidated"  # 304, body served from disk
+SOURCE_FALLBACK = "fallback"      # disk/memory copy served on error or shed
+SOURCE_SHED = "shed"              # rejected by the quota scheduler
+
+CACHE_SOURCES = {SOURCE_MEMORY, SOURCE_STALE, SOURCE_DISK, SOURCE_REVALIDATED, SOURCE_FALLBACK}
+
+# 304: a disk-cache entry revalidated, not a failure
+OK_STATUSES = (200, 304)
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def endpoint_bucket(path: str) -> str:
+    """
+    Collapse numeric path segments so /stats/v1/player/1413 and
+    /stats/v1/player/8733 share the bucket /stats/v1/player/{id}.
+    """
+    return _ID_SEGMENT.sub("/{id}", path.split("?", 1)[0])
+
+
+def _percentile(sorted_values, q: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    idx = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[idx]
+
+
+class EndpointStats:
+    """
+    Counters for one endpoint bucket. Latencies keep the last `window`
+    samples, so percentiles track recent behavior.
+    """
+
+    def __init__(self, window: int = 2048):
+        self.latencies = deque(maxlen=window)
+        self.requests = 0
+        self.bytes_total = 0
+        self.bytes_max = 0
+        self.retries = 0
+        self.statuses: Counter = Counter()
+        self.sources: Counter = Counter()
+
+    def summary(self) -> Dict[str, Any]:
+        lat = sorted(self.latencies)
+        lookups = sum(self.sources.values())
+        cached = sum(n for src, n in self.sources.items() if src in CACHE_SOURCES)
+        network = self.sources.get(SOURCE_NETWORK, 0) + self.sources.get(SOURCE_REVALIDATED, 0)
+        errors = sum(n for status, n in self.statuses.items() if status not in OK_STATUSES)
+
+        return {
+            "calls": lookups,
+            "network_requests": self.requests,
+            "p50_ms": _percentile(lat, 0.50),
+            "p95_ms": _percentile(lat, 0.95),
+            "p99_ms": _percentile(lat, 0.99),
+            "avg_bytes": round(self.bytes_total / network) if network else 0,
+            "max_bytes": self.bytes_max,
+            "retries": self.retries,
+            "error_rate": round(errors / self.requests, 4) if self.requests else 0.0,
+            "cache_hit_rate": round(cached / lookups, 4) if lookups else 0.0,
+            "statuses": {str(k): v for k, v in sorted(self.statuses.items())},
+            "sources": dict(self.sources),
+        }
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, EndpointStats] = {}
+        self.started_at = time.time()
+
+    def _stats(self, path: str) -> EndpointStats:
+        bucket = endpoint_bucket(path)
+        if bucket not in self._endpoints:
+            self._endpoints[bucket] = EndpointStats()
+        return self._endpoints[bucket]
+
+    def record(
+        self,
+        path: str,
+        source: str,
+        latency_ms: float,
+        status: Optional[int] = None,
+        size: int = 0,
+        retries: int = 0
+    ) -> None:
+        """
+        Record one call. `status` is only given when a request went out.
+        """
+        with self._lock:
+            stats = self._stats(path)
+            stats.sources[source] += 1
+            stats.latencies.append(round(latency_ms, 2))
+            if status is not None:
+                stats.requests += 1
+                stats.statuses[status] += 1
+                stats.retries += retries
+                stats.bytes_total += size
+                stats.bytes_max = max(stats.bytes_max, size)
+
+    def record_cache(self, path: str, source: str) -> None:
+        """
+        Count a cache lookup answered without reaching safe_get.
+        """
+        with self._lock:
+            self._stats(path).sources[source] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "since": self.started_at,
+                "endpoints": {
+                    bucket: stats.summary()
+                    for bucket, stats in sorted(self._endpoints.items())
+                },
+            }
+
+    def to_json(self, **extra: Any) -> str:
+        return json.dumps({**self.snapshot(), **extra}, indent=2, default=str)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+            self.started_at = time.time()
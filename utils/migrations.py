@@ -0,0 +1,188 @@
+"""
+Versioned schema migrations for the analytics database.
+
+Each migration runs once per database file, in version order, inside its
+own transaction; applied versions are recorded in `schema_migrations`.
+Index choices follow the QUERIES workload in utils/queries.py.
+"""
+import sqlite3
+import time
+from typing import List, Tuple
+
+from utils.aggregates import BACKFILL_SQL, SCHEMA_SQL, TRIGGERS_SQL
+from utils.change_tracking import CHANGE_TRACKING_SQL, TRACKED_TABLES
+from utils.ingest import INGEST_SQL
+from utils.player_map import MAP_SQL
+from utils.search_index import SEARCH_SQL, SEARCH_TABLES
+
+# (version, description, tables it needs, SQL script)
+Migration = Tuple[int, str, Tuple[str, ...], str]
+
+MIGRATIONS: List[Migration] = [
+    (
+        1,
+        "Lookup indexes for date/status/team/role filters",
+        ("matches", "players", "player_format_stats"),
+        """
+        -- Q2, Q22: date range filters
+        CREATE INDEX IF NOT EXISTS idx_matches_date
+            ON matches(match_date, team1, team2, winning_team);
+        -- Q10: completed matches, newest first
+        CREATE INDEX IF NOT EXISTS idx_matches_status_date
+            ON matches(match_status, match_date);
+        -- Q5, Q12: grouping by winner
+        CREATE INDEX IF NOT EXISTS idx_matches_winning_team
+            ON matches(winning_team);
+        -- Q1 / Q6, Q9
+        CREATE INDEX IF NOT EXISTS idx_players_country ON players(country);
+        CREATE INDEX IF NOT EXISTS idx_players_role ON players(playing_role);
+        -- Q3, Q7, Q11
+        CREATE INDEX IF NOT EXISTS idx_pfs_player_format
+            ON player_format_stats(player_id, format);
+        CREATE INDEX IF NOT EXISTS idx_pfs_format_runs
+            ON player_format_stats(format, runs);
+        """,
+    ),
+    (
+        2,
+        "Covering indexes for batting/bowling aggregations and self-joins",
+        ("batting_stats", "bowling_stats"),
+        """
+        -- Q13, Q24: partner lookup on (match, innings, team, position)
+        CREATE INDEX IF NOT EXISTS idx_batting_partnership
+            ON batting_stats(match_id, innings, team, batting_position, player_id, runs);
+        -- Q9, Q19, Q20, Q21, Q23, Q25: per-player / per-format aggregates
+        CREATE INDEX IF NOT EXISTS idx_batting_player_format
+            ON batting_stats(player_id, format, match_id, runs, strike_rate);
+        -- Q9, Q14, Q18, Q21
+        CREATE INDEX IF NOT EXISTS idx_bowling_player_format
+            ON bowling_stats(player_id, format, match_id, overs, wickets, economy_rate);
+        """,
+    ),
+    (
+        3,
+        "Planner statistics for the new indexes",
+        (),
+        "ANALYZE;",
+    ),
+    (
+        4,
+        "Trigger-maintained summary tables for Q9, Q17, Q20, Q21",
+        ("batting_stats", "bowling_stats", "matches", "match_details"),
+        SCHEMA_SQL + BACKFILL_SQL + TRIGGERS_SQL,
+    ),
+    (
+        5,
+        "Per-table change counters for the columnar mirror",
+        TRACKED_TABLES,
+        CHANGE_TRACKING_SQL,
+    ),
+    (
+        6,
+        "Keyset-ordered indexes for the CRUD table views",
+        ("players",),
+        """
+        -- players view: (full_name, player_id) keyset, optionally filtered by
+        -- country or role; these also serve Q1/Q6/Q9's filters, so the
+        -- single-column indexes from version 1 go
+        CREATE INDEX IF NOT EXISTS idx_players_name ON players(full_name, player_id);
+        CREATE INDEX IF NOT EXISTS idx_players_country_name
+            ON players(country, full_name, player_id);
+        CREATE INDEX IF NOT EXISTS idx_players_role_name
+            ON players(playing_role, full_name, player_id);
+        DROP INDEX IF EXISTS idx_players_country;
+        DROP INDEX IF EXISTS idx_players_role;
+        ANALYZE players;
+        """,
+    ),
+    (
+        7,
+        "FTS5 trigram indexes for local player/venue/series search",
+        SEARCH_TABLES,
+        SEARCH_SQL,
+    ),
+    (
+        8,
+        "Cricbuzz id mapping and high-water marks for feed ingestion",
+        (),
+        INGEST_SQL,
+    ),
+    (
+        9,
+        "Cricbuzz player id mapping and local profile store",
+        ("players",),
+        MAP_SQL,
+    ),
+]
+
+
+def _statements(script: str) -> List[str]:
+    """
+    Split a script into complete statements (trigger bodies included).
+    """
+    statements, buf = [], ""
+    for chunk in script.split(";"):
+        buf += chunk + ";"
+        if sqlite3.complete_statement(buf):
+            if buf.strip(" \n\t;"):
+                statements.append(buf.strip())
+            buf = ""
+    return statements
+
+
+def _existing_tables(conn: sqlite3.Connection) -> set:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table';")
+    return {r[0] for r in rows}
+
+
+def current_version(conn: sqlite3.Connection) -> int:
+    if "schema_migrations" not in _existing_tables(conn):
+        return 0
+    row = conn.execute("SELECT MAX(version) FROM schema_migrations;").fetchone()
+    return row[0] or 0
+
+
+def apply_migrations(conn: sqlite3.Connection) -> List[int]:
+    """
+    Apply every pending migration. Stops (without error) at the first one
+    whose tables don't exist yet, e.g. before setup_db.py has run.
+    Returns the versions applied.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT
+        );
+        """
+    )
+    conn.commit()
+
+    applied = []
+    done = current_version(conn)
+    tables = _existing_tables(conn)
+
+    for version, description, needs, script in MIGRATIONS:
+        if version <= done:
+            continue
+        if not set(needs) <= tables:
+            break
+
+        try:
+            conn.execute("BEGIN IMMEDIATE;")
+            for statement in _statements(script):
+                conn.execute(statement)
+            conn.execute(
+                "INSERT INTO schema_migrations VALUES (?, ?, ?);",
+                (version, description, time.strftime("%Y-%m-%d %H:%M:%S")),
+            )
+            conn.execute("COMMIT;")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK;")
+            raise
+
+        applied.append(version)
+        tables = _existing_tables(conn)
+
+    return applied
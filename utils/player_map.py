@@ -0,0 +1,168 @@
+"""
+Cricbuzz player id <-> local player_id mapping (migration 9), shared by
+feed ingestion (utils/ingest.py) and the profile store
+(utils/player_profiles.py).
+
+Each Cricbuzz id maps to one local player: an existing `cb<id>` row,
+else a unique exact (case-insensitive) name match, else a new `cb<id>`
+player created from the scorecard or profile that brought the id in.
+"""
+import time
+from typing import Any, Dict, Iterable, List
+
+PLAYER_PREFIX = "cb"
+CHUNK_ROWS = 500
+
+MAP_SQL = """
+CREATE TABLE IF NOT EXISTS player_map (
+    cricbuzz_id INTEGER PRIMARY KEY,
+    player_id TEXT NOT NULL,
+    matched_by TEXT,
+    updated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_player_map_player ON player_map(player_id);
+
+CREATE TABLE IF NOT EXISTS player_profiles (
+    cricbuzz_id INTEGER PRIMARY KEY,
+    name TEXT,
+    country TEXT,
+    role TEXT,
+    batting_style TEXT,
+    bowling_style TEXT,
+    payload TEXT,
+    fetched_at REAL
+);
+"""
+
+MATCHED_SCORECARD = "scorecard"
+MATCHED_EXISTING = "cb-row"
+MATCHED_NAME = "name"
+MATCHED_CREATED = "created"
+
+
+def cricbuzz_player_id(cricbuzz_id: int) -> str:
+    return f"{PLAYER_PREFIX}{cricbuzz_id}"
+
+
+def marks(ids: List[Any]) -> str:
+    return ", ".join("?" for _ in ids)
+
+
+def chunks(values: Iterable[Any]):
+    values = list(values)
+    for i in range(0, len(values), CHUNK_ROWS):
+        yield values[i:i + CHUNK_ROWS]
+
+
+def local_ids(conn, cricbuzz_ids: Iterable[int]) -> Dict[int, str]:
+    """
+    {cricbuzz_id: local player_id} for the ids that are mapped.
+    """
+    out: Dict[int, str] = {}
+    for chunk in chunks(sorted({int(i) for i in cricbuzz_ids})):
+        rows = conn.execute(
+            f"SELECT cricbuzz_id, player_id FROM player_map WHERE cricbuzz_id IN ({marks(chunk)});",
+            chunk,
+        )
+        out.update(dict(rows.fetchall()))
+    return out
+
+
+def _resolve(conn, players: List[tuple]) -> Dict[int, tuple]:
+    """
+    {cricbuzz_id: (player_id, matched_by)} for unmapped (cricbuzz_id, name)
+    pairs: the `cb<id>` row if one exists, else the one local player with
+    that name, else a `cb<id>` player still to be created (MATCHED_CREATED).
+    """
+    by_name: Dict[str, List[str]] = {}
+    for chunk in chunks(sorted({(p[1] or "").lower() for p in players if p[1]})):
+        for pid, name in conn.execute(
+            f"SELECT player_id, lower(full_name) FROM players WHERE lower(full_name) IN ({marks(chunk)});",
+            chunk,
+        ):
+            by_name.setdefault(name, []).append(pid)
+
+    existing = set()
+    for chunk in chunks(sorted(cricbuzz_player_id(p[0]) for p in players)):
+        existing.update(r[0] for r in conn.execute(
+            f"SELECT player_id FROM players WHERE player_id IN ({marks(chunk)});", chunk
+        ))
+
+    out: Dict[int, tuple] = {}
+    for cid, name in players:
+        own = cricbuzz_player_id(cid)
+        candidates = [p for p in by_name.get((name or "").lower(), []) if p != own]
+        if own in existing:
+            out[cid] = (own, MATCHED_EXISTING)
+        elif len(candidates) == 1:
+            out[cid] = (candidates[0], MATCHED_NAME)
+        else:
+            out[cid] = (own, MATCHED_CREATED)
+    return out
+
+
+def map_scorecard_players(conn, players: List[tuple]) -> Dict[int, str]:
+    """
+    {cricbuzz_id: local player_id} for scorecard `players` ((cricbuzz_id,
+    name, country) tuples). Unmapped ids are matched like profiles are;
+    the ones nothing matches become `cb<id>` players.
+    """
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+    mapped = local_ids(conn, (p[0] for p in players))
+    unmapped = [p for p in players if p[0] not in mapped]
+    resolved = _resolve(conn, [(p[0], p[1]) for p in unmapped])
+
+    new_players, map_rows = [], []
+    for cid, name, country in unmapped:
+        pid, how = resolved[cid]
+        if how == MATCHED_CREATED:
+            new_players.append((pid, name, country))
+            how = MATCHED_SCORECARD
+        map_rows.append((cid, pid, how, now))
+        mapped[cid] = pid
+
+    conn.executemany("""
+        INSERT INTO players (player_id, full_name, country) VALUES (?, ?, ?)
+        ON CONFLICT(player_id) DO NOTHING;
+    """, new_players)
+    conn.executemany("INSERT OR REPLACE INTO player_map VALUES (?, ?, ?, ?);", map_rows)
+    return mapped
+
+
+def map_profiles(conn, profiles: List[tuple]) -> Dict[str, int]:
+    """
+    Map the unmapped ids among `profiles` ((cricbuzz_id, name, country,
+    role, batting_style, bowling_style) tuples), creating players where
+    nothing matches. Returns new mappings by method.
+    """
+    now = time.strftime("%Y-%m-%d %H:%M:%S")
+    mapped = local_ids(conn, (p[0] for p in profiles))
+    unmapped = [p for p in profiles if p[0] not in mapped]
+    resolved = _resolve(conn, [(p[0], p[1]) for p in unmapped])
+
+    counts: Dict[str, int] = {}
+    map_rows, new_players = [], []
+    for cid, name, country, role, bat, bowl in unmapped:
+        pid, how = resolved[cid]
+        if how == MATCHED_CREATED:
+            new_players.append((pid, name, country, role, bat, bowl))
+        map_rows.append((cid, pid, how, now))
+        counts[how] = counts.get(how, 0) + 1
+    conn.executemany("""
+        INSERT INTO players (player_id, full_name, country, playing_role, batting_style, bowling_style)
+        VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(player_id) DO NOTHING;
+    """, new_players)
+    conn.executemany("INSERT OR REPLACE INTO player_map VALUES (?, ?, ?, ?);", map_rows)
+
+    # Fill in attributes the local rows lack; never overwrite local data
+    conn.executemany("""
+        UPDATE players SET
+            country = COALESCE(NULLIF(country, ''), ?),
+            playing_role = COALESCE(NULLIF(playing_role, ''), ?),
+            batting_style = COALESCE(NULLIF(batting_style, ''), ?),
+            bowling_style = COALESCE(NULLIF(bowling_style, ''), ?)
+        WHERE player_id = (SELECT player_id FROM player_map WHERE cricbuzz_id = ?)
+          AND (NULLIF(country, '') IS NULL OR NULLIF(playing_role, '') IS NULL
+               OR NULLIF(batting_style, '') IS NULL OR NULLIF(bowling_style, '') IS NULL);
+    """, [(p[2], p[3], p[4], p[5], p[0]) for p in profiles])
+    return counts
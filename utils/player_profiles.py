@@ -0,0 +1,226 @@
+"""
+Cricbuzz player profiles, stored locally.
+
+Profiles are fetched in bulk by ProfilePrefetcher through a bounded
+worker pool (one request per id even when several callers ask at once)
+and kept in `player_profiles`, with each id mapped to a local player
+(utils/player_map.py). Views read that table and only go to the API for
+profiles that are missing or older than PROFILE_MAX_AGE.
+
+Network access is injected (`fetch(cricbuzz_id) -> {"ok", "status",
+"data", "error"}`, e.g. api_handler.player_summary).
+"""
+import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from utils.db_connection import db_cursor, read_connection
+from utils.player_map import PLAYER_PREFIX, chunks, map_profiles, marks
+
+PROFILE_MAX_AGE = 7 * 24 * 3600
+DEFAULT_WORKERS = 4
+
+Fetch = Callable[[int], Dict[str, Any]]
+
+
+@dataclass
+class PrefetchReport:
+    requested: int = 0
+    fresh: int = 0               # already stored and recent enough
+    fetched: int = 0
+    failed: Dict[int, str] = field(default_factory=dict)
+    mapped: Dict[str, int] = field(default_factory=dict)   # matched_by -> count
+    seconds: float = 0.0
+
+
+# -------------------------------
+# Local store
+# -------------------------------
+def cricbuzz_id_for(player_id: str) -> Optional[int]:
+    with read_connection() as conn:
+        row = conn.execute(
+            "SELECT cricbuzz_id FROM player_map WHERE player_id = ? LIMIT 1;", (player_id,)
+        ).fetchone()
+    if row:
+        return row[0]
+    if player_id.startswith(PLAYER_PREFIX) and player_id[len(PLAYER_PREFIX):].isdigit():
+        return int(player_id[len(PLAYER_PREFIX):])
+    return None
+
+
+def _profile_fields(cricbuzz_id: int, data: Dict[str, Any]) -> tuple:
+    return (
+        cricbuzz_id,
+        data.get("name"),
+        data.get("intlTeam"),
+        data.get("role"),
+        data.get("bat"),
+        data.get("bowl"),
+        json.dumps(data, separators=(",", ":")),
+        time.time(),
+    )
+
+
+def save_profiles(profiles: Dict[int, Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Store fetched profiles and map any unmapped ids, in one transaction.
+    Returns how many ids were newly mapped, by method.
+    """
+    if not profiles:
+        return {}
+    rows = [_profile_fields(cid, data) for cid, data in profiles.items()]
+    with db_cursor() as cur:
+        cur.executemany("""
+            INSERT INTO player_profiles (cricbuzz_id, name, country, role, batting_style,
+                                         bowling_style, payload, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(cricbuzz_id) DO UPDATE SET name = excluded.name, country = excluded.country,
+                role = excluded.role, batting_style = excluded.batting_style,
+                bowling_style = excluded.bowling_style, payload = excluded.payload,
+                fetched_at = excluded.fetched_at;
+        """, rows)
+        return map_profiles(cur, [r[:6] for r in rows])
+
+
+def stored_profiles(cricbuzz_ids: Iterable[int], max_age: Optional[float] = None) -> Dict[int, Dict[str, Any]]:
+    """
+    {cricbuzz_id: profile payload} from the local store; with `max_age`,
+    only profiles fetched within that many seconds.
+    """
+    cutoff = time.time() - max_age if max_age is not None else 0
+    out: Dict[int, Dict[str, Any]] = {}
+    with read_connection() as conn:
+        for chunk in chunks(sorted({int(i) for i in cricbuzz_ids})):
+            rows = conn.execute(
+                f"SELECT cricbuzz_id, payload FROM player_profiles "
+                f"WHERE cricbuzz_id IN ({marks(chunk)}) AND fetched_at >= ?;",
+                chunk + [cutoff],
+            )
+            out.update({cid: json.loads(payload) for cid, payload in rows})
+    return out
+
+
+def known_cricbuzz_ids() -> List[int]:
+    """
+    Every Cricbuzz player id the DB knows of: mapped ones and the `cb<id>`
+    players written by feed ingestion.
+    """
+    with read_connection() as conn:
+        rows = conn.execute(f"""
+            SELECT cricbuzz_id FROM player_map
+            UNION
+            SELECT CAST(substr(player_id, {len(PLAYER_PREFIX) + 1}) AS INTEGER) FROM players
+            WHERE player_id LIKE '{PLAYER_PREFIX}%'
+              AND substr(player_id, {len(PLAYER_PREFIX) + 1}) GLOB '[0-9]*';
+        """).fetchall()
+    return [r[0] for r in rows]
+
+
+def ids_from_rankings(payload: Dict[str, Any]) -> List[int]:
+    ids = []
+    for row in (payload or {}).get("rank") or []:
+        try:
+            ids.append(int(row.get("id")))
+        except (TypeError, ValueError):
+            continue
+    return ids
+
+
+# -------------------------------
+# Prefetcher
+# -------------------------------
+class ProfilePrefetcher:
+    """
+    Bounded pool for profile fetches. Concurrent requests for the same id
+    share one in-flight call.
+    """
+
+    def __init__(self, fetch: Fetch, workers: int = DEFAULT_WORKERS):
+        self._fetch = fetch
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="profile-prefetch")
+        self._inflight: Dict[int, Future] = {}
+        self._lock = threading.Lock()
+        self.workers = workers
+        self.last_report: Optional[PrefetchReport] = None
+
+    def _submit(self, cricbuzz_id: int) -> Future:
+        with self._lock:
+            future = self._inflight.get(cricbuzz_id)
+            if future is None:
+                future = self._pool.submit(self._fetch, cricbuzz_id)
+                self._inflight[cricbuzz_id] = future
+                future.add_done_callback(lambda _, cid=cricbuzz_id: self._done(cid))
+            return future
+
+    def _done(self, cricbuzz_id: int) -> None:
+        with self._lock:
+            self._inflight.pop(cricbuzz_id, None)
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._inflight)
+
+    def stats(self) -> Dict[str, Any]:
+        last = asdict(self.last_report) if self.last_report else None
+        if last:
+            last["failed"] = len(last["failed"])
+        return {"workers": self.workers, "in_flight": self.in_flight(), "last_prefetch": last}
+
+    def prefetch(self, cricbuzz_ids: Iterable[int], max_age: float = PROFILE_MAX_AGE,
+                 timeout: Optional[float] = None) -> PrefetchReport:
+        """
+        Fetch and store every profile not already stored within `max_age`.
+        Blocks until the fetches finish (or `timeout`).
+        """
+        t0 = time.perf_counter()
+        ids = sorted({int(i) for i in cricbuzz_ids})
+        report = PrefetchReport(requested=len(ids))
+        fresh = stored_profiles(ids, max_age)
+        report.fresh = len(fresh)
+
+        futures = {cid: self._submit(cid) for cid in ids if cid not in fresh}
+        wait(futures.values(), timeout=timeout)
+
+        profiles: Dict[int, Dict[str, Any]] = {}
+        for cid, future in futures.items():
+            if not future.done():
+                report.failed[cid] = "still running"
+                continue
+            try:
+                res = future.result()
+            except Exception as exc:
+                report.failed[cid] = str(exc)
+                continue
+            if res.get("ok") and isinstance(res.get("data"), dict) and res["data"].get("name"):
+                profiles[cid] = res["data"]
+            else:
+                report.failed[cid] = str(res.get("error") or res.get("status"))
+
+        report.mapped = save_profiles(profiles)
+        report.fetched = len(profiles)
+        report.seconds = round(time.perf_counter() - t0, 3)
+        self.last_report = report
+        return report
+
+    def prefetch_async(self, cricbuzz_ids: Iterable[int], max_age: float = PROFILE_MAX_AGE) -> threading.Thread:
+        """
+        prefetch() on a background thread (for pages that shouldn't wait).
+        """
+        thread = threading.Thread(target=self.prefetch, args=(list(cricbuzz_ids), max_age),
+                                  name="profile-prefetch-batch", daemon=True)
+        thread.start()
+        return thread
+
+    def profile(self, cricbuzz_id: int, max_age: float = PROFILE_MAX_AGE) -> Optional[Dict[str, Any]]:
+        """
+        One profile from the local store, fetched first when missing or
+        stale. A stale copy is returned when the fetch fails.
+        """
+        fresh = stored_profiles([cricbuzz_id], max_age)
+        if cricbuzz_id in fresh:
+            return fresh[cricbuzz_id]
+        self.prefetch([cricbuzz_id], max_age)
+        return stored_profiles([cricbuzz_id]).get(cricbuzz_id)
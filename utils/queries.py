@@ -129,37 +129,21 @@ QUERIES = {
         "title": "All-rounders with 1000+ runs and 50+ wickets",
         "level": "Intermediate",
         "query": """
-           WITH batting AS (
-                SELECT
-                    player_id,
-                    format,
-                    SUM(runs) AS total_runs
-                FROM batting_stats
-                GROUP BY player_id, format
-            ),
-            bowling AS (
-                SELECT
-                    player_id,
-                    format,
-                    SUM(wickets) AS total_wickets
-                FROM bowling_stats
-                GROUP BY player_id, format
-            )
+            -- Reads the trigger-maintained summaries (utils/aggregates.py)
             SELECT
                 p.full_name AS player_name,
-                b.total_runs,
-                w.total_wickets,
-                b.format
+                b.runs_sum AS total_runs,
+                w.wickets_sum AS total_wickets,
+                NULLIF(b.format, '') AS format
             FROM players p
-            JOIN batting b ON p.player_id = b.player_id
-            JOIN bowling w 
-                ON b.player_id = w.player_id 
+            JOIN agg_batting b ON p.player_id = b.player_id
+            JOIN agg_bowling w
+                ON b.player_id = w.player_id
                 AND b.format = w.format
             WHERE p.playing_role = 'Allrounder'
-            AND b.total_runs > 1000
-            AND w.total_wickets > 50
-            ORDER BY b.total_runs DESC;
-
+            AND b.runs_sum > 1000
+            AND w.wickets_sum > 50
+            ORDER BY b.runs_sum DESC;
         """
     },
 
@@ -316,19 +300,15 @@ QUERIES = {
         "title": "Impact of winning the toss on match outcomes",
         "level": "Advanced",
         "query": """
+        -- Reads the trigger-maintained agg_toss summary (utils/aggregates.py)
         SELECT
-            md.toss_decision,
-            COUNT(*) AS total_matches,
-            SUM(CASE WHEN md.toss_winner = m.winning_team THEN 1 ELSE 0 END) AS toss_and_match_wins,
-            ROUND(
-                (SUM(CASE WHEN md.toss_winner = m.winning_team THEN 1 ELSE 0 END) * 100.0)
-                / COUNT(*),
-                2
-            ) AS win_percentage
-        FROM matches m
-        JOIN match_details md ON m.match_id = md.match_id
-        GROUP BY md.toss_decision;
-
+            NULLIF(toss_decision, '') AS toss_decision,
+            total_matches,
+            toss_and_match_wins,
+            ROUND((toss_and_match_wins * 100.0) / total_matches, 2) AS win_percentage
+        FROM agg_toss
+        WHERE total_matches > 0
+        ORDER BY toss_decision;
         """
     },
 
@@ -379,15 +359,15 @@ QUERIES = {
         "title": "Matches played and batting average by format",
         "level": "Advanced",
         "query": """
+            -- Reads the trigger-maintained agg_batting summary (utils/aggregates.py)
             SELECT
                 p.full_name AS player_name,
-                b.format,
-                COUNT(DISTINCT b.match_id) AS matches_played,
-                ROUND(AVG(b.runs), 2) AS batting_average
-            FROM batting_stats b
+                NULLIF(b.format, '') AS format,
+                b.matches AS matches_played,
+                ROUND(CAST(b.runs_sum AS REAL) / NULLIF(b.runs_n, 0), 2) AS batting_average
+            FROM agg_batting b
             JOIN players p ON b.player_id = p.player_id
-            GROUP BY p.player_id, b.format
-            HAVING COUNT(DISTINCT b.match_id) >= 20
+            WHERE b.matches >= 20
             ORDER BY player_name, b.format;
         """
     },
@@ -396,20 +376,21 @@ QUERIES = {
         "title": "Composite player performance ranking",
         "level": "Advanced",
         "query": """
+            -- Reads the trigger-maintained summaries (utils/aggregates.py)
             WITH batting AS (
                 SELECT
                     player_id,
-                    SUM(runs) * 0.01 +
-                    AVG(strike_rate) * 0.3 AS batting_points
-                FROM batting_stats
+                    SUM(runs_sum) * 0.01 +
+                    (SUM(sr_sum) / NULLIF(SUM(sr_n), 0)) * 0.3 AS batting_points
+                FROM agg_batting
                 GROUP BY player_id
             ),
             bowling AS (
                 SELECT
                     player_id,
-                    SUM(wickets) * 2 +
-                    (6 - AVG(economy_rate)) * 2 AS bowling_points
-                FROM bowling_stats
+                    SUM(wickets_sum) * 2 +
+                    (6 - SUM(econ_sum) / NULLIF(SUM(econ_n), 0)) * 2 AS bowling_points
+                FROM agg_bowling
                 GROUP BY player_id
             )
             SELECT
@@ -0,0 +1,143 @@
+import os
+import threading
+from typing import Optional, Sequence, Tuple
+
+from utils.columnar import MIRROR
+from utils.db_connection import data_version, read_connection
+from utils.query_governor import governed
+from utils.response_cache import FRESH, ResponseCache
+from utils.sql_pager import PAGE_SIZE, Page, fetch_page
+
+# Entries only die by eviction or a data change; the TTL is just a backstop
+RESULT_TTL = 3600
+
+QUERY_CACHE = ResponseCache(
+    max_bytes=int(os.environ.get("SQL_CACHE_MB", "64")) * 1024 * 1024
+)
+
+_last_version = None
+_version_lock = threading.Lock()
+
+
+def normalize_sql(sql: str) -> str:
+    """
+    Drop comments, collapse whitespace and trailing semicolons outside of
+    string literals, so cosmetic edits to a preset share one cache entry.
+    """
+    out = []
+    i, n = 0, len(sql)
+    pending_space = False
+
+    while i < n:
+        ch = sql[i]
+
+        if ch in ("'", '"'):
+            end = i + 1
+            while end < n:
+                if sql[end] == ch:
+                    if end + 1 < n and sql[end + 1] == ch:   # escaped quote
+                        end += 2
+                        continue
+                    break
+                end += 1
+            if pending_space and out:
+                out.append(" ")
+            pending_space = False
+            out.append(sql[i:end + 1])
+            i = end + 1
+            continue
+
+        if sql.startswith("--", i):
+            nl = sql.find("\n", i)
+            i = n if nl == -1 else nl
+            pending_space = True
+            continue
+
+        if sql.startswith("/*", i):
+            close = sql.find("*/", i + 2)
+            i = n if close == -1 else close + 2
+            pending_space = True
+            continue
+
+        if ch.isspace():
+            pending_space = True
+            i += 1
+            continue
+
+        if pending_space and out:
+            out.append(" ")
+        pending_space = False
+        out.append(ch)
+        i += 1
+
+    return "".join(out).rstrip("; ")
+
+
+def is_read_only(normalized: str) -> bool:
+    head = normalized.split(" ", 1)[0].upper()
+    return head in ("SELECT", "WITH", "VALUES")
+
+
+def _current_version() -> tuple:
+    """
+    Read the data version, dropping every cached result when it moved.
+    """
+    global _last_version
+
+    version = data_version()
+    with _version_lock:
+        if version != _last_version:
+            if _last_version is not None:
+                QUERY_CACHE.invalidate()
+            _last_version = version
+    return version
+
+
+def cached_value(sql: str, params: Sequence = ()) -> list:
+    """
+    All rows of a small app-owned query (counts, option lists) through the
+    shared result cache, on a regular pooled reader.
+    """
+    key = ("value", normalize_sql(sql), tuple(params), _current_version())
+    rows, state = QUERY_CACHE.get(key)
+    if state == FRESH:
+        return rows
+
+    with read_connection() as conn:
+        rows = conn.execute(sql, tuple(params)).fetchall()
+
+    QUERY_CACHE.set(key, rows, ttl=RESULT_TTL, stale_ttl=0, size=64 + 32 * len(rows))
+    return rows
+
+
+def cached_page(sql: str, page_size: int = PAGE_SIZE, key_columns: Sequence[str] = (),
+                after: Optional[tuple] = None, start: int = 0,
+                start_bytes: int = 0) -> Tuple[Page, bool]:
+    """
+    One page of `sql` (utils/sql_pager.py) through the shared result cache.
+
+    Returns (page, from_cache). Only the requested page is fetched, so an
+    unbounded SELECT costs one page of memory, not the whole result.
+    Eligible queries are answered by the columnar mirror (utils/columnar.py).
+    """
+    normalized = normalize_sql(sql)
+    read_only = is_read_only(normalized)
+
+    if not read_only:
+        with governed(normalized) as q:
+            return fetch_page(q.conn, normalized, False, page_size), False
+
+    key = ("page", normalized, page_size, tuple(key_columns), after, start, start_bytes,
+           _current_version())
+    page, state = QUERY_CACHE.get(key)
+    if state == FRESH:
+        return page, True
+
+    page = MIRROR.try_page(normalized, page_size, key_columns, after, start, start_bytes)
+    if page is None:
+        with governed(normalized) as q:
+            page = fetch_page(q.conn, normalized, True, page_size, key_columns, after, start,
+                              start_bytes=start_bytes)
+
+    QUERY_CACHE.set(key, page, ttl=RESULT_TTL, stale_ttl=0, size=page.nbytes + 256)
+    return page, False
@@ -0,0 +1,162 @@
+"""
+Limits around user-written SQL (SQL Analytics).
+
+- runs on read-only connections (db_connection.read_only_connection)
+- each statement is interrupted once it passes a deadline
+- statements whose plan visits many rows (big scans, or loops nested
+  in them) count as heavy, and only a few heavy ones may run at a time
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from utils.db_connection import read_only_connection
+from utils.query_profiler import query_plan, real_tables, table_aliases
+
+QUERY_TIMEOUT_S = float(os.environ.get("SQL_QUERY_TIMEOUT", "15"))
+MAX_HEAVY_QUERIES = int(os.environ.get("SQL_MAX_HEAVY_QUERIES", "2"))
+
+# Estimated rows visited (scans, times index fan-out of nested lookups)
+HEAVY_SCAN_ROWS = 100_000
+
+_SEARCH_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+) \(([^)]*)\)")
+
+# How long a heavy query waits for a free slot before it is turned away
+HEAVY_WAIT_S = 5.0
+
+# The deadline is checked every N virtual-machine instructions
+CHECK_EVERY_STEPS = 10_000
+
+_heavy_slots = threading.BoundedSemaphore(MAX_HEAVY_QUERIES)
+_stats_lock = threading.Lock()
+_stats = {"queries": 0, "heavy": 0, "running_heavy": 0, "cancelled": 0, "rejected": 0}
+
+
+class QueryCancelled(Exception):
+    def __init__(self, elapsed: float, timeout: float):
+        self.elapsed = elapsed
+        self.timeout = timeout
+        super().__init__(f"Query cancelled after {elapsed:.1f} s (limit {timeout:g} s).")
+
+
+class QueryRejected(Exception):
+    pass
+
+
+@dataclass
+class GovernedQuery:
+    conn: sqlite3.Connection
+    deadline: float
+    heavy: bool
+
+
+def _bump(key: str, delta: int = 1) -> None:
+    with _stats_lock:
+        _stats[key] += delta
+
+
+def _table_rows(conn: sqlite3.Connection, table: str) -> int:
+    # MAX(rowid) is a single B-tree seek; close enough to COUNT(*) here
+    try:
+        return conn.execute(f'SELECT MAX(rowid) FROM "{table}";').fetchone()[0] or 0
+    except sqlite3.Error:
+        return 0
+
+
+def _index_fanout(conn: sqlite3.Connection, index: str, equalities: int) -> int:
+    """
+    Average rows per lookup on the first `equalities` index columns, from
+    ANALYZE statistics (1 when there are none).
+    """
+    try:
+        row = conn.execute("SELECT stat FROM sqlite_stat1 WHERE idx = ?;", (index,)).fetchone()
+    except sqlite3.Error:
+        return 1
+    if not row:
+        return 1
+    stat = [int(x) for x in row[0].split() if x.isdigit()]
+    return stat[equalities] if 0 < equalities < len(stat) else 1
+
+
+def estimate_rows(conn: sqlite3.Connection, sql: str) -> int:
+    """
+    Rough rows visited by `sql`'s plan. Steps under the same plan node are
+    nested loops (multiply: scan size, then per-lookup fan-out); separate
+    subqueries/CTEs run one after another (add up).
+    """
+    aliases = table_aliases(sql, real_tables(conn))
+    per_parent = {}
+    for _, parent, detail in query_plan(conn, sql):
+        parts = detail.split()
+        if len(parts) < 2:
+            continue
+        if parts[0] == "SCAN":
+            table = aliases.get(parts[1])
+            rows = _table_rows(conn, table) if table else 1
+        elif parts[0] == "SEARCH":
+            match = _SEARCH_INDEX.search(detail)
+            rows = _index_fanout(conn, match.group(1), match.group(2).count("=")) if match else 1
+        else:
+            continue
+        per_parent[parent] = per_parent.get(parent, 1) * max(rows, 1)
+    return sum(per_parent.values())
+
+
+def is_heavy(conn: sqlite3.Connection, sql: str) -> bool:
+    """
+    Statements that can't be planned are left to fail on execution.
+    """
+    try:
+        return estimate_rows(conn, sql) >= HEAVY_SCAN_ROWS
+    except sqlite3.Error:
+        return False
+
+
+@contextmanager
+def governed(sql: str, timeout: float = QUERY_TIMEOUT_S):
+    """
+    Read-only connection for running `sql` under the limits above.
+
+    Yields a GovernedQuery. Raises QueryRejected when no heavy slot frees
+    up in time, and QueryCancelled when the deadline interrupts the query.
+    """
+    with read_only_connection() as conn:
+        heavy = is_heavy(conn, sql)
+        _bump("queries")
+
+        if heavy:
+            if not _heavy_slots.acquire(timeout=HEAVY_WAIT_S):
+                _bump("rejected")
+                raise QueryRejected(
+                    f"{MAX_HEAVY_QUERIES} heavy queries are already running. "
+                    "Try again in a moment, or add filters/LIMIT."
+                )
+            _bump("heavy")
+            _bump("running_heavy")
+
+        started = time.perf_counter()
+        deadline = started + timeout
+        conn.set_progress_handler(lambda: int(time.perf_counter() > deadline), CHECK_EVERY_STEPS)
+        try:
+            yield GovernedQuery(conn=conn, deadline=deadline, heavy=heavy)
+        except sqlite3.OperationalError as exc:
+            if "interrupted" in str(exc) and time.perf_counter() > deadline:
+                _bump("cancelled")
+                raise QueryCancelled(time.perf_counter() - started, timeout) from exc
+            raise
+        finally:
+            conn.set_progress_handler(None, 0)
+            if heavy:
+                _bump("running_heavy", -1)
+                _heavy_slots.release()
+
+
+def stats() -> dict:
+    with _stats_lock:
+        snapshot = dict(_stats)
+    snapshot.update({"timeout_s": QUERY_TIMEOUT_S, "max_heavy": MAX_HEAVY_QUERIES})
+    return snapshot
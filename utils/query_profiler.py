@@ -0,0 +1,239 @@
+import re
+import sqlite3
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.sql_pager import FETCH_CHUNK, MAX_RESULT_ROWS
+
+# The progress handler fires every N virtual-machine instructions
+VM_STEP_GRANULARITY = 1000
+
+_TABLE_REF = re.compile(
+    r"(?:\b(?:FROM|JOIN)\s+|,\s*)([A-Za-z_]\w*)"
+    r"(?:\s+(?:AS\s+)?(?!(?:FROM|WHERE|JOIN|ON|LEFT|INNER|CROSS|NATURAL|GROUP|ORDER|LIMIT|USING)\b)"
+    r"([A-Za-z_]\w*))?",
+    re.IGNORECASE,
+)
+# [alias.]column [+ n] <op> (alias.column | anything else)
+_PREDICATE = re.compile(
+    r"(?:\b([A-Za-z_]\w*)\.)?\b([A-Za-z_]\w*)\s*(?:[-+*/]\s*[\w.]+\s*)?"
+    r"(=|==|<>|!=|<=|>=|<|>|\bIN\b|\bBETWEEN\b|\bLIKE\b)\s*"
+    r"(?:([A-Za-z_]\w*)\.([A-Za-z_]\w*)\b)?",
+    re.IGNORECASE,
+)
+_CLAUSE = re.compile(
+    r"\b(WHERE|ON|HAVING|GROUP\s+BY|ORDER\s+BY|LIMIT|SELECT|FROM|JOIN|UNION|OVER|WINDOW)\b",
+    re.IGNORECASE,
+)
+_EQUALITY = {"=", "==", "IN"}
+_RESERVED = {
+    "ON", "WHERE", "JOIN", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "GROUP",
+    "ORDER", "LIMIT", "HAVING", "USING", "UNION", "NATURAL", "SELECT", "AND", "OR",
+}
+
+
+# -------------------------------
+# Plan
+# -------------------------------
+
+def query_plan(conn: sqlite3.Connection, sql: str) -> List[Tuple[int, int, str]]:
+    """
+    EXPLAIN QUERY PLAN rows as (id, parent, detail).
+    """
+    rows = conn.execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+    return [(r[0], r[1], r[3]) for r in rows]
+
+
+def format_plan(plan: List[Tuple[int, int, str]]) -> str:
+    depth = {0: -1}
+    lines = []
+    for node_id, parent, detail in plan:
+        depth[node_id] = depth.get(parent, -1) + 1
+        lines.append("  " * depth[node_id] + "└─ " + detail)
+    return "\n".join(lines)
+
+
+# -------------------------------
+# Full-scan detection & index advice
+# -------------------------------
+
+def real_tables(conn: sqlite3.Connection) -> set:
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type = 'table';")
+    return {r[0] for r in rows}
+
+
+def table_aliases(sql: str, tables: set) -> Dict[str, str]:
+    """
+    Map every name a table is referred to by (itself or its alias) to it.
+    """
+    mapping = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        if table not in tables:
+            continue
+        mapping[table] = table
+        if alias and alias.upper() not in _RESERVED:
+            mapping[alias] = table
+    return mapping
+
+
+def full_scans(plan: List[Tuple[int, int, str]], aliases: Dict[str, str]) -> List[str]:
+    """
+    Base tables read with a plain SCAN (no index at all).
+    """
+    scanned = []
+    for _, _, detail in plan:
+        parts = detail.split()
+        if len(parts) < 2 or parts[0] != "SCAN" or "INDEX" in detail:
+            continue
+        table = aliases.get(parts[1])
+        if table and table not in scanned:
+            scanned.append(table)
+    return scanned
+
+
+def _indexed_prefixes(conn: sqlite3.Connection, table: str) -> List[Tuple[str, ...]]:
+    prefixes = []
+    for idx in conn.execute(f"PRAGMA index_list('{table}');").fetchall():
+        cols = conn.execute(f"PRAGMA index_info('{idx[1]}');").fetchall()
+        prefixes.append(tuple(c[2] for c in sorted(cols)))
+    for col in conn.execute(f"PRAGMA table_info('{table}');").fetchall():
+        if col[5] == 1 and col[2].upper() == "INTEGER":      # rowid alias
+            prefixes.append((col[1],))
+    return prefixes
+
+
+def _conditions(sql: str) -> str:
+    """
+    Text of the WHERE and ON clauses only.
+    """
+    parts = _CLAUSE.split(sql)
+    keep = [
+        parts[i + 1]
+        for i in range(1, len(parts) - 1, 2)
+        if parts[i].upper() in ("WHERE", "ON")
+    ]
+    return " ".join(keep)
+
+
+def suggest_indexes(conn: sqlite3.Connection, sql: str, tables: List[str],
+                    aliases: Dict[str, str]) -> List[str]:
+    """
+    For each scanned table, propose an index from its WHERE/ON predicates:
+    equality filters first, then one range filter. Without filters, join
+    columns are used, skipping joins whose other side is already indexed.
+    """
+    single_table = len(set(aliases.values())) == 1
+    conditions = _conditions(sql)
+    suggestions = []
+
+    for table in tables:
+        columns = {c[1] for c in conn.execute(f"PRAGMA table_info('{table}');")}
+        equality: List[str] = []
+        ranges: List[str] = []
+        joins: List[str] = []
+
+        for qualifier, column, op, rhs_alias, rhs_column in _PREDICATE.findall(conditions):
+            if column not in columns:
+                continue
+            if qualifier and aliases.get(qualifier) != table:
+                continue
+            if not qualifier and not single_table:
+                continue
+
+            other = aliases.get(rhs_alias) if rhs_alias else None
+            if other is not None:
+                already_indexed = other != table and any(
+                    prefix[0] == rhs_column for prefix in _indexed_prefixes(conn, other)
+                )
+                if not already_indexed and column not in joins:
+                    joins.append(column)
+            elif op.upper() in _EQUALITY:
+                if column not in equality:
+                    equality.append(column)
+            elif column not in ranges:
+                ranges.append(column)
+
+        wanted = equality + ranges[:1] if (equality or ranges) else joins
+        if not wanted:
+            continue
+        if any(prefix[:len(wanted)] == tuple(wanted) for prefix in _indexed_prefixes(conn, table)):
+            continue
+
+        name = f"idx_{table}_{'_'.join(wanted)}"
+        suggestions.append(f"CREATE INDEX IF NOT EXISTS {name} ON {table}({', '.join(wanted)});")
+
+    return suggestions
+
+
+# -------------------------------
+# Profile
+# -------------------------------
+
+def profile_query(conn: sqlite3.Connection, sql: str,
+                  deadline: Optional[float] = None,
+                  max_rows: int = MAX_RESULT_ROWS) -> Dict[str, Any]:
+    """
+    Run `sql` once and report plan, timings, rows and VM steps.
+
+    SQLite's Python driver doesn't expose prepare on its own, so
+    prepare_ms is the time to compile the statement via EXPLAIN,
+    execute_ms is the first step (up to the first row) minus that, and
+    fetch_ms covers stepping through the remaining rows.
+
+    Rows are counted, not kept, and stepping stops after `max_rows`
+    (the result ceiling of utils/sql_pager.py); `rows_truncated` is then
+    set and the timings cover only the rows read.
+
+    The step counter replaces any progress handler on `conn`; pass the
+    governor's `deadline` (perf_counter time) to keep it enforced.
+    """
+    sql = sql.strip().rstrip(";")
+    plan = query_plan(conn, sql)
+
+    steps = [0]
+
+    def _count() -> int:
+        steps[0] += VM_STEP_GRANULARITY
+        return int(deadline is not None and time.perf_counter() > deadline)
+
+    t0 = time.perf_counter()
+    conn.execute("EXPLAIN " + sql).fetchall()
+    t1 = time.perf_counter()
+
+    conn.set_progress_handler(_count, VM_STEP_GRANULARITY)
+    try:
+        t2 = time.perf_counter()
+        cur = conn.execute(sql)
+        t3 = time.perf_counter()
+        rows, truncated = 0, False
+        while True:
+            chunk = cur.fetchmany(FETCH_CHUNK)
+            if not chunk:
+                break
+            rows += len(chunk)
+            if rows >= max_rows:
+                truncated = rows > max_rows or cur.fetchone() is not None
+                rows = min(rows, max_rows)
+                break
+        t4 = time.perf_counter()
+    finally:
+        conn.set_progress_handler(None, 0)
+
+    prepare_ms = (t1 - t0) * 1000
+    tables = real_tables(conn)
+    aliases = table_aliases(sql, tables)
+    scans = full_scans(plan, aliases)
+
+    return {
+        "plan": plan,
+        "plan_text": format_plan(plan),
+        "prepare_ms": round(prepare_ms, 3),
+        "execute_ms": round(max(0.0, (t3 - t2) * 1000 - prepare_ms), 3),
+        "fetch_ms": round((t4 - t3) * 1000, 3),
+        "total_ms": round((t4 - t2) * 1000, 3),
+        "rows": rows,
+        "rows_truncated": truncated,
+        "vm_steps": steps[0],
+        "full_scans": scans,
+        "suggested_indexes": suggest_indexes(conn, sql, scans, aliases),
+    }
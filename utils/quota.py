@@ -0,0 +1,124 @@
+import threading
+import time
+from typing import Any, Dict
+
+# Request priorities, highest first
+PRIORITY_LIVE = 0        # live-score refreshes
+PRIORITY_NORMAL = 1      # rankings, top stats, player lookups
+PRIORITY_ADHOC = 2       # API Tester and other manual calls
+
+PRIORITY_NAMES = {
+    PRIORITY_LIVE: "live",
+    PRIORITY_NORMAL: "normal",
+    PRIORITY_ADHOC: "adhoc",
+}
+
+# Fraction of each bucket a priority must leave untouched for higher ones
+DEFAULT_RESERVES = {PRIORITY_LIVE: 0.0, PRIORITY_NORMAL: 0.1, PRIORITY_ADHOC: 0.3}
+
+# Seconds a request may wait for tokens before it is shed
+DEFAULT_MAX_WAIT = {PRIORITY_LIVE: 5.0, PRIORITY_NORMAL: 1.0, PRIORITY_ADHOC: 0.0}
+
+
+class TokenBucket:
+    """
+    `capacity` tokens refilled continuously over `period` seconds.
+    Not thread-safe on its own; QuotaScheduler holds the lock.
+    """
+
+    def __init__(self, capacity: int, period: float):
+        self.capacity = max(1, capacity)
+        self.rate = self.capacity / period
+        self.tokens = float(self.capacity)
+        self.consumed = 0
+        self._updated = time.monotonic()
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def take(self, n: float = 1) -> None:
+        self.tokens -= n
+        self.consumed += n
+
+    def seconds_until(self, level: float) -> float:
+        missing = level - self.tokens
+        return 0.0 if missing <= 0 else missing / self.rate
+
+
+class QuotaScheduler:
+    """
+    Per-minute and per-day token buckets in front of every outgoing call.
+
+    Lower priorities have to leave a reserve in both buckets, so live
+    refreshes keep flowing when rankings or ad-hoc calls are shed.
+    """
+
+    def __init__(
+        self,
+        per_minute: int,
+        per_day: int,
+        reserves: Dict[int, float] = None,
+        max_wait: Dict[int, float] = None
+    ):
+        self.minute = TokenBucket(per_minute, 60)
+        self.day = TokenBucket(per_day, 86400)
+        self.reserves = reserves or DEFAULT_RESERVES
+        self.max_wait = max_wait or DEFAULT_MAX_WAIT
+        self._lock = threading.Lock()
+        self.granted = {p: 0 for p in PRIORITY_NAMES}
+        self.shed = {p: 0 for p in PRIORITY_NAMES}
+
+    def acquire(self, priority: int = PRIORITY_NORMAL) -> bool:
+        """
+        Take one token, waiting up to the priority's max wait.
+        Returns False when the request should be shed.
+        """
+        deadline = time.monotonic() + self.max_wait.get(priority, 0.0)
+        reserve = self.reserves.get(priority, 0.0)
+
+        while True:
+            with self._lock:
+                wait = 0.0
+                for bucket in (self.minute, self.day):
+                    bucket.refill()
+                    wait = max(wait, bucket.seconds_until(1 + reserve * bucket.capacity))
+
+                if wait == 0.0:
+                    self.minute.take()
+                    self.day.take()
+                    self.granted[priority] = self.granted.get(priority, 0) + 1
+                    return True
+
+                remaining = deadline - time.monotonic()
+                if wait > remaining:
+                    self.shed[priority] = self.shed.get(priority, 0) + 1
+                    return False
+
+            time.sleep(min(wait, 0.25))
+
+    def consume(self, n: int) -> None:
+        """
+        Charge extra calls made outside acquire(), e.g. HTTP retries.
+        """
+        if n <= 0:
+            return
+        with self._lock:
+            for bucket in (self.minute, self.day):
+                bucket.refill()
+                bucket.take(n)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            for bucket in (self.minute, self.day):
+                bucket.refill()
+            return {
+                "per_minute_limit": self.minute.capacity,
+                "per_minute_remaining": round(max(0.0, self.minute.tokens), 1),
+                "per_day_limit": self.day.capacity,
+                "per_day_remaining": round(max(0.0, self.day.tokens), 1),
+                "calls_made": int(self.day.consumed),
+                "granted": {PRIORITY_NAMES[p]: n for p, n in self.granted.items()},
+                "shed": {PRIORITY_NAMES[p]: n for p, n in self.shed.items()},
+            }
@@ -0,0 +1,196 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Lookup outcomes returned by ResponseCache.get
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+def make_key(path: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+    """
+    Cache key on (path, params) with params order- and type-normalized,
+    so {"a": 1, "b": "x"} and {"b": "x", "a": "1"} share an entry.
+    """
+    items = tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+    return (path, items)
+
+
+def _estimate_size(value: Any) -> int:
+    try:
+        return len(json.dumps(value, separators=(",", ":"), default=str))
+    except (TypeError, ValueError):
+        return 1024
+
+
+class _Entry:
+    __slots__ = ("value", "stored_at", "ttl", "stale_ttl", "size")
+
+    def __init__(self, value: Any, ttl: float, stale_ttl: float, size: int):
+        self.value = value
+        self.stored_at = time.time()
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.size = size
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU cache bounded by an approximate byte budget.
+
+    Entries are fresh for `ttl` seconds, then servable as stale for a further
+    `stale_ttl` seconds while a single background refresh runs.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._refreshing: set = set()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ---------- core ----------
+
+    def get(self, key: Hashable) -> Tuple[Any, str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, MISS
+
+            age = entry.age()
+            if age <= entry.ttl:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry.value, FRESH
+
+            if age <= entry.ttl + entry.stale_ttl:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                return entry.value, STALE
+
+            self._drop(key)
+            self.misses += 1
+            return None, MISS
+
+    def peek(self, key: Hashable) -> Optional[Any]:
+        """
+        Return any stored value, however old, without touching counters.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            return entry.value if entry is not None else None
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float,
+        stale_ttl: Optional[float] = None,
+        size: Optional[int] = None
+    ) -> None:
+        size = size if size is not None else _estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            self._data[key] = _Entry(
+                value, ttl, ttl if stale_ttl is None else stale_ttl, size
+            )
+            self._bytes += size
+
+            while self._bytes > self.max_bytes and self._data:
+                oldest = next(iter(self._data))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._data.clear()
+                self._bytes = 0
+            elif key in self._data:
+                self._drop(key)
+
+    def _drop(self, key: Hashable) -> None:
+        entry = self._data.pop(key)
+        self._bytes -= entry.size
+
+    # ---------- stale-while-revalidate ----------
+
+    def get_or_fetch(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Dict[str, Any]],
+        ttl: float,
+        stale_ttl: Optional[float] = None,
+        on_hit: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Serve from cache, refreshing stale entries in the background.
+        Only successful (`ok`) results are stored. `on_hit` receives
+        FRESH or STALE when the cache answered.
+        """
+        value, state = self.get(key)
+
+        if state != MISS and on_hit is not None:
+            on_hit(state)
+
+        if state == FRESH:
+            return value
+
+        if state == STALE:
+            self._refresh_async(key, fetch, ttl, stale_ttl)
+            return value
+
+        result = fetch()
+        if result.get("ok"):
+            self.set(key, result, ttl, stale_ttl)
+        return result
+
+    def _refresh_async(self, key, fetch, ttl, stale_ttl) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _run():
+            try:
+                result = fetch()
+                if result.get("ok"):
+                    self.set(key, result, ttl, stale_ttl)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_run, name="cache-revalidate", daemon=True).start()
+
+    # ---------- monitoring ----------
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (
+                    (self.hits + self.stale_hits) / lookups if lookups else 0.0
+                ),
+            }
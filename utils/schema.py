@@ -0,0 +1,152 @@
+"""
+Table definitions for the analytics database, shared by setup_db.py and
+the synthetic data generator (utils/datagen.py).
+"""
+import sqlite3
+
+from utils.search_index import DROP_SEARCH_SQL
+
+DROP_SQL = DROP_SEARCH_SQL + """
+DROP TABLE IF EXISTS schema_migrations;
+DROP TABLE IF EXISTS ingest_state;
+DROP TABLE IF EXISTS player_map;
+DROP TABLE IF EXISTS player_profiles;
+DROP TABLE IF EXISTS table_versions;
+DROP TABLE IF EXISTS agg_toss;
+DROP TABLE IF EXISTS agg_bowling;
+DROP TABLE IF EXISTS agg_batting_match;
+DROP TABLE IF EXISTS agg_batting;
+DROP TABLE IF EXISTS partnerships;
+DROP TABLE IF EXISTS fielding_stats;
+DROP TABLE IF EXISTS bowling_stats;
+DROP TABLE IF EXISTS batting_stats;
+DROP TABLE IF EXISTS match_details;
+DROP TABLE IF EXISTS player_format_stats;
+DROP TABLE IF EXISTS matches;
+DROP TABLE IF EXISTS series;
+DROP TABLE IF EXISTS venues;
+DROP TABLE IF EXISTS teams;
+DROP TABLE IF EXISTS players;
+"""
+
+# Roles the app itself writes (forms, generator); bulk imports also accept
+# any role already in `players` (utils/bulk_import.py)
+PLAYING_ROLES = ("Batsman", "Bowler", "All-rounder", "Wicket-keeper")
+
+CORE_TABLES_SQL = """
+CREATE TABLE players (
+    player_id TEXT PRIMARY KEY,
+    full_name TEXT,
+    country TEXT,
+    playing_role TEXT,
+    batting_style TEXT,
+    bowling_style TEXT
+);
+
+CREATE TABLE teams (
+    team_name TEXT PRIMARY KEY,
+    country TEXT
+);
+
+CREATE TABLE venues (
+    venue_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    venue_name TEXT,
+    city TEXT,
+    country TEXT,
+    capacity INTEGER
+);
+
+CREATE TABLE series (
+    series_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    series_name TEXT,
+    host_country TEXT,
+    match_type TEXT CHECK(match_type IN ('test','odi','t20i')),
+    start_date TEXT,
+    total_matches INTEGER
+);
+
+CREATE TABLE matches (
+    match_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    match_description TEXT,
+    team1 TEXT,
+    team2 TEXT,
+    winning_team TEXT,
+    venue_id INTEGER,
+    match_date TEXT,
+    match_status TEXT,
+    victory_margin INTEGER,
+    victory_type TEXT,
+    series_id INTEGER,
+    FOREIGN KEY (venue_id) REFERENCES venues(venue_id),
+    FOREIGN KEY (series_id) REFERENCES series(series_id)
+);
+
+CREATE TABLE match_details (
+    match_id INTEGER PRIMARY KEY,
+    format TEXT CHECK(format IN ('test','odi','t20i')),
+    toss_winner TEXT,
+    toss_decision TEXT CHECK(toss_decision IN ('bat','bowl')),
+    batting_first_team TEXT,
+    FOREIGN KEY (match_id) REFERENCES matches(match_id)
+);
+
+CREATE TABLE player_format_stats (
+    player_id TEXT,
+    format TEXT,
+    runs INTEGER,
+    centuries INTEGER,
+    high_score INTEGER,
+    average REAL,
+    strike_rate REAL,
+    FOREIGN KEY (player_id) REFERENCES players(player_id)
+);
+"""
+
+PERFORMANCE_TABLES_SQL = """
+CREATE TABLE batting_stats (
+    player_id TEXT,
+    match_id INTEGER,
+    format TEXT,
+    innings INTEGER,
+    batting_position INTEGER,
+    runs INTEGER,
+    balls INTEGER,
+    strike_rate REAL,
+    team TEXT
+);
+
+CREATE TABLE bowling_stats (
+    player_id TEXT,
+    match_id INTEGER,
+    format TEXT,
+    overs REAL,
+    wickets INTEGER,
+    economy_rate REAL
+);
+
+CREATE TABLE fielding_stats (
+    player_id TEXT,
+    match_id INTEGER,
+    catches INTEGER,
+    stumpings INTEGER,
+    run_outs INTEGER
+);
+
+CREATE TABLE partnerships (
+    match_id INTEGER,
+    innings INTEGER,
+    player1_id TEXT,
+    player2_id TEXT,
+    batting_position_start INTEGER,
+    partnership_runs INTEGER
+);
+"""
+
+
+def reset_schema(conn: sqlite3.Connection) -> None:
+    """
+    Drop every table (summaries and migration history included) and
+    recreate the empty base tables. Indexes, summary tables and triggers
+    come from apply_migrations() once the data is loaded.
+    """
+    conn.executescript(DROP_SQL + CORE_TABLES_SQL + PERFORMANCE_TABLES_SQL)
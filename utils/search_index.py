@@ -0,0 +1,61 @@
+"""
+FTS5 indexes behind local search (utils/local_search.py), applied by
+migration 7.
+
+Each searchable table gets an external-content FTS5 table with the trigram
+tokenizer (substring matching, case-insensitive), kept in sync by insert,
+delete and update triggers and backfilled with 'rebuild'.
+"""
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    kind: str
+    table: str
+    key: str
+    columns: Tuple[str, ...]        # indexed text; the first is the display name
+    detail: Tuple[str, ...] = ()    # shown next to a hit
+
+    @property
+    def fts(self) -> str:
+        return f"{self.table}_fts"
+
+
+INDEXES: Dict[str, SearchIndex] = {
+    "player": SearchIndex("player", "players", "player_id", ("full_name",),
+                          ("country", "playing_role")),
+    "venue": SearchIndex("venue", "venues", "venue_id", ("venue_name", "city"),
+                         ("city", "country")),
+    "series": SearchIndex("series", "series", "series_id", ("series_name",),
+                          ("host_country", "match_type", "start_date")),
+}
+
+
+def _fts_sql(index: SearchIndex) -> str:
+    cols = ", ".join(index.columns)
+    new = ", ".join(f"new.{c}" for c in index.columns)
+    old = ", ".join(f"old.{c}" for c in index.columns)
+    fts, table = index.fts, index.table
+    return f"""
+CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+    {cols}, content='{table}', content_rowid='rowid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS trg_fts_{table}_ins AFTER INSERT ON {table} BEGIN
+    INSERT INTO {fts} (rowid, {cols}) VALUES (new.rowid, {new});
+END;
+CREATE TRIGGER IF NOT EXISTS trg_fts_{table}_del AFTER DELETE ON {table} BEGIN
+    INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old});
+END;
+CREATE TRIGGER IF NOT EXISTS trg_fts_{table}_upd AFTER UPDATE ON {table} BEGIN
+    INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.rowid, {old});
+    INSERT INTO {fts} (rowid, {cols}) VALUES (new.rowid, {new});
+END;
+INSERT INTO {fts} ({fts}) VALUES ('rebuild');
+"""
+
+
+SEARCH_TABLES = tuple(index.table for index in INDEXES.values())
+SEARCH_SQL = "\n".join(_fts_sql(index) for index in INDEXES.values())
+DROP_SEARCH_SQL = "\n".join(f"DROP TABLE IF EXISTS {i.fts};" for i in INDEXES.values())
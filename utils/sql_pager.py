@@ -0,0 +1,173 @@
+"""
+Page-at-a-time execution of ad-hoc SQL.
+
+Rows are pulled from the cursor in small chunks and only one page is ever
+held in memory. Read-only queries are wrapped so later pages are fetched
+by keyset (rows after the last key seen, when the user picks key columns)
+or by offset, and every result stops at a hard row and byte ceiling
+(pages carry the rows and bytes shown before them); a single page is
+also capped in bytes.
+"""
+import os
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any, List, Optional, Sequence, Tuple
+
+PAGE_SIZE = int(os.environ.get("SQL_PAGE_SIZE", "500"))
+
+# Hard ceilings: rows and bytes across all pages of one result, bytes in one page
+MAX_RESULT_ROWS = int(os.environ.get("SQL_MAX_ROWS", "100000"))
+MAX_RESULT_BYTES = int(os.environ.get("SQL_MAX_RESULT_MB", "256")) * 1024 * 1024
+MAX_PAGE_BYTES = int(os.environ.get("SQL_MAX_PAGE_MB", "16")) * 1024 * 1024
+
+FETCH_CHUNK = 200
+
+LIMIT_ROWS = "rows"                  # result ended at MAX_RESULT_ROWS
+LIMIT_RESULT_BYTES = "result_bytes"  # result ended at MAX_RESULT_BYTES
+LIMIT_BYTES = "bytes"                # page cut short at MAX_PAGE_BYTES
+
+
+@dataclass
+class Page:
+    columns: List[str]
+    rows: List[tuple]
+    start: int                           # rows shown on earlier pages
+    has_more: bool
+    limit_hit: Optional[str] = None      # LIMIT_* when a ceiling cut it short
+    nbytes: int = 0
+    start_bytes: int = 0                 # bytes shown on earlier pages
+    elapsed_ms: float = 0.0
+    last_key: Optional[tuple] = None     # keyset cursor for the next page
+    pageable: bool = True                # False for statements that can't be wrapped
+    key_columns: Tuple[str, ...] = field(default_factory=tuple)
+    engine: str = "sqlite"
+    verified: Optional[bool] = None      # columnar pages: cross-checked against SQLite
+
+
+def row_bytes(row: Sequence[Any]) -> int:
+    """
+    Rough in-memory size of a row's values (payload only, no object overhead).
+    """
+    total = 0
+    for value in row:
+        if isinstance(value, (str, bytes)):
+            total += len(value)
+        else:
+            total += 8
+    return total
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def page_sql(normalized: str, page_size: int, key_columns: Sequence[str] = (),
+             after: Optional[tuple] = None, offset: int = 0,
+             base_params: Sequence[Any] = ()) -> Tuple[str, list]:
+    """
+    Wrap a (normalized, single) SELECT so it returns one page plus one
+    look-ahead row. With key columns the page is ordered by them and
+    starts after `after`; otherwise it starts at `offset`. `base_params`
+    bind the SELECT's own placeholders.
+    """
+    sql = f"SELECT * FROM ({normalized}) AS _q"
+    params: list = list(base_params)
+
+    if key_columns:
+        keys = ", ".join(_quote(c) for c in key_columns)
+        if after is not None:
+            marks = ", ".join("?" for _ in key_columns)
+            sql += f" WHERE ({keys}) > ({marks})"
+            params.extend(after)
+        sql += f" ORDER BY {keys} LIMIT ?"
+        params.append(page_size + 1)
+    else:
+        sql += " LIMIT ? OFFSET ?"
+        params.extend([page_size + 1, offset])
+
+    return sql, params
+
+
+def fetch_page(conn: sqlite3.Connection, normalized: str, read_only: bool,
+               page_size: int = PAGE_SIZE, key_columns: Sequence[str] = (),
+               after: Optional[tuple] = None, start: int = 0,
+               max_rows: int = MAX_RESULT_ROWS, max_bytes: int = MAX_PAGE_BYTES,
+               base_params: Sequence[Any] = (), start_bytes: int = 0,
+               max_result_bytes: int = MAX_RESULT_BYTES) -> Page:
+    """
+    Fetch one page of `normalized` (see query_cache.normalize_sql).
+
+    `start` is how many rows earlier pages already showed; in offset mode
+    it is also the offset. `start_bytes` is what those rows weighed, so the
+    result as a whole stops at `max_result_bytes`. Statements that aren't
+    plain reads run as-is and only their first page is returned.
+    """
+    t0 = time.perf_counter()
+    key_columns = tuple(key_columns)
+    pageable = read_only
+
+    if pageable:
+        sql, params = page_sql(normalized, page_size, key_columns, after, start, base_params)
+        cur = conn.execute(sql, params)
+    else:
+        cur = conn.execute(normalized, list(base_params))
+
+    columns = [d[0] for d in cur.description or ()]
+    budget = max(0, min(page_size, max_rows - start))
+    rows: List[tuple] = []
+    nbytes = 0
+    limit_hit = None
+    has_more = False
+    result_full = False
+
+    try:
+        while True:
+            chunk = cur.fetchmany(FETCH_CHUNK)
+            if not chunk:
+                break
+            for row in chunk:
+                if len(rows) >= budget:
+                    has_more = True
+                    break
+                size = row_bytes(row)
+                if start_bytes + nbytes + size > max_result_bytes:
+                    has_more = result_full = True
+                    break
+                if nbytes + size > max_bytes and rows:
+                    has_more = True
+                    limit_hit = LIMIT_BYTES
+                    break
+                rows.append(row)
+                nbytes += size
+            if has_more:
+                break
+    finally:
+        cur.close()
+
+    # The row and result-byte ceilings end the whole result, not just this page
+    if has_more and start + len(rows) >= max_rows:
+        has_more = False
+        limit_hit = LIMIT_ROWS
+    elif result_full:
+        has_more = False
+        limit_hit = LIMIT_RESULT_BYTES
+
+    last_key = None
+    if rows and key_columns:
+        index = [columns.index(c) for c in key_columns]
+        last_key = tuple(rows[-1][i] for i in index)
+
+    return Page(
+        columns=columns,
+        rows=rows,
+        start=start,
+        has_more=has_more and pageable,
+        limit_hit=limit_hit,
+        nbytes=nbytes,
+        start_bytes=start_bytes,
+        elapsed_ms=round((time.perf_counter() - t0) * 1000, 2),
+        last_key=last_key,
+        pageable=pageable,
+        key_columns=key_columns,
+    )
@@ -0,0 +1,86 @@
+"""
+Paged, filtered views of the CRUD tables (players, teams).
+
+Pages are fetched by keyset over each view's sort columns (the last one is
+the primary key, so the order is total), with name search and exact-match
+filters applied in SQL. Only one page is read per rerun; total counts and
+filter option lists go through the shared result cache and are recomputed
+only after a write.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from utils.db_connection import read_connection
+from utils.query_cache import cached_value
+from utils.sql_pager import Page, fetch_page
+
+PAGE_SIZE = 50
+
+
+@dataclass(frozen=True)
+class TableView:
+    table: str
+    # Keyset columns, ending with the primary key. A NULL in them would be
+    # skipped by the row-value comparison; the forms and imports never write one.
+    order: Tuple[str, ...]
+    search: str                     # column matched by the name search
+    filters: Tuple[str, ...] = ()   # columns filtered by exact value
+
+
+PLAYERS_VIEW = TableView(
+    table="players",
+    order=("full_name", "player_id"),
+    search="full_name",
+    filters=("country", "playing_role"),
+)
+
+TEAMS_VIEW = TableView(
+    table="teams",
+    order=("team_name",),
+    search="team_name",
+    filters=("country",),
+)
+
+
+def _where(view: TableView, search: str, filters: Dict[str, str]) -> Tuple[str, list]:
+    clauses: List[str] = []
+    params: list = []
+
+    search = search.strip()
+    if search:
+        escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        clauses.append(f"{view.search} LIKE ? ESCAPE '\\'")    # case-insensitive (ASCII)
+        params.append(f"%{escaped}%")
+
+    for column in view.filters:
+        value = filters.get(column)
+        if value:
+            clauses.append(f"{column} = ?")
+            params.append(value)
+
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def fetch_view_page(view: TableView, search: str = "", filters: Optional[Dict[str, str]] = None,
+                    after: Optional[tuple] = None, start: int = 0,
+                    page_size: int = PAGE_SIZE) -> Page:
+    """
+    One page of `view` after keyset `after` (None for the first page).
+    """
+    where, params = _where(view, search, filters or {})
+    with read_connection() as conn:
+        return fetch_page(conn, f"SELECT * FROM {view.table}{where}", True, page_size,
+                          view.order, after, start, base_params=params)
+
+
+def count_rows(view: TableView, search: str = "", filters: Optional[Dict[str, str]] = None) -> int:
+    where, params = _where(view, search, filters or {})
+    return cached_value(f"SELECT COUNT(*) FROM {view.table}{where};", params)[0][0]
+
+
+def distinct_values(view: TableView, column: str) -> List[str]:
+    rows = cached_value(
+        f"SELECT DISTINCT {column} FROM {view.table} "
+        f"WHERE {column} IS NOT NULL AND {column} != '' ORDER BY {column};"
+    )
+    return [r[0] for r in rows]